@@ -0,0 +1,44 @@
+import importlib
+from typing import Dict, List, Optional
+
+import click
+
+from .logs import LOG_PROFILES, setup_logging
+
+# Modules defining the subcommands, imported only for the subcommand that runs, so that
+# the thin client does not load the rest
+COMMAND_MODULES: Dict[str, str] = {
+    "bench": "bench",
+    "calendar": "scheduler",
+    "client": "client",
+    "daemon": "daemon",
+    "imports": "importtime",
+    "run": "runner",
+}
+
+
+class LazyGroup(click.Group):
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted(COMMAND_MODULES)
+
+    def get_command(self, ctx: click.Context, name: str) -> Optional[click.Command]:
+        if name not in COMMAND_MODULES:
+            return None
+        module = importlib.import_module(f".{COMMAND_MODULES[name]}", __package__)
+        command: click.Command = getattr(module, name)
+        return command
+
+
+@click.group(cls=LazyGroup)
+@click.option(
+    "--log-profile",
+    type=click.Choice(list(LOG_PROFILES)),
+    help="How much the tasks log  [default: $ADVENT_LOG_PROFILE or default].",
+)
+def main(log_profile: Optional[str]) -> None:
+    """Advent of Code 2021 solutions."""
+    setup_logging(log_profile)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Run one task over many input files in a pool of forked worker processes.
+"""
+
+import glob
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional
+
+from .cache import ResultCache
+from .inputs import TaskCallback, open_task_input
+from .io_utils import INPUT_SUFFIXES
+from .lazy import resolve_lazy_imports
+
+# Set before the workers are forked, so they inherit the task instead of pickling it
+batch_callback: Optional[TaskCallback] = None
+batch_cache: Optional[ResultCache] = None
+
+
+class BatchResult(NamedTuple):
+    input: str
+    result: Optional[str]
+    error: Optional[str]
+    wall_time: float
+    """Time spent on this input in the worker, in seconds."""
+
+    cpu_time: float
+
+
+def find_batch_inputs(pattern: str) -> List[Path]:
+    """Inputs in a directory, or the files matching a glob pattern."""
+    if os.path.isdir(pattern):
+        paths = [path for path in Path(pattern).iterdir() if path.is_file()]
+        return sorted(path for path in paths if path.name.endswith(INPUT_SUFFIXES))
+    return sorted(
+        Path(path)
+        for path in glob.glob(pattern, recursive=True)
+        if os.path.isfile(path)
+    )
+
+
+def solve_input(input_path: Path) -> BatchResult:
+    assert batch_callback is not None
+    callback = batch_callback
+
+    def solve() -> str:
+        with open_task_input(callback, input_path) as input:
+            result: str = callback(input)
+        return result
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    result: Optional[str] = None
+    error: Optional[str] = None
+    try:
+        if batch_cache is not None:
+            result = batch_cache.run(callback, input_path, solve)
+        else:
+            result = solve()
+    except Exception as ex:
+        error = repr(ex)
+    return BatchResult(
+        input=str(input_path),
+        result=result,
+        error=error,
+        wall_time=time.perf_counter() - wall_start,
+        cpu_time=time.process_time() - cpu_start,
+    )
+
+
+def run_batch(
+    callback: TaskCallback,
+    input_paths: List[Path],
+    jobs: Optional[int],
+    cache: Optional[ResultCache],
+) -> Iterator[BatchResult]:
+    """Solve all inputs and yield the results in the order they complete."""
+    global batch_callback, batch_cache
+    batch_callback, batch_cache = callback, cache
+    # Import what the task defers once, instead of in every worker
+    resolve_lazy_imports("advent")
+    resolve_lazy_imports(callback.__module__)
+    context = multiprocessing.get_context("fork")
+    try:
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as executor:
+            futures = [executor.submit(solve_input, path) for path in input_paths]
+            for future in as_completed(futures):
+                yield future.result()
+    finally:
+        batch_callback, batch_cache = None, None
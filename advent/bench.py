@@ -0,0 +1,419 @@
+import fnmatch
+import json
+import logging
+import multiprocessing
+import resource
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import click
+import numpy as np
+
+from .generators import GENERATORS, generate_input
+from .inputs import open_task_input
+from .runner import discover_tasks, find_inputs, load_task
+from .specs import TaskSpec
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE_PATH = Path("benchmarks.json")
+
+
+class Measurement(NamedTuple):
+    wall_time: float
+    cpu_time: float
+    start_rss_kib: int
+    peak_rss_kib: int
+    result: str
+
+    @property
+    def memory_growth_kib(self) -> int:
+        return self.peak_rss_kib - self.start_rss_kib
+
+
+class BenchmarkResult(NamedTuple):
+    wall_time: float
+    """Median wall time of all runs, in seconds."""
+
+    cpu_time: float
+    """Median CPU time of all runs, in seconds."""
+
+    peak_rss_kib: int
+    """Highest peak resident set size of all runs."""
+
+    result: str
+    runs: int
+
+
+class Regression(NamedTuple):
+    key: str
+    baseline_time: float
+    current_time: float
+
+    @property
+    def slowdown(self) -> float:
+        return self.current_time / self.baseline_time - 1
+
+
+Results = Dict[str, BenchmarkResult]
+
+
+def get_benchmark_key(spec: TaskSpec) -> str:
+    return f"day_{spec.day:02d}/task_{spec.task}/{spec.input_path.name}"
+
+
+def get_benchmark_specs(data_dir: Path, pattern: str) -> Iterable[TaskSpec]:
+    for day, task in discover_tasks():
+        for input_path in find_inputs(data_dir, day):
+            spec = TaskSpec(day=day, task=task, input_path=input_path)
+            if fnmatch.fnmatch(get_benchmark_key(spec), pattern):
+                yield spec
+
+
+def measure_once(spec: TaskSpec) -> Measurement:
+    callback, _ = load_task(spec.day, spec.task)
+    # A forked worker inherits the parent's high-water mark, so record where it starts
+    start_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with open_task_input(callback, spec.input_path) as file:
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        result = callback(file)
+        wall_time = time.perf_counter() - wall_start
+        cpu_time = time.process_time() - cpu_start
+    # Each run gets a fresh process, so the high-water mark belongs to this run
+    peak_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return Measurement(
+        wall_time=wall_time,
+        cpu_time=cpu_time,
+        start_rss_kib=start_rss_kib,
+        peak_rss_kib=peak_rss_kib,
+        result=result,
+    )
+
+
+def measure_in_subprocess(spec: TaskSpec, timeout: float) -> Measurement:
+    # Importing up front means forked workers measure solving only
+    load_task(spec.day, spec.task)
+    context = multiprocessing.get_context("fork")
+    with context.Pool(processes=1) as pool:
+        measurement: Measurement = pool.apply_async(measure_once, (spec,)).get(timeout)
+    return measurement
+
+
+def benchmark(spec: TaskSpec, repeat: int, timeout: float) -> BenchmarkResult:
+    measurements = [measure_in_subprocess(spec, timeout) for _ in range(repeat)]
+    results = {measurement.result for measurement in measurements}
+    assert len(results) == 1, f"Inconsistent results {results}"
+    return BenchmarkResult(
+        wall_time=statistics.median(m.wall_time for m in measurements),
+        cpu_time=statistics.median(m.cpu_time for m in measurements),
+        peak_rss_kib=max(m.peak_rss_kib for m in measurements),
+        result=measurements[0].result,
+        runs=len(measurements),
+    )
+
+
+class ScalingPoint(NamedTuple):
+    size: int
+    wall_time: float
+    """Median wall time of all runs, in seconds."""
+
+    memory_kib: int
+    """Highest growth of the resident set size while solving, over all runs."""
+
+
+def measure_scaling(
+    day: int, task: int, size: int, seed: int, repeat: int, timeout: float
+) -> ScalingPoint:
+    with tempfile.TemporaryDirectory(prefix="advent-scale-") as directory:
+        input_path = Path(directory) / f"day_{day:02d}_size_{size}.txt"
+        input_path.write_text(generate_input(day, size, seed), encoding="utf-8")
+        spec = TaskSpec(day=day, task=task, input_path=input_path)
+        measurements = [measure_in_subprocess(spec, timeout) for _ in range(repeat)]
+    return ScalingPoint(
+        size=size,
+        wall_time=statistics.median(m.wall_time for m in measurements),
+        memory_kib=max(m.memory_growth_kib for m in measurements),
+    )
+
+
+TIME_FLOOR = 1e-6
+MEMORY_FLOOR_KIB = 1
+
+
+def fit_exponent(
+    sizes: Sequence[float], values: Sequence[float], floor: float
+) -> float:
+    """
+    Fit `value ~ size ** exponent` in log-log space. Values are clamped to the floor,
+    because a task can finish below the timer resolution or without growing its
+    memory at all.
+    """
+    assert len(sizes) >= 2, "Need at least two sizes to fit an exponent"
+    exponent, _ = np.polyfit(np.log(sizes), np.log(np.maximum(values, floor)), 1)
+    return float(exponent)
+
+
+def format_bar(value: float, maximum: float, width: int = 40) -> str:
+    return "#" * round(width * value / maximum) if maximum > 0 else ""
+
+
+def read_baseline(path: Path) -> Results:
+    with path.open(mode="r", encoding="utf-8") as file:
+        data = json.load(file)
+    return {key: BenchmarkResult(**value) for key, value in data.items()}
+
+
+def write_baseline(path: Path, results: Results) -> None:
+    data = {key: result._asdict() for key, result in sorted(results.items())}
+    with path.open(mode="w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2)
+        file.write("\n")
+
+
+def find_regressions(
+    baseline: Results, results: Results, threshold: float, min_slowdown: float
+) -> List[Regression]:
+    """
+    Compare median wall times against the baseline. A task regresses when it is
+    slower by more than `threshold` (relative) and more than `min_slowdown` seconds,
+    so that noise on millisecond-long tasks does not fail the run.
+    """
+    regressions: List[Regression] = []
+    for key, result in sorted(results.items()):
+        if key not in baseline:
+            continue
+        baseline_time = baseline[key].wall_time
+        difference = result.wall_time - baseline_time
+        if difference > baseline_time * threshold and difference > min_slowdown:
+            regressions.append(
+                Regression(
+                    key=key, baseline_time=baseline_time, current_time=result.wall_time
+                )
+            )
+    return regressions
+
+
+def find_changed_results(baseline: Results, results: Results) -> List[str]:
+    """Keys of the tasks whose answer differs from the baseline's."""
+    return [
+        key
+        for key, result in sorted(results.items())
+        if key in baseline and baseline[key].result != result.result
+    ]
+
+
+@click.group()
+def bench() -> None:
+    """Measure how fast the tasks run."""
+
+
+@bench.command()
+@click.option(
+    "--data-dir",
+    type=click.Path(file_okay=False, dir_okay=True, exists=True, path_type=Path),
+    default=Path("data"),
+    show_default=True,
+)
+@click.option(
+    "--filter",
+    "pattern",
+    default="*",
+    show_default=True,
+    help="Glob matched against DAY/TASK/INPUT keys, e.g. 'day_15/*/input*'.",
+)
+@click.option("--repeat", type=int, default=3, show_default=True)
+@click.option("--timeout", type=float, default=60.0, show_default=True)
+@click.option(
+    "--baseline",
+    "baseline_path",
+    type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+    default=DEFAULT_BASELINE_PATH,
+    show_default=True,
+)
+@click.option(
+    "--save-baseline",
+    is_flag=True,
+    help="Store the results as the new baseline instead of comparing against it.",
+)
+@click.option(
+    "--threshold",
+    type=float,
+    default=0.2,
+    show_default=True,
+    help="Relative slowdown that counts as a regression.",
+)
+@click.option(
+    "--min-slowdown",
+    type=float,
+    default=0.01,
+    show_default=True,
+    help="Absolute slowdown in seconds below which nothing counts as a regression.",
+)
+def run(
+    data_dir: Path,
+    pattern: str,
+    repeat: int,
+    timeout: float,
+    baseline_path: Path,
+    save_baseline: bool,
+    threshold: float,
+    min_slowdown: float,
+) -> None:
+    """Benchmark tasks against the inputs in the data directory."""
+    # The solvers are chatty, which would make us measure logging
+    logging.getLogger("advent").setLevel(logging.WARNING)
+
+    baseline: Optional[Results] = None
+    if not save_baseline and baseline_path.exists():
+        baseline = read_baseline(baseline_path)
+
+    results: Results = {}
+    # Why the tasks that did not finish failed, by their keys
+    failures: Dict[str, str] = {}
+    for spec in get_benchmark_specs(data_dir, pattern):
+        key = get_benchmark_key(spec)
+        try:
+            result = benchmark(spec, repeat, timeout)
+        except multiprocessing.TimeoutError:
+            failures[key] = f"timed out after {timeout}s"
+            click.echo(f"{key}: {failures[key]}")
+            continue
+        except Exception as ex:
+            failures[key] = f"failed with {ex!r}"
+            click.echo(f"{key}: {failures[key]}")
+            continue
+        results[key] = result
+        click.echo(
+            f"{key}: wall {result.wall_time:.4f}s cpu {result.cpu_time:.4f}s "
+            f"peak RSS {result.peak_rss_kib / 1024:.1f} MiB"
+        )
+        if baseline is not None and key in baseline:
+            if baseline[key].result != result.result:
+                click.echo(
+                    f"{key}: result changed from {baseline[key].result!r} "
+                    f"to {result.result!r}"
+                )
+
+    if save_baseline:
+        write_baseline(baseline_path, results)
+        click.echo(f"Saved {len(results)} results to {baseline_path}")
+        return
+    if baseline is None:
+        return
+
+    regressions = find_regressions(baseline, results, threshold, min_slowdown)
+    for regression in regressions:
+        click.echo(
+            f"{regression.key}: {regression.baseline_time:.4f}s -> "
+            f"{regression.current_time:.4f}s ({regression.slowdown:+.0%})"
+        )
+    # A task that no longer finishes regressed the most of all
+    failed = sorted(key for key in failures if key in baseline)
+    for key in failed:
+        click.echo(f"{key}: {baseline[key].wall_time:.4f}s -> {failures[key]}")
+    changed = find_changed_results(baseline, results)
+    if regressions or failed or changed:
+        raise click.ClickException(
+            f"{len(regressions) + len(failed)} benchmark(s) regressed, "
+            f"{len(changed)} changed their result"
+        )
+
+
+def parse_sizes(ctx: click.Context, param: click.Parameter, value: str) -> List[int]:
+    try:
+        sizes = sorted({int(size) for size in value.split(",")})
+    except ValueError:
+        raise click.BadParameter("expected comma separated integers")
+    if sizes[0] < 1:
+        raise click.BadParameter("sizes have to be positive")
+    return sizes
+
+
+@bench.command()
+@click.option("--day", type=click.IntRange(1, 25), required=True)
+@click.option("--task", type=int, required=True)
+@click.option(
+    "--sizes",
+    default="10,100,1000",
+    show_default=True,
+    callback=parse_sizes,
+    help="Comma separated input sizes, see `advent.generators` for their units.",
+)
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("--repeat", type=int, default=3, show_default=True)
+@click.option("--timeout", type=float, default=60.0, show_default=True)
+@click.option(
+    "--output",
+    "output_path",
+    type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+    help="Also write the measurements and fitted exponents as JSON.",
+)
+def scale(
+    day: int,
+    task: int,
+    sizes: List[int],
+    seed: int,
+    repeat: int,
+    timeout: float,
+    output_path: Optional[Path],
+) -> None:
+    """Measure how time and memory of a task grow with generated input size."""
+    logging.getLogger("advent").setLevel(logging.WARNING)
+    generator = GENERATORS[day]
+    if not generator.scalable:
+        click.echo(f"Day {day} inputs have a fixed size, all sizes give the same input")
+
+    points: List[ScalingPoint] = []
+    for size in sizes:
+        try:
+            point = measure_scaling(day, task, size, seed, repeat, timeout)
+        except multiprocessing.TimeoutError:
+            # Larger inputs will not be any faster
+            click.echo(f"size {size}: timed out after {timeout}s")
+            break
+        points.append(point)
+        click.echo(
+            f"size {size}: wall {point.wall_time:.4f}s "
+            f"memory +{point.memory_kib / 1024:.1f} MiB"
+        )
+    if not points:
+        raise click.ClickException("No size finished in time")
+
+    max_time = max(point.wall_time for point in points)
+    max_memory = max(point.memory_kib for point in points)
+    click.echo(f"\nday_{day:02d}/task_{task} by {generator.unit}:")
+    for point in points:
+        click.echo(f"{point.size:>10} time   |{format_bar(point.wall_time, max_time)}")
+        click.echo(f"{'':>10} memory |{format_bar(point.memory_kib, max_memory)}")
+
+    exponents: Dict[str, float] = {}
+    if len(points) >= 2:
+        point_sizes = [point.size for point in points]
+        exponents = {
+            "time": fit_exponent(
+                point_sizes, [point.wall_time for point in points], TIME_FLOOR
+            ),
+            "memory": fit_exponent(
+                point_sizes, [point.memory_kib for point in points], MEMORY_FLOOR_KIB
+            ),
+        }
+        click.echo(
+            f"time ~ n^{exponents['time']:.2f}, memory ~ n^{exponents['memory']:.2f}"
+        )
+
+    if output_path is not None:
+        data = {
+            "day": day,
+            "task": task,
+            "unit": generator.unit,
+            "seed": seed,
+            "points": [point._asdict() for point in points],
+            "exponents": exponents,
+        }
+        with output_path.open(mode="w", encoding="utf-8") as file:
+            json.dump(data, file, indent=2)
+            file.write("\n")
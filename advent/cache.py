@@ -0,0 +1,315 @@
+"""
+Content-addressed cache of task answers and parsed inputs.
+
+Answers are keyed by the task's function, a hash of its source and a hash of the
+input, so editing either one misses the cache. Tasks made with `partial` are keyed by
+the function they wrap and the arguments they bind. The source hash covers the task's
+day package and the shared modules of `advent`, which the tasks import helpers from.
+
+Parsed inputs are cached by tasks through `cached_array` and `cached_arrays`, keyed by
+the parser and the input, so that a changed solver can still reuse the parsed input.
+They are stored in the cache during cached runs, and, if sidecars are enabled, next to
+the input (see `advent.sidecars`) whenever the input comes from a file.
+
+The cache lives in `ADVENT_CACHE_DIR` (`~/.cache/advent` by default) and the least
+recently used entries are evicted once it grows over `ADVENT_CACHE_MAX_BYTES`. Several
+processes may share the cache: entries are written atomically, and eviction tolerates
+entries removed by others and skips the files others are still writing.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import (Any, Callable, List, NamedTuple, Optional, Sequence, Tuple,
+                    TypeVar)
+
+import numpy.typing as npt
+
+from . import inputs
+from .sidecars import (Arrays, load_sidecar, read_arrays, sidecars_enabled,
+                       store_sidecar, write_arrays)
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_VARIABLE = "ADVENT_CACHE_DIR"
+MAX_BYTES_VARIABLE = "ADVENT_CACHE_MAX_BYTES"
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "advent"
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+# Eviction shrinks the cache below its limit, so that the next writes do not scan it
+# all over again
+EVICTION_TARGET = 0.9
+TEMPORARY_PREFIX = ".writing-"
+
+ADVENT_DIR = Path(__file__).parent
+
+T = TypeVar("T")
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open(mode="rb") as file:
+        while chunk := file.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_files(paths: List[Path]) -> str:
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=32)
+def hash_input(path: Path, size: int, modified_ns: int) -> str:
+    # Keyed by the size and modification time too, so a changed input is hashed again
+    return hash_file(path)
+
+
+def get_module_name(module_name: str) -> str:
+    # Tasks run with `python -m` live in `__main__`, but should share cache entries
+    spec = getattr(sys.modules[module_name], "__spec__", None)
+    return spec.name if spec is not None else module_name
+
+
+def get_callback_name(callback: Callable[..., Any]) -> Tuple[str, str]:
+    """
+    Module defining the callback and its name within it. Partials, which are all
+    defined in `functools`, are named after the function they wrap and its arguments.
+    """
+    arguments: List[str] = []
+    while isinstance(callback, partial):
+        bound = [
+            *map(repr, callback.args),
+            *(f"{name}={value!r}" for name, value in callback.keywords.items()),
+        ]
+        arguments = [*bound, *arguments]
+        callback = callback.func
+    name = callback.__qualname__
+    if arguments:
+        name = f"{name}({', '.join(arguments)})"
+    return callback.__module__, name
+
+
+@lru_cache(maxsize=None)
+def get_source_hash(module_name: str) -> str:
+    module_path = Path(sys.modules[module_name].__file__ or "")
+    package_sources = list(module_path.parent.glob("*.py"))
+    shared_sources = list(ADVENT_DIR.glob("*.py"))
+    return hash_files(list({*package_sources, *shared_sources}))
+
+
+def get_key(*parts: str) -> str:
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+class CacheContext(NamedTuple):
+    cache: "ResultCache"
+    input_hash: str
+
+
+current_context: Optional[CacheContext] = None
+
+
+class ResultCache:
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.results_dir = directory / "results"
+        self.arrays_dir = directory / "arrays"
+        # Size of the cache as this process knows it, scanned on the first write
+        self.size: Optional[int] = None
+
+    @classmethod
+    def from_environment(cls) -> "ResultCache":
+        return cls(
+            directory=Path(os.environ.get(CACHE_DIR_VARIABLE, DEFAULT_CACHE_DIR)),
+            max_bytes=int(os.environ.get(MAX_BYTES_VARIABLE, DEFAULT_MAX_BYTES)),
+        )
+
+    def get_result_path(self, key: str) -> Path:
+        return self.results_dir / f"{key}.json"
+
+    def get_arrays_path(self, key: str) -> Path:
+        return self.arrays_dir / f"{key}.arrays"
+
+    def touch(self, path: Path) -> None:
+        # Eviction goes by modification time, which unlike access time is reliable
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another process since, which must not leave an empty entry
+            pass
+
+    def write_atomically(self, path: Path, write: Callable[[Path], object]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temporary_name = tempfile.mkstemp(
+            dir=path.parent, prefix=TEMPORARY_PREFIX, suffix=path.suffix
+        )
+        os.close(fd)
+        temporary_path = Path(temporary_name)
+        try:
+            write(temporary_path)
+            size = temporary_path.stat().st_size
+            temporary_path.replace(path)
+        finally:
+            temporary_path.unlink(missing_ok=True)
+        self.add_size(size)
+
+    def get_result(self, key: str) -> Optional[str]:
+        path = self.get_result_path(key)
+        try:
+            with path.open(mode="r", encoding="utf-8") as file:
+                result: str = json.load(file)["result"]
+        except FileNotFoundError:
+            return None
+        self.touch(path)
+        return result
+
+    def put_result(
+        self, key: str, task_name: str, input_hash: str, result: str
+    ) -> None:
+        data = {"task": task_name, "input": input_hash, "result": result}
+        self.write_atomically(
+            self.get_result_path(key),
+            lambda path: path.write_text(json.dumps(data) + "\n", encoding="utf-8"),
+        )
+
+    def get_arrays(self, key: str) -> Optional[Arrays]:
+        path = self.get_arrays_path(key)
+        try:
+            # Copy on write, so tasks can modify the arrays in place
+            _, arrays = read_arrays(path)
+        except FileNotFoundError:
+            return None
+        self.touch(path)
+        return arrays
+
+    def put_arrays(self, key: str, arrays: Arrays) -> None:
+        self.write_atomically(
+            self.get_arrays_path(key), lambda path: write_arrays(path, arrays)
+        )
+
+    def add_size(self, size: int) -> None:
+        """
+        Account for a written entry. The cache is only scanned on the first write and
+        once it may have grown over its size, as other processes write to it too.
+        """
+        if self.size is None:
+            self.size = sum(entry_size for _, entry_size, _ in self.get_entries())
+        else:
+            self.size += size
+        if self.size > self.max_bytes:
+            self.evict()
+
+    def get_entries(self) -> List[Tuple[float, int, Path]]:
+        entries: List[Tuple[float, int, Path]] = []
+        for directory in [self.results_dir, self.arrays_dir]:
+            if not directory.exists():
+                continue
+            for path in directory.iterdir():
+                # Still being written by some process
+                if path.name.startswith(TEMPORARY_PREFIX):
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    # Evicted by another process in the meantime
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache fits its size."""
+        entries = self.get_entries()
+        size = sum(entry_size for _, entry_size, _ in entries)
+        target = int(self.max_bytes * EVICTION_TARGET)
+        for _, entry_size, path in sorted(entries):
+            if size <= target:
+                break
+            logger.debug("Evicting %s from the cache", path)
+            path.unlink(missing_ok=True)
+            size -= entry_size
+        self.size = size
+
+    def run(
+        self, callback: Callable[..., str], input_path: Path, solve: Callable[[], str]
+    ) -> str:
+        """Return the cached answer of the task, or solve it and cache the answer."""
+        global current_context
+        module, name = get_callback_name(callback)
+        task_name = f"{get_module_name(module)}.{name}"
+        input_hash = hash_file(input_path)
+        key = get_key(task_name, get_source_hash(module), input_hash)
+        result = self.get_result(key)
+        if result is not None:
+            logger.info("Using cached result of %s for %s", task_name, input_path)
+            return result
+
+        previous_context = current_context
+        current_context = CacheContext(cache=self, input_hash=input_hash)
+        try:
+            result = solve()
+        finally:
+            current_context = previous_context
+        self.put_result(key, task_name, input_hash, result)
+        return result
+
+
+def load_or_parse(
+    parse: Callable[..., object], parse_arrays: Callable[[], Arrays]
+) -> Arrays:
+    context = current_context
+    input_path = inputs.current_input_path if sidecars_enabled() else None
+    if context is None and input_path is None:
+        return parse_arrays()
+
+    parser_name = f"{get_module_name(parse.__module__)}.{parse.__qualname__}"
+    parser_key = get_key(parser_name, get_source_hash(parse.__module__))
+    if context is not None:
+        input_hash = context.input_hash
+    else:
+        assert input_path is not None
+        stat = input_path.stat()
+        input_hash = hash_input(input_path, stat.st_size, stat.st_mtime_ns)
+
+    if input_path is not None:
+        arrays = load_sidecar(input_path, parser_name, parser_key, input_hash)
+        if arrays is not None:
+            logger.debug("Using the sidecar of %s", parser_name)
+            return arrays
+    key = get_key(parser_key, input_hash)
+    if context is not None:
+        arrays = context.cache.get_arrays(key)
+        if arrays is not None:
+            logger.debug("Using cached %s of the input", parser_name)
+            return arrays
+
+    arrays = parse_arrays()
+    if input_path is not None:
+        store_sidecar(input_path, parser_name, parser_key, input_hash, arrays)
+    if context is not None:
+        context.cache.put_arrays(key, arrays)
+    return arrays
+
+
+def cached_array(parse: Callable[[T], npt.NDArray[Any]], input: T) -> npt.NDArray[Any]:
+    """
+    Parse the input, or load what the same parser made of the same input before.
+    Outside of a cached run, for an input not read from a file, this just calls the
+    parser.
+    """
+    (array,) = load_or_parse(parse, lambda: (parse(input),))
+    return array
+
+
+def cached_arrays(parse: Callable[[T], Sequence[npt.NDArray[Any]]], input: T) -> Arrays:
+    """Like `cached_array`, for parsers that return several arrays."""
+    return load_or_parse(parse, lambda: tuple(parse(input)))
@@ -1,32 +1,265 @@
-import gzip
+import json
 import logging
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Callable, TextIO, cast
+from typing import List, Optional
 
 import click
 
-from .logs import setup_logging
+from .batch import find_batch_inputs, run_batch
+from .cache import ResultCache
+from .inputs import TaskCallback, open_task_input
+from .logs import LOG_PROFILES, setup_logging
+from .memory import MemoryBudgetExceeded, memory_budget, parse_size
+from .profiling import memory_traced, profiled
+from .progress import progress_reporting
+from .strategies import (DEFAULT_STRATEGY, Strategy, get_references,
+                         get_strategies, race_strategies)
+from .tracing import span, tracing
 
 logger = logging.getLogger(__name__)
 
+STRATEGY_TIMEOUT = 60.0
+
+
+def run_batch_mode(
+    callback: TaskCallback, pattern: str, jobs: Optional[int], no_cache: bool
+) -> None:
+    input_paths = find_batch_inputs(pattern)
+    if not input_paths:
+        raise click.BadParameter(f"No input files match {pattern}")
+    # Per-task logs from thousands of inputs would drown the results
+    for logger_name in ["advent", "__main__"]:
+        logging.getLogger(logger_name).setLevel(logging.WARNING)
+    cache = None if no_cache else ResultCache.from_environment()
+    failures = 0
+    for batch_result in run_batch(callback, input_paths, jobs, cache):
+        failures += batch_result.error is not None
+        click.echo(json.dumps(batch_result._asdict()))
+    if failures:
+        raise click.ClickException(f"{failures} of {len(input_paths)} input(s) failed")
+
+
+def race(strategies: List[Strategy], input_file_path: Path, timeout: float) -> str:
+    results = race_strategies(strategies, input_file_path, timeout)
+    for strategy_result in results:
+        if strategy_result.error is not None:
+            logger.warning(
+                "Strategy %s failed: %s",
+                strategy_result.strategy,
+                strategy_result.error,
+            )
+    if not results or results[-1].error is not None:
+        raise click.ClickException(f"No strategy solved the task in {timeout}s")
+    winner = results[-1]
+    logger.info("Strategy %s won in %.3fs", winner.strategy, winner.wall_time)
+    assert winner.result is not None
+    return winner.result
+
+
+def cross_check(
+    callback: TaskCallback,
+    strategy_name: str,
+    input_file_path: Path,
+    result: str,
+    timeout: float,
+) -> None:
+    for reference in get_references(callback, strategy_name):
+        # Run apart, so that a reference too slow for the input can be abandoned
+        reference_results = race_strategies([reference], input_file_path, timeout)
+        if not reference_results:
+            logger.warning(
+                "Reference %s did not finish in %ss, not checked",
+                reference.name,
+                timeout,
+            )
+            continue
+        (reference_result,) = reference_results
+        if reference_result.error is not None:
+            raise click.ClickException(
+                f"Reference {reference.name} failed: {reference_result.error}"
+            )
+        if reference_result.result != result:
+            raise click.ClickException(
+                f"Strategy {strategy_name} answered {result}, "
+                f"but reference {reference.name} answered {reference_result.result}"
+            )
+        logger.info("Reference %s agrees with %s", reference.name, strategy_name)
+
+
+def parse_memory_budget(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return parse_size(value)
+    except ValueError:
+        raise click.BadParameter("expected a size like 512M or 2G")
+
+
+def run_with_file_argument(callback: TaskCallback) -> None:
+    strategies = get_strategies(callback)
 
-def run_with_file_argument(callback: Callable[[TextIO], str]) -> None:
     @click.command()
-    @click.argument(
-        "input_file_path",
-        type=click.Path(file_okay=True, dir_okay=False, readable=True, path_type=Path),
-        required=True,
-    )
-    def main(input_file_path: Path) -> None:
-        if input_file_path.suffix == ".gz":
-            logger.debug("Reading %s as GZIP file", input_file_path)
-            file_opener = gzip.open(input_file_path, mode="rt", encoding="utf-8")
+    @click.argument("input_file_path", type=click.Path(path_type=Path), required=True)
+    @click.option(
+        "--profile",
+        "profile_path",
+        type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+        help="Run under cProfile, dump pstats here and collapsed stacks next to it.",
+    )
+    @click.option(
+        "--trace-memory",
+        is_flag=True,
+        help="Run under tracemalloc and report the peak and top allocating lines.",
+    )
+    @click.option(
+        "--trace",
+        "trace_path",
+        type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+        help="Write timing spans of the task phases here as a Chrome trace.",
+    )
+    @click.option(
+        "--progress",
+        "show_progress",
+        is_flag=True,
+        help="Report the progress and throughput of long loops on stderr.",
+    )
+    @click.option(
+        "--metrics",
+        "metrics_path",
+        type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+        help="Append progress and throughput metrics here as JSON lines.",
+    )
+    @click.option(
+        "--no-cache",
+        is_flag=True,
+        help="Solve the task even if its answer for this input is cached.",
+    )
+    @click.option(
+        "--jobs",
+        type=click.IntRange(min=1),
+        help="Worker processes for a directory or glob of inputs [default: CPUs].",
+    )
+    @click.option(
+        "--log-profile",
+        type=click.Choice(list(LOG_PROFILES)),
+        help="How much the task logs  [default: $ADVENT_LOG_PROFILE or default].",
+    )
+    @click.option(
+        "--memory-budget",
+        "budget",
+        callback=parse_memory_budget,
+        help=(
+            "Memory the task may plan to use, like 512M or 2G; tasks that would "
+            "need more switch to leaner variants  [default: $ADVENT_MEMORY_BUDGET]."
+        ),
+    )
+    @click.option(
+        "--strategy",
+        "strategy_name",
+        type=click.Choice(list(strategies)),
+        default=DEFAULT_STRATEGY,
+        show_default=True,
+        help="Strategy to solve the task with.",
+    )
+    @click.option(
+        "--race",
+        "race_all",
+        is_flag=True,
+        help="Run all strategies in parallel and take the first answer.",
+    )
+    @click.option(
+        "--cross-check",
+        "check",
+        is_flag=True,
+        help="Check the answer against the reference strategies.",
+    )
+    @click.option(
+        "--timeout",
+        type=click.FloatRange(min=0, min_open=True),
+        default=STRATEGY_TIMEOUT,
+        show_default=True,
+        help="Seconds to wait for raced strategies and for references.",
+    )
+    def main(
+        input_file_path: Path,
+        profile_path: Optional[Path],
+        trace_memory: bool,
+        trace_path: Optional[Path],
+        show_progress: bool,
+        metrics_path: Optional[Path],
+        no_cache: bool,
+        jobs: Optional[int],
+        log_profile: Optional[str],
+        budget: Optional[int],
+        strategy_name: str,
+        race_all: bool,
+        check: bool,
+        timeout: float,
+    ) -> None:
+        """
+        Solve the task for INPUT_FILE_PATH. Given a directory or a glob pattern
+        instead, solve it for all the inputs in parallel and print JSON lines with
+        the results in the order they finish.
+        """
+        setup_logging(log_profile)
+        if budget is not None:
+            # Set before batch workers or raced strategies fork, so they inherit it
+            click.get_current_context().with_resource(memory_budget(budget))
+        # A cached answer would leave nothing to measure
+        measuring = (
+            profile_path is not None
+            or trace_memory
+            or trace_path is not None
+            or show_progress
+            or metrics_path is not None
+        )
+        solve_task = strategies[strategy_name].solve
+        if not input_file_path.is_file():
+            if measuring or race_all or check:
+                raise click.UsageError("Batches cannot be measured, raced or checked")
+            run_batch_mode(solve_task, str(input_file_path), jobs, no_cache)
+            return
+        if race_all:
+            if measuring or check or strategy_name != DEFAULT_STRATEGY:
+                raise click.UsageError("Races cannot be measured, checked or chosen")
+            click.echo(race(list(strategies.values()), input_file_path, timeout))
+            return
+
+        def solve() -> str:
+            with ExitStack() as stack:
+                if trace_path is not None:
+                    stack.enter_context(tracing(trace_path))
+                if show_progress or metrics_path is not None:
+                    stack.enter_context(
+                        progress_reporting(
+                            show=show_progress, metrics_path=metrics_path
+                        )
+                    )
+                file = stack.enter_context(open_task_input(solve_task, input_file_path))
+                if profile_path is not None:
+                    stack.enter_context(profiled(profile_path))
+                if trace_memory:
+                    # Entered last, so it does not trace the profile being written
+                    stack.enter_context(memory_traced())
+                try:
+                    with span("main"):
+                        result: str = solve_task(file)
+                except MemoryBudgetExceeded as ex:
+                    raise click.ClickException(str(ex))
+            return result
+
+        # Picking or checking a strategy is pointless if it does not run
+        if no_cache or measuring or check or strategy_name != DEFAULT_STRATEGY:
+            result = solve()
         else:
-            logger.debug("Reading %s as plain file", input_file_path)
-            file_opener = input_file_path.open(mode="r", encoding="utf-8")
-        with file_opener as file:
-            result = callback(file)
+            result = ResultCache.from_environment().run(
+                callback, input_file_path, solve
+            )
+        if check:
+            cross_check(callback, strategy_name, input_file_path, result, timeout)
         click.echo(result)
 
-    setup_logging()
     main()
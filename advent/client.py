@@ -0,0 +1,80 @@
+"""
+Thin client of the solver daemon (see `advent.daemon`).
+
+`advent client DAY:TASK:INPUT` sends the tasks to a running daemon and prints the
+answers the way `python -m advent.day_XX.task_N INPUT` would. It only imports what it
+needs to talk to the socket, so that it starts faster than running the task itself.
+"""
+
+import json
+import os
+import socket
+import tempfile
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+import click
+
+from .specs import TaskSpec, TaskSpecType
+
+SOCKET_VARIABLE = "ADVENT_SOCKET"
+DEFAULT_SOCKET_PATH = Path(tempfile.gettempdir()) / f"advent-{os.getuid()}.sock"
+
+
+def get_default_socket_path() -> Path:
+    return Path(os.environ.get(SOCKET_VARIABLE, DEFAULT_SOCKET_PATH))
+
+
+class SolveResponse(NamedTuple):
+    result: Optional[str]
+    error: Optional[str]
+    solve_time: float
+
+
+def request_solutions(
+    socket_path: Path, specs: List[TaskSpec], no_cache: bool
+) -> Iterable[SolveResponse]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(str(socket_path))
+        except (FileNotFoundError, ConnectionRefusedError):
+            raise click.ClickException(
+                f"No daemon listening on {socket_path}, start one with `advent daemon`"
+            )
+        with connection.makefile(mode="rwb") as stream:
+            for spec in specs:
+                request = {
+                    "day": spec.day,
+                    "task": spec.task,
+                    # The daemon does not share our working directory
+                    "input": str(spec.input_path.resolve()),
+                    "no_cache": no_cache,
+                }
+                stream.write(json.dumps(request).encode("utf-8") + b"\n")
+                stream.flush()
+                yield SolveResponse(**json.loads(stream.readline()))
+
+
+@click.command()
+@click.argument("specs", type=TaskSpecType(), nargs=-1, required=True)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=get_default_socket_path,
+    show_default=f"${SOCKET_VARIABLE} or {DEFAULT_SOCKET_PATH}",
+)
+@click.option("--no-cache", is_flag=True, help="Solve even if the answer is cached.")
+def client(specs: Tuple[TaskSpec, ...], socket_path: Path, no_cache: bool) -> None:
+    """Solve DAY:TASK:INPUT triples with a running daemon and print the answers."""
+    failures = 0
+    for spec, response in zip(
+        specs, request_solutions(socket_path, list(specs), no_cache)
+    ):
+        if response.error is not None:
+            failures += 1
+            click.echo(f"{spec}: {response.error}", err=True)
+        else:
+            click.echo(response.result)
+    if failures:
+        raise click.ClickException(f"{failures} task(s) failed")
@@ -0,0 +1,13 @@
+"""
+Cores available to the workers, kept apart from the scheduler so that tasks can size
+their pools without importing it.
+"""
+
+import os
+
+
+def get_core_count() -> int:
+    """Cores this process may run on, which can be fewer than the machine has."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
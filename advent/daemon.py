@@ -0,0 +1,173 @@
+"""
+A long-lived solver that keeps every task imported and warmed up.
+
+`advent daemon` imports all task modules, lets them precompute what does not depend on
+the input (tasks can define a `warm_up()` function for that) and then forks a pool of
+workers that inherit all of it. Requests come in over a Unix domain socket as JSON
+lines, one request and one response per line:
+
+    {"day": 15, "task": 1, "input": "/abs/path/input.txt"}
+    {"result": "811", "error": null, "solve_time": 0.05}
+
+`advent client` (see `advent.client`) sends such requests.
+"""
+
+import json
+import logging
+import multiprocessing
+import signal
+import socket
+import socketserver
+import sys
+import time
+from multiprocessing.pool import Pool
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import click
+
+from .cache import ResultCache
+from .client import (DEFAULT_SOCKET_PATH, SOCKET_VARIABLE, SolveResponse,
+                     get_default_socket_path)
+from .inputs import open_task_input
+from .runner import discover_tasks, load_task
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up_tasks(tasks: Iterable[Tuple[int, int]]) -> None:
+    """Import all tasks and let them precompute what does not depend on the input."""
+    for day, task in tasks:
+        callback, import_time = load_task(day, task)
+        warm_up = getattr(sys.modules[callback.__module__], "warm_up", None)
+        if warm_up is not None:
+            warm_up()
+        logger.debug("Loaded %s in %.3fs", callback.__module__, import_time)
+
+
+def ignore_interrupts() -> None:
+    # Ctrl+C reaches the whole process group, but only the server should handle it
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def solve(day: int, task: int, input_path: str, use_cache: bool) -> SolveResponse:
+    """Runs in a worker process, where the task is already imported."""
+    start = time.perf_counter()
+    try:
+        callback, _ = load_task(day, task)
+
+        def solve_input() -> str:
+            with open_task_input(callback, Path(input_path)) as input:
+                result: str = callback(input)
+            return result
+
+        if use_cache:
+            result = ResultCache.from_environment().run(
+                callback, Path(input_path), solve_input
+            )
+        else:
+            result = solve_input()
+    except Exception as ex:
+        return SolveResponse(
+            result=None, error=repr(ex), solve_time=time.perf_counter() - start
+        )
+    return SolveResponse(
+        result=result, error=None, solve_time=time.perf_counter() - start
+    )
+
+
+class SolverServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, pool: Pool, use_cache: bool) -> None:
+        self.pool = pool
+        self.use_cache = use_cache
+        super().__init__(str(socket_path), SolveHandler)
+
+    def solve(self, request: Dict[str, Any]) -> SolveResponse:
+        try:
+            arguments = (
+                int(request["day"]),
+                int(request["task"]),
+                str(request["input"]),
+                self.use_cache and not request.get("no_cache", False),
+            )
+        except (KeyError, TypeError, ValueError) as ex:
+            return SolveResponse(
+                result=None, error=f"Invalid request: {ex!r}", solve_time=0.0
+            )
+        response: SolveResponse = self.pool.apply_async(solve, arguments).get()
+        logger.info(
+            "Solved day %s task %s for %s in %.3fs",
+            *arguments[:3],
+            response.solve_time,
+        )
+        return response
+
+
+class SolveHandler(socketserver.StreamRequestHandler):
+    server: SolverServer
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as ex:
+                response = SolveResponse(
+                    result=None, error=f"Invalid request: {ex!r}", solve_time=0.0
+                )
+            else:
+                response = self.server.solve(request)
+            self.wfile.write(json.dumps(response._asdict()).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+def remove_stale_socket(socket_path: Path) -> None:
+    if not socket_path.exists():
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(socket_path))
+        except ConnectionRefusedError:
+            logger.info("Removing stale socket %s", socket_path)
+            socket_path.unlink()
+            return
+    raise click.ClickException(f"A daemon is already listening on {socket_path}")
+
+
+@click.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=get_default_socket_path,
+    show_default=f"${SOCKET_VARIABLE} or {DEFAULT_SOCKET_PATH}",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="Worker processes solving requests  [default: CPUs].",
+)
+@click.option("--no-cache", is_flag=True, help="Never use cached answers.")
+def daemon(socket_path: Path, jobs: Optional[int], no_cache: bool) -> None:
+    """Serve task solutions over a Unix socket from warm worker processes."""
+    remove_stale_socket(socket_path)
+    logging.getLogger("advent").setLevel(logging.WARNING)
+    logger.setLevel(logging.INFO)
+
+    start = time.perf_counter()
+    tasks = discover_tasks()
+    warm_up_tasks(tasks)
+    logger.info("Loaded %d tasks in %.3fs", len(tasks), time.perf_counter() - start)
+
+    # Workers are forked before the server starts any threads
+    context = multiprocessing.get_context("fork")
+    with context.Pool(processes=jobs, initializer=ignore_interrupts) as pool:
+        with SolverServer(socket_path, pool, use_cache=not no_cache) as server:
+            logger.info("Listening on %s", socket_path)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                logger.info("Shutting down")
+            finally:
+                socket_path.unlink(missing_ok=True)
@@ -0,0 +1,175 @@
+"""
+Counting increases of sonar sweeps in chunks of the input, on all cores.
+
+The input is split into byte ranges ending at line ends and the forked workers count
+the increases within each range, reading the inherited buffer of the input without
+copying it. The increases across the boundaries are then counted by feeding the first
+`window` readings of every chunk to a `SweepCounter` holding the last `window`
+readings before it, which gives exactly the sequential count:
+
+    python -m advent.day_01.parallel data/day_01/input.txt.gz --window 3 --jobs 8
+"""
+
+import logging
+import multiprocessing
+import time
+from functools import partial
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
+import click
+import numpy as np
+import numpy.typing as npt
+
+from ..cores import get_core_count
+from ..inputs import open_buffer
+from ..io_utils import NEWLINE, Buffer, parse_integers
+from ..logs import setup_logging
+from ..memory import get_chunk_length
+from .streaming import SweepCounter
+from .windows import count_window_increases
+
+logger = logging.getLogger(__name__)
+
+# Chunks per worker, so that workers finishing early can take over some of the work
+CHUNKS_PER_JOB = 4
+MIN_CHUNK_SIZE = 1 << 20
+# Bytes needed to parse a byte of the input, for the digits, their indices and the
+# numbers made of them
+PARSE_BYTES = 32
+SEARCH_BLOCK = 4096
+
+ByteRange = Tuple[int, int]
+
+# The input being counted, inherited by the forked workers
+current_buffer: Optional[Buffer] = None
+
+
+class ChunkCount(NamedTuple):
+    readings: int
+    increases: int
+    # The first and last `window` readings, for counting across the boundaries
+    head: List[int]
+    tail: List[int]
+
+
+def find_line_end(chars: npt.NDArray[np.uint8], position: int) -> int:
+    """Position after the first line end at or after `position`."""
+    while position < len(chars):
+        newlines = np.flatnonzero(chars[position : position + SEARCH_BLOCK] == NEWLINE)
+        if len(newlines):
+            return position + int(newlines[0]) + 1
+        position += SEARCH_BLOCK
+    return len(chars)
+
+
+def get_chunk_ranges(buffer: Buffer, chunk_size: int) -> List[ByteRange]:
+    chars = np.frombuffer(buffer, dtype=np.uint8)
+    ranges: List[ByteRange] = []
+    start = 0
+    while start < len(chars):
+        end = find_line_end(chars, start + chunk_size - 1)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def get_chunk_size(size: int, jobs: int) -> int:
+    per_job_size = max(-(-size // (jobs * CHUNKS_PER_JOB)), MIN_CHUNK_SIZE)
+    # The chunks being parsed by all the workers at once have to fit the budget, even
+    # if that makes them smaller than the minimum
+    budget_size = get_chunk_length(PARSE_BYTES * jobs, size, "Parsing chunks")
+    return min(per_job_size, budget_size)
+
+
+def count_chunk(byte_range: ByteRange, window: int) -> ChunkCount:
+    assert current_buffer is not None, "No input to count"
+    start, end = byte_range
+    readings = parse_integers(memoryview(current_buffer)[start:end])
+    return ChunkCount(
+        readings=readings.size,
+        increases=count_window_increases(readings, window),
+        head=readings[:window].tolist(),
+        tail=readings[-window:].tolist(),
+    )
+
+
+def stitch_chunks(chunks: List[ChunkCount], window: int) -> SweepCounter:
+    counter = SweepCounter(window)
+    for chunk in chunks:
+        # Only the first readings of a chunk are compared to readings before it
+        for reading in chunk.head:
+            counter.add(reading)
+        counter.increases += chunk.increases
+        counter.readings += chunk.readings - len(chunk.head)
+        if chunk.readings > window:
+            counter.recent.clear()
+            counter.recent.extend(chunk.tail)
+    return counter
+
+
+def count_increases_parallel(
+    buffer: Buffer, window: int, jobs: int, chunk_size: Optional[int] = None
+) -> SweepCounter:
+    global current_buffer
+    if chunk_size is None:
+        chunk_size = get_chunk_size(len(buffer), jobs)
+    ranges = get_chunk_ranges(buffer, chunk_size)
+    current_buffer = buffer
+    try:
+        count = partial(count_chunk, window=window)
+        # Daemonic processes, like raced strategies, cannot start workers of their own
+        if jobs == 1 or len(ranges) <= 1 or multiprocessing.current_process().daemon:
+            chunks = list(map(count, ranges))
+        else:
+            logger.info("Counting %d chunks with %d workers", len(ranges), jobs)
+            context = multiprocessing.get_context("fork")
+            with context.Pool(processes=min(jobs, len(ranges))) as pool:
+                chunks = pool.map(count, ranges, chunksize=1)
+    finally:
+        current_buffer = None
+    return stitch_chunks(chunks, window)
+
+
+@click.command()
+@click.argument(
+    "input_file_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.option("--window", type=click.IntRange(min=1), default=1, show_default=True)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="Worker processes  [default: cores available].",
+)
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    help="Bytes per chunk, instead of a few chunks per worker.",
+)
+def parallel(
+    input_file_path: Path, window: int, jobs: Optional[int], chunk_size: Optional[int]
+) -> None:
+    """
+    Count increases of sums of WINDOW readings from INPUT_FILE_PATH, in chunks
+    counted in parallel.
+    """
+    setup_logging()
+    start = time.perf_counter()
+    with open_buffer(input_file_path) as buffer:
+        counter = count_increases_parallel(
+            buffer, window, jobs or get_core_count(), chunk_size
+        )
+        size = len(buffer)
+    elapsed = time.perf_counter() - start
+    logger.info(
+        "Counted %d readings in %.3f s, %.1f MiB/s",
+        counter.readings,
+        elapsed,
+        size / 1024 / 1024 / max(elapsed, 1e-9),
+    )
+    click.echo(f"{counter.increases}")
+
+
+if __name__ == "__main__":
+    parallel()
@@ -0,0 +1,179 @@
+"""
+Counting increases of sonar sweeps in constant memory, for feeds that never end.
+
+Consecutive windows share all readings but one, so the sum of a window is larger than
+the previous one exactly when the reading entering it is larger than the one that
+left. Only the last `window` readings have to be kept for that.
+
+    python -m advent.day_01.streaming - --window 3 --checkpoint sweep.json < feed
+
+prints the running count as JSON lines and keeps the counter's state in the
+checkpoint, so a restarted run picks up where the previous one stopped. The readings
+fed after a restart should be the ones following those already counted.
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, Optional, TextIO
+
+import click
+
+from ..inputs import open_input
+from ..logs import setup_logging
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_EVERY = 10_000
+EMIT_EVERY = 1_000
+
+
+class SweepCounter:
+    def __init__(
+        self,
+        window: int,
+        readings: int = 0,
+        increases: int = 0,
+        recent: Iterable[int] = (),
+    ) -> None:
+        assert window >= 1, "Window must hold at least one reading"
+        self.window = window
+        self.readings = readings
+        self.increases = increases
+        self.recent: Deque[int] = deque(recent, maxlen=window)
+
+    def add(self, reading: int) -> None:
+        if len(self.recent) == self.window and reading > self.recent[0]:
+            self.increases += 1
+        self.recent.append(reading)
+        self.readings += 1
+
+    def to_checkpoint(self) -> Dict[str, Any]:
+        return {
+            "window": self.window,
+            "readings": self.readings,
+            "increases": self.increases,
+            "recent": list(self.recent),
+        }
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint: Dict[str, Any]) -> "SweepCounter":
+        return cls(
+            window=checkpoint["window"],
+            readings=checkpoint["readings"],
+            increases=checkpoint["increases"],
+            recent=checkpoint["recent"],
+        )
+
+
+def read_readings(input: TextIO) -> Iterator[int]:
+    for line in input:
+        line = line.strip()
+        if line:
+            yield int(line)
+
+
+def count_increases(readings: Iterable[int], window: int) -> int:
+    counter = SweepCounter(window)
+    for reading in readings:
+        counter.add(reading)
+    return counter.increases
+
+
+def read_checkpoint(path: Path) -> Optional[SweepCounter]:
+    try:
+        with path.open(mode="r", encoding="utf-8") as file:
+            return SweepCounter.from_checkpoint(json.load(file))
+    except FileNotFoundError:
+        return None
+
+
+def write_checkpoint(path: Path, counter: SweepCounter) -> None:
+    # Written aside and renamed, so that a crash never leaves half a checkpoint
+    fd, temporary_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode="w", encoding="utf-8") as file:
+            json.dump(counter.to_checkpoint(), file)
+            file.write("\n")
+        Path(temporary_name).replace(path)
+    finally:
+        Path(temporary_name).unlink(missing_ok=True)
+
+
+def emit(counter: SweepCounter) -> None:
+    click.echo(
+        json.dumps({"readings": counter.readings, "increases": counter.increases})
+    )
+    sys.stdout.flush()
+
+
+@click.command()
+@click.argument("input_file_path", default="-")
+@click.option("--window", type=click.IntRange(min=1), default=1, show_default=True)
+@click.option(
+    "--checkpoint",
+    "checkpoint_path",
+    type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+    help="Resume from this checkpoint if it exists, and keep it up to date.",
+)
+@click.option(
+    "--checkpoint-every",
+    type=click.IntRange(min=1),
+    default=CHECKPOINT_EVERY,
+    show_default=True,
+    help="Readings between checkpoints.",
+)
+@click.option(
+    "--emit-every",
+    type=click.IntRange(min=1),
+    default=EMIT_EVERY,
+    show_default=True,
+    help="Readings between printing the running count.",
+)
+def stream(
+    input_file_path: str,
+    window: int,
+    checkpoint_path: Optional[Path],
+    checkpoint_every: int,
+    emit_every: int,
+) -> None:
+    """
+    Count increases of sums of WINDOW readings, read one by one from
+    INPUT_FILE_PATH or, by default, from stdin.
+    """
+    setup_logging()
+    counter = None
+    if checkpoint_path is not None:
+        counter = read_checkpoint(checkpoint_path)
+    if counter is None:
+        counter = SweepCounter(window)
+    elif counter.window != window:
+        raise click.UsageError(
+            f"Checkpoint is of window {counter.window}, not {window}"
+        )
+    else:
+        logger.info("Resuming after %d readings", counter.readings)
+
+    input = sys.stdin if input_file_path == "-" else open_input(Path(input_file_path))
+    try:
+        for reading in read_readings(input):
+            counter.add(reading)
+            if checkpoint_path is not None and counter.readings % checkpoint_every == 0:
+                write_checkpoint(checkpoint_path, counter)
+            if counter.readings % emit_every == 0:
+                emit(counter)
+    finally:
+        # Also when interrupted, so that no counted reading is lost
+        if checkpoint_path is not None:
+            write_checkpoint(checkpoint_path, counter)
+        input.close()
+    if counter.readings % emit_every or not counter.readings:
+        emit(counter)
+
+
+if __name__ == "__main__":
+    stream()
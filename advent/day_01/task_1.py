@@ -1,11 +1,29 @@
-from typing import TextIO
-
-import pandas as pd
+from typing import TYPE_CHECKING, TextIO
 
 from ..cli import run_with_file_argument
+from ..cores import get_core_count
+from ..inputs import reads_buffer
+from ..io_utils import Buffer, parse_integers
+from ..lazy import lazy_import
+from ..strategies import alternative
+from .parallel import count_increases_parallel
+from .streaming import count_increases, read_readings
+from .windows import count_window_increases
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+
+@reads_buffer
+def main(input: Buffer) -> str:
+    count = count_window_increases(parse_integers(input), window=1)
+    return f"{count}"
 
 
-def main(input: TextIO) -> str:
+@alternative(main, "pandas", reference=True)
+def main_pandas(input: TextIO) -> str:
     df = pd.read_csv(input, names=["reading"])
     df["prev_reading"] = df.reading.shift(1)
     df.dropna(subset=["prev_reading"], inplace=True)
@@ -13,5 +31,18 @@ def main(input: TextIO) -> str:
     return f"{count}"
 
 
+@alternative(main, "streaming")
+def main_streaming(input: TextIO) -> str:
+    count = count_increases(read_readings(input), window=1)
+    return f"{count}"
+
+
+@alternative(main, "parallel")
+@reads_buffer
+def main_parallel(input: Buffer) -> str:
+    counter = count_increases_parallel(input, window=1, jobs=get_core_count())
+    return f"{counter.increases}"
+
+
 if __name__ == "__main__":
     run_with_file_argument(main)
@@ -1,13 +1,31 @@
-from typing import TextIO
-
-import pandas as pd
+from typing import TYPE_CHECKING, TextIO
 
 from ..cli import run_with_file_argument
+from ..cores import get_core_count
+from ..inputs import reads_buffer
+from ..io_utils import Buffer, parse_integers
+from ..lazy import lazy_import
+from ..strategies import alternative
+from .parallel import count_increases_parallel
+from .streaming import count_increases, read_readings
+from .windows import count_window_increases
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
 
 WINDOW = 3
 
 
-def main(input: TextIO) -> str:
+@reads_buffer
+def main(input: Buffer) -> str:
+    count = count_window_increases(parse_integers(input), window=WINDOW)
+    return f"{count}"
+
+
+@alternative(main, "pandas", reference=True)
+def main_pandas(input: TextIO) -> str:
     df = pd.read_csv(input, names=["reading"])
     df["current_sum"] = df.reading.rolling(WINDOW).sum()
     df["previous_sum"] = df.reading.shift(1).rolling(WINDOW).sum()
@@ -16,5 +34,18 @@ def main(input: TextIO) -> str:
     return f"{count}"
 
 
+@alternative(main, "streaming")
+def main_streaming(input: TextIO) -> str:
+    count = count_increases(read_readings(input), window=WINDOW)
+    return f"{count}"
+
+
+@alternative(main, "parallel")
+@reads_buffer
+def main_parallel(input: Buffer) -> str:
+    counter = count_increases_parallel(input, window=WINDOW, jobs=get_core_count())
+    return f"{counter.increases}"
+
+
 if __name__ == "__main__":
     run_with_file_argument(main)
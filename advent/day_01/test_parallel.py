@@ -0,0 +1,63 @@
+import random
+from typing import List
+
+import numpy as np
+import pytest
+
+from ..memory import memory_budget
+from .parallel import (MIN_CHUNK_SIZE, PARSE_BYTES, count_increases_parallel,
+                       get_chunk_ranges, get_chunk_size)
+from .test_streaming import SAMPLE_READINGS
+from .windows import count_window_increases
+
+
+def get_random_input(seed: int) -> bytes:
+    rng = random.Random(seed)
+    lines = [f"{rng.randrange(1000)}\n" for _ in range(200)]
+    return "".join(lines).encode("ascii")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64, 10_000])
+def test_get_chunk_ranges(chunk_size: int) -> None:
+    data = get_random_input(0)
+    ranges = get_chunk_ranges(data, chunk_size)
+    assert [start for start, _ in ranges] == [0] + [end for _, end in ranges[:-1]]
+    assert ranges[-1][1] == len(data)
+    assert all(data[end - 1 : end] == b"\n" for _, end in ranges)
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("window", [1, 3, 10])
+@pytest.mark.parametrize("chunk_size", [1, 7, 100])
+def test_count_increases_parallel(seed: int, window: int, chunk_size: int) -> None:
+    data = get_random_input(seed)
+    readings = np.array(data.split(), dtype=np.int64)
+    # Chunks of a few readings, fewer than the window of some of the runs
+    counter = count_increases_parallel(
+        memoryview(data), window, jobs=1, chunk_size=chunk_size
+    )
+    assert counter.increases == count_window_increases(readings, window)
+    assert counter.readings == len(readings)
+    assert list(counter.recent) == readings[-window:].tolist()
+
+
+SAMPLES: List[bytes] = [
+    "".join(f"{reading}\n" for reading in SAMPLE_READINGS).encode("ascii"),
+    " ".join(map(str, SAMPLE_READINGS)).encode("ascii"),
+    b"",
+]
+
+
+@pytest.mark.parametrize("data", SAMPLES)
+def test_count_increases_in_worker_processes(data: bytes) -> None:
+    counter = count_increases_parallel(data, window=3, jobs=2, chunk_size=8)
+    assert counter.increases == (5 if data else 0)
+
+
+def test_get_chunk_size() -> None:
+    size = 64 * MIN_CHUNK_SIZE
+    assert get_chunk_size(size, jobs=4) == 4 * MIN_CHUNK_SIZE
+    assert get_chunk_size(size, jobs=64) == MIN_CHUNK_SIZE
+    # The budget applies even below the minimum chunk size
+    with memory_budget(PARSE_BYTES * 4 * 1000):
+        assert get_chunk_size(size, jobs=4) == 1000
@@ -0,0 +1,61 @@
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+from click.testing import CliRunner
+
+from . import streaming
+from .streaming import SweepCounter, count_increases, read_checkpoint, stream
+
+SAMPLE_READINGS = [199, 200, 208, 210, 200, 207, 240, 269, 260, 263]
+
+STREAMING_SAMPLES: List[Tuple[List[int], int, int]] = [
+    # readings, window, increases
+    (SAMPLE_READINGS, 1, 7),
+    (SAMPLE_READINGS, 3, 5),
+    ([1, 2], 3, 0),
+    ([], 1, 0),
+]
+
+
+@pytest.mark.parametrize("readings,window,expected_increases", STREAMING_SAMPLES)
+def test_count_increases(
+    readings: List[int], window: int, expected_increases: int
+) -> None:
+    assert count_increases(readings, window) == expected_increases
+
+
+@pytest.mark.parametrize("split", range(len(SAMPLE_READINGS) + 1))
+def test_resume_from_checkpoint(split: int) -> None:
+    counter = SweepCounter(window=3)
+    for reading in SAMPLE_READINGS[:split]:
+        counter.add(reading)
+    resumed = SweepCounter.from_checkpoint(counter.to_checkpoint())
+    for reading in SAMPLE_READINGS[split:]:
+        resumed.add(reading)
+    assert resumed.increases == 5
+    assert resumed.readings == len(SAMPLE_READINGS)
+    assert len(resumed.recent) == 3
+
+
+def test_stream(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Configuring logging would leak into the other tests
+    monkeypatch.setattr(streaming, "setup_logging", lambda: None)
+    checkpoint_path = tmp_path / "checkpoint.json"
+    first_half = "".join(f"{reading}\n" for reading in SAMPLE_READINGS[:6])
+    second_half = "".join(f"{reading}\n" for reading in SAMPLE_READINGS[6:])
+    arguments = ["--window", "3", "--checkpoint", str(checkpoint_path)]
+
+    runner = CliRunner()
+    result = runner.invoke(stream, [*arguments, "--emit-every", "2"], first_half)
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines()[-1] == '{"readings": 6, "increases": 1}'
+    checkpoint = read_checkpoint(checkpoint_path)
+    assert checkpoint is not None and list(checkpoint.recent) == [210, 200, 207]
+
+    result = runner.invoke(stream, arguments, second_half)
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines()[-1] == '{"readings": 10, "increases": 5}'
+
+    result = runner.invoke(stream, ["--window", "1", *arguments[2:]], "")
+    assert result.exit_code != 0
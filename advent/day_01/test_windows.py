@@ -0,0 +1,64 @@
+import json
+import random
+from typing import List, Tuple
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from ..memory import memory_budget
+from . import windows as windows_module
+from .test_streaming import SAMPLE_READINGS
+from .windows import (count_increases_by_window, count_window_increases,
+                      parse_windows, windows)
+
+
+def test_count_increases_by_window() -> None:
+    readings = np.array(SAMPLE_READINGS, dtype=np.int64)
+    assert count_increases_by_window(readings, [3, 1, 3, 12]) == {
+        1: 7,
+        3: 5,
+        12: 0,
+    }
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_count_increases_by_window_in_chunks(seed: int) -> None:
+    rng = random.Random(seed)
+    readings = np.array([rng.randrange(100) for _ in range(500)], dtype=np.int64)
+    window_range = range(1, 21)
+    # Leaves room for a few readings at a time
+    with memory_budget(1000):
+        counts = count_increases_by_window(readings, window_range)
+    assert counts == {
+        window: count_window_increases(readings, window) for window in window_range
+    }
+
+
+WINDOWS_SAMPLES: List[Tuple[str, List[int]]] = [
+    ("3", [3]),
+    ("1..4", [1, 2, 3, 4]),
+    ("1, 3,5..7", [1, 3, 5, 6, 7]),
+]
+
+
+@pytest.mark.parametrize("text,expected", WINDOWS_SAMPLES)
+def test_parse_windows(text: str, expected: List[int]) -> None:
+    assert parse_windows(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "0..3", "3..1", "a", "1..", "-1"])
+def test_parse_windows_rejects_invalid_windows(text: str) -> None:
+    with pytest.raises(ValueError):
+        parse_windows(text)
+
+
+def test_windows_command(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(windows_module, "setup_logging", lambda: None)
+    readings = "".join(f"{reading}\n" for reading in SAMPLE_READINGS)
+    result = CliRunner().invoke(windows, ["--windows", "1,3"], readings)
+    assert result.exit_code == 0, result.output
+    assert list(map(json.loads, result.output.splitlines())) == [
+        {"window": 1, "increases": 7},
+        {"window": 3, "increases": 5},
+    ]
@@ -0,0 +1,112 @@
+"""
+Counting increases of sonar sweeps for many window sizes at once.
+
+The sums of consecutive windows of width `w` differ by the reading entering the window
+minus the one leaving it, so a window sum increases at position `i` exactly when
+`readings[i + w] > readings[i]`. All the requested widths are compared in the same
+pass over the readings:
+
+    python -m advent.day_01.windows data/day_01/input.txt.gz --windows 1..10
+
+prints the count of each width as JSON lines.
+"""
+
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import click
+import numpy as np
+import numpy.typing as npt
+
+from ..inputs import open_buffer
+from ..io_utils import parse_integers
+from ..logs import setup_logging
+from ..memory import get_chunk_length
+
+logger = logging.getLogger(__name__)
+
+# Bytes per reading and window: the index of the entering reading, the reading
+# itself and the comparison
+COMPARISON_BYTES = 8 + 8 + 1
+
+
+def count_window_increases(readings: npt.NDArray[np.int64], window: int) -> int:
+    return int(np.count_nonzero(readings[window:] > readings[:-window]))
+
+
+def count_increases_by_window(
+    readings: npt.NDArray[np.int64], windows: Iterable[int]
+) -> Dict[int, int]:
+    """Number of increases of the sums of each of the `windows` widths."""
+    widths = np.unique(np.fromiter(windows, dtype=np.int64))
+    assert len(widths) and widths[0] >= 1, "Windows must hold at least one reading"
+    # Readings past the end are never larger than the ones leaving the window
+    padded = np.concatenate(
+        (readings, np.full(widths[-1], np.iinfo(np.int64).min, dtype=np.int64))
+    )
+    counts = np.zeros(len(widths), dtype=np.int64)
+    chunk_length = get_chunk_length(
+        widths.size * COMPARISON_BYTES, readings.size, "Window comparisons"
+    )
+    for start in range(0, readings.size, chunk_length):
+        positions = np.arange(start, min(start + chunk_length, readings.size))
+        leaving = padded[positions, np.newaxis]
+        entering = padded[positions[:, np.newaxis] + widths]
+        counts += np.count_nonzero(entering > leaving, axis=0)
+    return dict(zip(widths.tolist(), counts.tolist()))
+
+
+def parse_windows(text: str) -> List[int]:
+    """Window widths like `3`, `1..10` or `1,3,5..8`, ranges including both ends."""
+    windows: List[int] = []
+    for part in text.split(","):
+        first, separator, last = part.strip().partition("..")
+        if separator:
+            windows.extend(range(int(first), int(last) + 1))
+        else:
+            windows.append(int(first))
+    if not windows or min(windows) < 1:
+        raise ValueError(f"Invalid windows {text!r}")
+    return windows
+
+
+def parse_windows_option(
+    ctx: click.Context, param: click.Parameter, value: str
+) -> List[int]:
+    try:
+        return parse_windows(value)
+    except ValueError:
+        raise click.BadParameter("expected widths like 3, 1..10 or 1,3,5..8")
+
+
+@click.command()
+@click.argument("input_file_path", default="-")
+@click.option(
+    "--windows",
+    "widths",
+    default="1..3",
+    show_default=True,
+    callback=parse_windows_option,
+    help="Window widths to count the increases of, like 1..10 or 1,3,5..8.",
+)
+def windows(input_file_path: str, widths: List[int]) -> None:
+    """
+    Count increases of sums of readings from INPUT_FILE_PATH or, by default, from
+    stdin, for each of the window widths.
+    """
+    setup_logging()
+    if input_file_path == "-":
+        readings = parse_integers(sys.stdin.buffer.read())
+    else:
+        with open_buffer(Path(input_file_path)) as buffer:
+            readings = parse_integers(buffer)
+    logger.info("Counting %d window widths of %d readings", len(widths), readings.size)
+    for window, increases in count_increases_by_window(readings, widths).items():
+        click.echo(json.dumps({"window": window, "increases": increases}))
+
+
+if __name__ == "__main__":
+    windows()
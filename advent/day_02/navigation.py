@@ -0,0 +1,102 @@
+"""
+Navigating the submarine for both tasks of day 2 at once.
+
+Commands are parsed straight into opcodes and distances. The aim of the second task
+is the running sum of the vertical moves, whose last value is also the depth of the
+first task, so a single cumulative sum answers both:
+
+    python -m advent.day_02.navigation data/day_02/input.txt.gz
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import NamedTuple
+
+import click
+import numpy as np
+import numpy.typing as npt
+
+from ..inputs import open_buffer
+from ..io_utils import Buffer, parse_integers
+from ..logs import setup_logging
+
+logger = logging.getLogger(__name__)
+
+FORWARD = 0
+DOWN = 1
+UP = 2
+UNKNOWN = 255
+
+# Opcodes of the directions by their first letter
+OPCODES = np.full(256, UNKNOWN, dtype=np.uint8)
+OPCODES[ord("f")] = FORWARD
+OPCODES[ord("d")] = DOWN
+OPCODES[ord("u")] = UP
+
+# How much each opcode moves forward and down per unit of distance
+HORIZONTAL_STEPS = np.array([1, 0, 0], dtype=np.int8)
+VERTICAL_STEPS = np.array([0, 1, -1], dtype=np.int8)
+
+
+class Commands(NamedTuple):
+    opcodes: npt.NDArray[np.uint8]
+    # Of the smallest unsigned type holding all of them
+    distances: npt.NDArray[np.unsignedinteger]
+
+
+class Position(NamedTuple):
+    horizontal: int
+    # The depth of the first task, where up and down move the submarine
+    depth: int
+    # and of the second, where they change its aim
+    aimed_depth: int
+
+    @property
+    def answer(self) -> int:
+        return self.horizontal * self.depth
+
+    @property
+    def aimed_answer(self) -> int:
+        return self.horizontal * self.aimed_depth
+
+
+def read_commands(input: Buffer) -> Commands:
+    chars = np.frombuffer(input, dtype=np.uint8)
+    is_letter = (chars >= ord("a")) & (chars <= ord("z"))
+    follows_letter = np.concatenate(([False], is_letter[:-1]))
+    opcodes = OPCODES[chars[is_letter & ~follows_letter]]
+    assert np.all(opcodes != UNKNOWN), "Unknown direction"
+    distances = parse_integers(input)
+    assert len(opcodes) == len(distances), "Expected a direction and a distance"
+    distance_type = np.min_scalar_type(int(np.max(distances, initial=0)))
+    return Commands(opcodes=opcodes, distances=distances.astype(distance_type))
+
+
+def navigate(commands: Commands) -> Position:
+    distances = commands.distances.astype(np.int64)
+    forward = HORIZONTAL_STEPS[commands.opcodes] * distances
+    aim = np.cumsum(VERTICAL_STEPS[commands.opcodes] * distances)
+    return Position(
+        horizontal=int(np.sum(forward)),
+        depth=int(aim[-1]) if aim.size else 0,
+        aimed_depth=int(np.dot(forward, aim)),
+    )
+
+
+@click.command()
+@click.argument(
+    "input_file_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+def navigation(input_file_path: Path) -> None:
+    """Answer both tasks of day 2 for INPUT_FILE_PATH in one pass."""
+    setup_logging()
+    with open_buffer(input_file_path) as buffer:
+        position = navigate(read_commands(buffer))
+    logger.info("Position %s", position)
+    click.echo(json.dumps({"task_1": position.answer, "task_2": position.aimed_answer}))
+
+
+if __name__ == "__main__":
+    navigation()
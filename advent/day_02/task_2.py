@@ -1,14 +1,30 @@
 import logging
-from typing import TextIO
-
-import pandas as pd
+from typing import TYPE_CHECKING, TextIO
 
 from ..cli import run_with_file_argument
+from ..inputs import reads_buffer
+from ..io_utils import Buffer
+from ..lazy import lazy_import
+from ..strategies import alternative
+from .navigation import navigate, read_commands
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
 
 logger = logging.getLogger(__name__)
 
 
-def main(input: TextIO) -> str:
+@reads_buffer
+def main(input: Buffer) -> str:
+    position = navigate(read_commands(input))
+    logger.info("horizontal=%d, vertical=%d", position.horizontal, position.aimed_depth)
+    return f"{position.aimed_answer}"
+
+
+@alternative(main, "pandas", reference=True)
+def main_pandas(input: TextIO) -> str:
     df = pd.read_csv(input, names=["direction", "distance"], delimiter=" ")
     df["horizontal_factor"] = df["direction"].map({"forward": 1, "down": 0, "up": 0})
     df["aim_factor"] = df["direction"].map({"forward": 0, "down": 1, "up": -1})
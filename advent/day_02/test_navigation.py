@@ -0,0 +1,39 @@
+from typing import List
+
+import numpy as np
+import pytest
+
+from .navigation import DOWN, FORWARD, UP, Position, navigate, read_commands
+
+SAMPLE = b"forward 5\ndown 5\nforward 8\nup 3\ndown 8\nforward 2\n"
+
+
+def test_read_commands() -> None:
+    commands = read_commands(memoryview(SAMPLE))
+    assert commands.opcodes.tolist() == [FORWARD, DOWN, FORWARD, UP, DOWN, FORWARD]
+    assert commands.distances.tolist() == [5, 5, 8, 3, 8, 2]
+    assert commands.distances.dtype == np.uint8
+
+
+def test_navigate() -> None:
+    position = navigate(read_commands(SAMPLE))
+    assert position == Position(horizontal=15, depth=10, aimed_depth=60)
+    assert position.answer == 150
+    assert position.aimed_answer == 900
+
+
+def test_navigate_without_commands() -> None:
+    assert navigate(read_commands(b"\n")) == Position(0, 0, 0)
+
+
+INVALID_SAMPLES: List[bytes] = [
+    b"backward 5\n",
+    b"forward\n",
+    b"forward 5\n3\n",
+]
+
+
+@pytest.mark.parametrize("data", INVALID_SAMPLES)
+def test_read_commands_rejects_invalid_input(data: bytes) -> None:
+    with pytest.raises(AssertionError):
+        read_commands(data)
@@ -1,14 +1,51 @@
 import logging
-from typing import TextIO
+from typing import TYPE_CHECKING, TextIO
 
-import pandas as pd
+import numpy as np
+import numpy.typing as npt
 
 from ..cli import run_with_file_argument
+from ..inputs import reads_buffer
+from ..io_utils import Buffer, parse_digit_grid
+from ..lazy import lazy_import
+from ..strategies import alternative
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
 
 logger = logging.getLogger(__name__)
 
 
-def main(input: TextIO) -> str:
+def read_bits(input: Buffer) -> npt.NDArray[np.uint8]:
+    bits = parse_digit_grid(input)
+    assert np.all(bits <= 1), "Non-binary digits"
+    return bits
+
+
+def get_most_common_bits(bits: npt.NDArray[np.uint8]) -> npt.NDArray[np.uint8]:
+    """Most common bit of each position, ones winning ties."""
+    ones = np.count_nonzero(bits, axis=0)
+    most_common_bits: npt.NDArray[np.uint8] = (2 * ones >= len(bits)).astype(np.uint8)
+    return most_common_bits
+
+
+def bits_to_int(bits: npt.NDArray[np.uint8]) -> int:
+    return int("".join(map(str, bits.tolist())), 2)
+
+
+@reads_buffer
+def main(input: Buffer) -> str:
+    most_common_bits = get_most_common_bits(read_bits(input))
+    epsilon = bits_to_int(most_common_bits)
+    gamma = bits_to_int(1 - most_common_bits)
+    logger.info("gamma=%d, epsilon=%d", gamma, epsilon)
+    return f"{gamma * epsilon}"
+
+
+@alternative(main, "pandas", reference=True)
+def main_pandas(input: TextIO) -> str:
     df = pd.read_csv(input, names=["binary"], dtype={"binary": str})
     positional_df = df["binary"].apply(
         lambda binary_number: pd.Series(list(binary_number))
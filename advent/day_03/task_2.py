@@ -1,13 +1,55 @@
+from __future__ import annotations
+
 import logging
-from typing import Callable, TextIO
+from typing import TYPE_CHECKING, Callable, TextIO
 
-import pandas as pd
+import numpy as np
+import numpy.typing as npt
 
 from ..cli import run_with_file_argument
+from ..inputs import reads_buffer
+from ..io_utils import Buffer
+from ..lazy import lazy_import
+from ..strategies import alternative
+from .task_1 import bits_to_int, read_bits
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
 
 logger = logging.getLogger(__name__)
 
 
+def filter_rating(
+    bits: npt.NDArray[np.uint8], keep_most_common: bool
+) -> npt.NDArray[np.uint8]:
+    candidates = bits
+    for position in range(bits.shape[1]):
+        column = candidates[:, position]
+        # Ones win ties when keeping the most common bit, zeros when the least
+        most_common_bit = int(2 * np.count_nonzero(column) >= len(column))
+        desired_bit = most_common_bit if keep_most_common else 1 - most_common_bit
+        candidates = candidates[column == desired_bit]
+        if len(candidates) == 1:
+            break
+        elif len(candidates) == 0:
+            raise AssertionError("Out of data")
+
+    assert len(candidates) == 1
+    rating: npt.NDArray[np.uint8] = candidates[0]
+    return rating
+
+
+@reads_buffer
+def main(input: Buffer) -> str:
+    bits = read_bits(input)
+    oxygen_rating = bits_to_int(filter_rating(bits, keep_most_common=True))
+    co2_rating = bits_to_int(filter_rating(bits, keep_most_common=False))
+    logger.info("oxygen_rating=%d, co2_rating=%d", oxygen_rating, co2_rating)
+    return f"{oxygen_rating * co2_rating}"
+
+
 def get_most_common_character(column: pd.Series) -> str:
     counts = column.value_counts()
     one_count = counts.loc["1"]
@@ -48,7 +90,8 @@ def find_rating(
     return rating
 
 
-def main(input: TextIO) -> str:
+@alternative(main, "pandas", reference=True)
+def main_pandas(input: TextIO) -> str:
     df = pd.read_csv(input, names=["binary"], dtype={"binary": str})
     positional_df = df["binary"].apply(
         lambda binary_number: pd.Series(list(binary_number))
@@ -1,10 +1,12 @@
 import itertools
 import logging
 import re
-from typing import Iterable, List, TextIO
+from typing import List, TextIO, Tuple
 
 import numpy as np
+import numpy.typing as npt
 
+from ..cache import cached_arrays
 from ..cli import run_with_file_argument
 
 logger = logging.getLogger(__name__)
@@ -12,9 +14,11 @@ logger = logging.getLogger(__name__)
 BOARD_SIZE = 5
 
 
-def main(input: TextIO) -> str:
+def read_bingo(
+    input: TextIO,
+) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
     lines = iter(input)
-    called_numbers: Iterable[float] = map(float, next(lines).strip().split(","))
+    called_numbers = np.array(next(lines).strip().split(","), dtype=float)
     boards: List[List[List[float]]] = []
     while True:
         try:
@@ -28,8 +32,12 @@ def main(input: TextIO) -> str:
         ]
         boards.append(board)
 
-    boards_array = np.array(boards)
-    assert boards_array.shape[1:] == (BOARD_SIZE, BOARD_SIZE)
+    boards_array = np.array(boards).reshape(-1, BOARD_SIZE, BOARD_SIZE)
+    return called_numbers, boards_array
+
+
+def main(input: TextIO) -> str:
+    called_numbers, boards_array = cached_arrays(read_bingo, input)
     for called_number in called_numbers:
         # cross out a number
         boards_array[boards_array == called_number] = np.nan
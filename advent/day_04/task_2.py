@@ -1,35 +1,17 @@
-import itertools
 import logging
-import re
-from typing import Iterable, List, TextIO
+from typing import TextIO
 
 import numpy as np
 
+from ..cache import cached_arrays
 from ..cli import run_with_file_argument
+from .task_1 import BOARD_SIZE, read_bingo
 
 logger = logging.getLogger(__name__)
 
-BOARD_SIZE = 5
-
 
 def main(input: TextIO) -> str:
-    lines = iter(input)
-    called_numbers: Iterable[float] = map(float, next(lines).strip().split(","))
-    boards: List[List[List[float]]] = []
-    while True:
-        try:
-            empty_line = next(lines)
-        except StopIteration:
-            break
-        assert empty_line == "\n", f"Line {empty_line!r} not empty"
-        board = [
-            [float(part) for part in re.split(r"\s+", line.strip())]
-            for line in itertools.islice(lines, 0, BOARD_SIZE)
-        ]
-        boards.append(board)
-
-    boards_array = np.array(boards)
-    assert boards_array.shape[1:] == (BOARD_SIZE, BOARD_SIZE)
+    called_numbers, boards_array = cached_arrays(read_bingo, input)
     previous = np.zeros((len(boards_array),), dtype="bool")
     for called_number in called_numbers:
         # cross out a number
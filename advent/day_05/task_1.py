@@ -1,10 +1,13 @@
 import logging
 import re
-from typing import List, TextIO
+from typing import List, TextIO, Tuple
 
 import numpy as np
+import numpy.typing as npt
 
+from ..cache import cached_array
 from ..cli import run_with_file_argument
+from ..memory import fits, require
 
 logger = logging.getLogger(__name__)
 
@@ -12,8 +15,12 @@ LINE_REGEXP = re.compile(
     r"^(?P<start_x>\d+),(?P<start_y>\d+)\s\-\>\s(?P<end_x>\d+),(?P<end_y>\d+)$"
 )
 
+# Bytes per point of the sparse variant: its code, plus the sorted copy and the
+# unique values with their counts
+SPARSE_POINT_BYTES = 4 * 8
 
-def main(input: TextIO) -> str:
+
+def read_edges(input: TextIO) -> npt.NDArray[np.int_]:
     edges: List[List[int]] = []
     for line in input:
         line = line.strip()
@@ -23,28 +30,62 @@ def main(input: TextIO) -> str:
         assert match is not None
         start_x, start_y, end_x, end_y = map(int, match.groups())
         edges.append([start_x, start_y, end_x, end_y])
+    return np.array(edges, dtype=int).reshape(-1, 4)
+
+
+def is_straight(edge: npt.NDArray[np.int_]) -> bool:
+    start_x, start_y, end_x, end_y = edge
+    return bool(start_x == end_x or start_y == end_y)
+
+
+def get_line_points(
+    edge: npt.NDArray[np.int_],
+) -> Tuple[npt.NDArray[np.int_], npt.NDArray[np.int_]]:
+    """Points of a horizontal, vertical or diagonal line, ends included."""
+    start_x, start_y, end_x, end_y = edge
+    length = max(abs(end_x - start_x), abs(end_y - start_y)) + 1
+    steps = np.arange(length)
+    return (
+        start_x + np.sign(end_x - start_x) * steps,
+        start_y + np.sign(end_y - start_y) * steps,
+    )
 
-    edges_array = np.array(edges)
-    del edges
-
-    max_x = max(np.max(edges_array[:, 0]), np.max(edges_array[:, 2]))
-    max_y = max(np.max(edges_array[:, 1]), np.max(edges_array[:, 3]))
-    board = np.zeros((max_x + 1, max_y + 1))
-
-    for start_x, start_y, end_x, end_y in edges_array:
-        if start_x == end_x:  # vertical line
-            ranges = [start_y, end_y]
-            board[start_x, min(ranges) : max(ranges) + 1] += 1
-        elif start_y == end_y:  # horizontal line
-            ranges = [start_x, end_x]
-            board[min(ranges) : max(ranges) + 1, start_y] += 1
-        else:
-            logger.warning(
-                "Skipping line %d,%d -> %d,%d", start_x, start_y, end_x, end_y
-            )
-            continue
 
-    overlapping_points = np.sum(board >= 2)
+def count_overlaps_dense(edges: npt.NDArray[np.int_], shape: Tuple[int, int]) -> int:
+    board = np.zeros(shape, dtype=np.int32)
+    for edge in edges:
+        # A line never crosses the same point twice
+        board[get_line_points(edge)] += 1
+    return int(np.sum(board >= 2))
+
+
+def count_overlaps_sparse(edges: npt.NDArray[np.int_], shape: Tuple[int, int]) -> int:
+    _, height = shape
+    codes = np.concatenate([xs * height + ys for xs, ys in map(get_line_points, edges)])
+    _, counts = np.unique(codes, return_counts=True)
+    return int(np.sum(counts >= 2))
+
+
+def count_overlaps(edges: npt.NDArray[np.int_]) -> int:
+    """Number of points where at least two of the lines overlap."""
+    if not len(edges):
+        return 0
+    max_x = int(np.max(edges[:, (0, 2)]))
+    max_y = int(np.max(edges[:, (1, 3)]))
+    shape = (max_x + 1, max_y + 1)
+    if fits(shape[0] * shape[1] * np.dtype(np.int32).itemsize, "Dense board"):
+        return count_overlaps_dense(edges, shape)
+    lengths = np.max(np.abs(edges[:, 2:] - edges[:, :2]), axis=1) + 1
+    require(int(np.sum(lengths)) * SPARSE_POINT_BYTES, "Sparse line points")
+    return count_overlaps_sparse(edges, shape)
+
+
+def main(input: TextIO) -> str:
+    edges = cached_array(read_edges, input)
+    straight = np.array([is_straight(edge) for edge in edges], dtype=bool)
+    for start_x, start_y, end_x, end_y in edges[~straight]:
+        logger.warning("Skipping line %d,%d -> %d,%d", start_x, start_y, end_x, end_y)
+    overlapping_points = count_overlaps(edges[straight])
     return f"{overlapping_points}"
 
 
@@ -2,18 +2,30 @@ import logging
 from typing import List, TextIO
 
 import numpy as np
+import numpy.typing as npt
 
 from ..cli import run_with_file_argument
+from ..logs import lazy
+from ..strategies import alternative
 
 logger = logging.getLogger(__name__)
 
 DAYS = 80
+MAX_COUNTER = 8
 
 
-def main(input: TextIO) -> str:
-    fish = np.array(list(map(int, input.readline().strip().split(","))), dtype=int)
-    logger.info("Initial state: %s", ",".join(map(str, fish)))
-    for day in range(DAYS):
+def format_fish(fish: npt.NDArray[np.int_]) -> str:
+    return ",".join(map(str, fish))
+
+
+def read_fish(input: TextIO) -> npt.NDArray[np.int_]:
+    return np.array(list(map(int, input.readline().strip().split(","))), dtype=int)
+
+
+def simulate_fish(fish: npt.NDArray[np.int_], days: int) -> int:
+    """Follow every single fish, which takes time and memory exponential in days."""
+    logger.info("Initial state: %s", lazy(format_fish, fish))
+    for day in range(days):
         mask = fish == 0
         new_fish_count = np.sum(mask)
         fish[mask] = 6
@@ -21,8 +33,29 @@ def main(input: TextIO) -> str:
         new_fish = np.ones((new_fish_count,), dtype=int)
         new_fish.fill(8)
         fish = np.concatenate([fish, new_fish])
-        logger.info("After %2d days: %s", day + 1, ",".join(map(str, fish[:26])))
-    return f"{len(fish)}"
+        logger.debug("After %2d days: %s", day + 1, lazy(format_fish, fish[:26]))
+    return len(fish)
+
+
+def count_fish(fish: npt.NDArray[np.int_], days: int) -> int:
+    """Only count how many fish have each timer value."""
+    timers = np.bincount(fish, minlength=MAX_COUNTER + 1)
+    for day in range(days):
+        new_fish_count = timers[0]
+        timers[:-1] = timers[1:]
+        timers[-1] = new_fish_count
+        timers[6] += new_fish_count
+    fish_count = int(np.sum(timers))
+    return fish_count
+
+
+def main(input: TextIO) -> str:
+    return f"{simulate_fish(read_fish(input), DAYS)}"
+
+
+@alternative(main, "histogram")
+def main_histogram(input: TextIO) -> str:
+    return f"{count_fish(read_fish(input), DAYS)}"
 
 
 if __name__ == "__main__":
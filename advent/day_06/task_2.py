@@ -2,27 +2,22 @@ import logging
 from collections import Counter
 from typing import List, TextIO
 
-import numpy as np
-
 from ..cli import run_with_file_argument
+from ..strategies import alternative
+from .task_1 import count_fish, read_fish, simulate_fish
 
 logger = logging.getLogger(__name__)
 
 DAYS = 256
-MAX_COUNTER = 8
 
 
 def main(input: TextIO) -> str:
-    fish = np.zeros((MAX_COUNTER + 1,), dtype=int)
-    for status in map(int, input.readline().strip().split(",")):
-        fish[status] += 1
-    for day in range(DAYS):
-        new_fish_count = fish[0]
-        fish[:-1] = fish[1:]
-        fish[-1] = new_fish_count
-        fish[6] += new_fish_count
-    fish_count = np.sum(fish)
-    return f"{fish_count}"
+    return f"{count_fish(read_fish(input), DAYS)}"
+
+
+@alternative(main, "simulation", reference=True)
+def main_simulation(input: TextIO) -> str:
+    return f"{simulate_fish(read_fish(input), DAYS)}"
 
 
 if __name__ == "__main__":
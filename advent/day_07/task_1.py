@@ -1,21 +1,50 @@
 import logging
-from typing import TextIO
+from typing import Callable, TextIO
 
 import numpy as np
+import numpy.typing as npt
 
 from ..cli import run_with_file_argument
+from ..memory import get_chunk_length
 
 logger = logging.getLogger(__name__)
 
+FuelCost = Callable[[npt.NDArray[np.int_]], npt.NDArray[np.int_]]
 
-def main(input: TextIO) -> str:
-    crabs = np.array(list(map(int, input.readline().strip().split(","))), dtype=int)
-    max_x = np.max(crabs)
-    distances = np.abs(crabs - np.expand_dims(np.arange(max_x + 1), 1))
-    target_distances = np.sum(distances, axis=-1)
+# Bytes per crab and target position: the distances and the fuel costs derived
+# from them
+DISTANCE_BYTES = 2 * 8
+
+
+def read_crabs(input: TextIO) -> npt.NDArray[np.int_]:
+    return np.array(list(map(int, input.readline().strip().split(","))), dtype=int)
+
+
+def get_linear_cost(distances: npt.NDArray[np.int_]) -> npt.NDArray[np.int_]:
+    return distances
+
+
+def get_fuel_used(crabs: npt.NDArray[np.int_], get_cost: FuelCost) -> int:
+    positions = np.arange(np.max(crabs) + 1)
+    # The crabs' distances to all positions at once may not fit, so the positions
+    # are tried in chunks
+    chunk_length = get_chunk_length(
+        crabs.size * DISTANCE_BYTES, positions.size, "Distance matrix"
+    )
+    target_distances = np.empty(positions.size, dtype=int)
+    for start in range(0, positions.size, chunk_length):
+        chunk = positions[start : start + chunk_length]
+        distances = np.abs(crabs - np.expand_dims(chunk, 1))
+        target_distances[start : start + chunk.size] = np.sum(
+            get_cost(distances), axis=-1
+        )
     position = np.argmin(target_distances)
     logger.info("Best position: %d", position)
-    fuel_used = np.min(target_distances)
+    return int(target_distances[position])
+
+
+def main(input: TextIO) -> str:
+    fuel_used = get_fuel_used(read_crabs(input), get_linear_cost)
     return f"{fuel_used}"
 
 
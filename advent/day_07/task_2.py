@@ -2,21 +2,21 @@ import logging
 from typing import TextIO
 
 import numpy as np
+import numpy.typing as npt
 
 from ..cli import run_with_file_argument
+from .task_1 import get_fuel_used, read_crabs
 
 logger = logging.getLogger(__name__)
 
 
+def get_triangular_cost(distances: npt.NDArray[np.int_]) -> npt.NDArray[np.int_]:
+    fuel_distances: npt.NDArray[np.int_] = (1 + distances) * distances // 2
+    return fuel_distances
+
+
 def main(input: TextIO) -> str:
-    crabs = np.array(list(map(int, input.readline().strip().split(","))), dtype=int)
-    max_x = np.max(crabs)
-    distances = np.abs(crabs - np.expand_dims(np.arange(max_x + 1), 1))
-    fuel_distances = (1 + distances) / 2 * distances
-    target_distances = np.sum(fuel_distances, axis=-1)
-    position = np.argmin(target_distances)
-    logger.info("Best position: %d", position)
-    fuel_used = int(np.min(target_distances))
+    fuel_used = get_fuel_used(read_crabs(input), get_triangular_cost)
     return f"{fuel_used}"
 
 
@@ -1,39 +1,26 @@
 import logging
-from typing import TextIO
 
 import numpy as np
 from numpy import typing as npt
 
+from ..cache import cached_array
 from ..cli import run_with_file_argument
-from ..io_utils import get_lines
+from ..grid import Grid2D
+from ..inputs import reads_buffer
+from ..io_utils import Buffer, parse_digit_grid
 
 logger = logging.getLogger(__name__)
 
 
-def parse_input(input: TextIO) -> npt.NDArray[int]:
-    return np.array([list(map(int, line)) for line in get_lines(input)], dtype=int)
-
-
 def get_low_points(heightmap: npt.NDArray[int]) -> npt.NDArray[bool]:
-    height, width = heightmap.shape
-    LOTS = 100
-
-    padded_heightmap = np.pad(
-        heightmap, [(1, 1), (1, 1)], mode="constant", constant_values=LOTS
-    )
-
-    left_higher = padded_heightmap[1:-1, :-2] > heightmap
-    right_higher = padded_heightmap[1:-1, 2:] > heightmap
-    top_higher = padded_heightmap[:-2, 1:-1] > heightmap
-    bottom_higher = padded_heightmap[2:, 1:-1] > heightmap
-    all_higher: npt.NDArray[bool] = (
-        left_higher & right_higher & top_higher & bottom_higher
-    )
-    return all_higher
+    grid = Grid2D.from_array(heightmap)
+    all_lower: npt.NDArray[bool] = grid.values < grid.min_neighbours(grid.values)
+    return all_lower.reshape(grid.shape)
 
 
-def main(input: TextIO) -> str:
-    heightmap = parse_input(input)
+@reads_buffer
+def main(input: Buffer) -> str:
+    heightmap = cached_array(parse_digit_grid, input)
     all_higher = get_low_points(heightmap)
     risk = np.sum(all_higher * (heightmap + 1))
     return f"{risk}"
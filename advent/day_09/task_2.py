@@ -2,74 +2,65 @@ import logging
 import operator
 from collections import defaultdict, deque
 from functools import reduce
-from typing import Deque, Dict, Iterable, List, NamedTuple, TextIO
+from typing import Deque, Dict, List
 
 import numpy as np
 from numpy import typing as npt
 
+from ..cache import cached_array
 from ..cli import run_with_file_argument
-from ..io_utils import get_lines
-from .task_1 import get_low_points, parse_input
+from ..grid import Grid2D
+from ..inputs import reads_buffer
+from ..io_utils import Buffer, parse_digit_grid
+from ..logs import lazy
+from .task_1 import get_low_points
 
 logger = logging.getLogger(__name__)
 
 
-class Point(NamedTuple):
-    x: int
-    y: int
-
-
 MIN_VALUE = -1
 MAX_VALUE = 10
 
 
-def get_neighbours(point: Point, heightmap: npt.NDArray[int]) -> Iterable[Point]:
-    height, width = heightmap.shape
-    if point.x - 1 >= 0:
-        yield Point(x=point.x - 1, y=point.y)
-    if point.x + 1 < width:
-        yield Point(x=point.x + 1, y=point.y)
-    if point.y - 1 >= 0:
-        yield Point(x=point.x, y=point.y - 1)
-    if point.y + 1 < height:
-        yield Point(x=point.x, y=point.y + 1)
-
-
-def find_basin(low_point: Point, heightmap: npt.NDArray[int]) -> npt.NDArray[bool]:
-    queue: Dict[Point, int] = defaultdict(lambda: MAX_VALUE)
+def find_basin(
+    low_point: int, heights: List[int], neighbours: List[List[int]]
+) -> npt.NDArray[bool]:
+    queue: Dict[int, int] = defaultdict(lambda: MAX_VALUE)
     queue[low_point] = MIN_VALUE
-    basin = np.zeros_like(heightmap, dtype=bool)
+    basin = bytearray(len(heights))
 
     while queue:
         point = next(iter(queue))
         previous_value = queue.pop(point)
-        point_value = heightmap[point.y, point.x]
+        point_value = heights[point]
         if point_value >= 9:
             continue  # peaks are excluded
         elif point_value <= previous_value:
             continue  # not uphill traversal
         # This point is another part of the basin
-        basin[point.y, point.x] = True
+        basin[point] = True
         # Check all neighboring points
-        for neighbour_point in get_neighbours(point, heightmap):
-            if basin[neighbour_point.y, neighbour_point.x]:
+        for neighbour_point in neighbours[point]:
+            if basin[neighbour_point]:
                 continue  # this point is already belonging to this basin
             queue[neighbour_point] = min(queue[neighbour_point], point_value)
 
-    logger.info("Basin\n%s", basin.astype(int))
-    return basin
+    basin_mask: npt.NDArray[bool] = np.frombuffer(basin, dtype=bool)
+    return basin_mask
 
 
-def main(input: TextIO) -> str:
-    heightmap = parse_input(input)
+@reads_buffer
+def main(input: Buffer) -> str:
+    heightmap = cached_array(parse_digit_grid, input)
+    grid = Grid2D.from_array(heightmap)
+    heights = grid.values.tolist()
+    neighbours = grid.neighbours4.to_lists()
     low_points = get_low_points(heightmap)
     basins: List[npt.NDArray[bool]] = []
-    for y, row in enumerate(low_points):
-        for x, cell in enumerate(row):
-            if not cell:
-                continue
-            basin = find_basin(Point(x=x, y=y), heightmap)
-            basins.append(basin)
+    for low_point in np.flatnonzero(low_points).tolist():
+        basin = find_basin(low_point, heights, neighbours)
+        logger.debug("Basin\n%s", lazy(lambda: basin.reshape(grid.shape).astype(int)))
+        basins.append(basin)
     basins.sort(key=np.sum, reverse=True)
     biggest_basins = basins[:3]
     sizes = map(np.sum, biggest_basins)
@@ -64,9 +64,9 @@ def main(input: TextIO) -> str:
             )
             score += line_score
         except IncompleteSyntax:
-            logger.info("%r incomplete", line)
+            logger.debug("%r incomplete", line)
         else:
-            logger.info("%r OK", line)
+            logger.debug("%r OK", line)
     return f"{score}"
 
 
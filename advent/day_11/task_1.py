@@ -1,64 +1,61 @@
 import logging
-from typing import List, Optional, TextIO
+from typing import List, Optional
 
 import numpy as np
 import numpy.typing as npt
 
+from ..cache import cached_array
 from ..cli import run_with_file_argument
-from ..io_utils import get_lines
+from ..grid import Grid2D
+from ..inputs import reads_buffer
+from ..io_utils import Buffer, parse_digit_grid
 
 logger = logging.getLogger(__name__)
 
 
-def read_input(input: TextIO) -> npt.NDArray[int]:
-    return np.array([list(map(int, line)) for line in get_lines(input)], dtype=int)
-
-
 STEPS = 100
-PADDING = 1
 MAX_ENERGY = 9
 
 
-def main(input: TextIO) -> str:
-    octopusses = read_input(input)
-    padded_octopusses = np.pad(octopusses, [(PADDING, PADDING), (PADDING, PADDING)])
-    octopusses = padded_octopusses[PADDING:-PADDING, PADDING:-PADDING]
+def read_octopusses(input: Buffer) -> Grid2D:
+    # A copy of the parsed grid, as the energy levels are updated in place
+    return Grid2D.from_array(cached_array(parse_digit_grid, input).astype(int))
+
+
+def simulate_step(octopusses: Grid2D) -> int:
+    """Advance the energy levels by one step and return the number of flashes."""
+    energy = octopusses.values
+    # increase power level of all octopusses by 1
+    energy += 1
+
+    # a mask of octopusses that already flashed this step
+    flashed = np.zeros_like(energy, dtype=bool)
+
+    while True:
+        # the ones that we will flash are the ones that have the power and have
+        # not yet flashed this step
+        flash: npt.NDArray[np.bool_] = (energy > MAX_ENERGY) & ~flashed
+        if not flash.any():
+            break  # no more octopusses left to flash
+        flashed |= flash
+        # Increase the power of all neighbouring octopusses
+        energy += octopusses.count_neighbours(flash, diagonal=True)
+
+    # Zero any octopusses that flashed
+    energy[flashed] = 0
+    return int(np.count_nonzero(flashed))
+
+
+@reads_buffer
+def main(input: Buffer) -> str:
+    octopusses = read_octopusses(input)
 
-    logger.info("Before any steps:\n%s", octopusses)
+    logger.info("Before any steps:\n%s", octopusses.as_array())
 
     flashes = 0
     for step in range(STEPS):
-        # increase power level of all octopusses by 1
-        octopusses += 1
-
-        # a mask of octopusses that did not yet flash this step
-        can_still_flash = np.ones_like(octopusses)
-
-        while True:
-            # find the octopusses that need to flash
-            flashing: npt.NDArray[bool] = octopusses > MAX_ENERGY
-
-            # the ones that we will flash are the ones that have the power and have
-            # not yet flashed this step
-            flash: npt.NDArray[bool] = flashing & can_still_flash
-
-            indices = np.argwhere(flash)
-            if not len(indices):
-                break  # no more octopusses left to flash
-            # Increase the power of all neighbouring octopusses
-            for y, x in indices:
-                padded_octopusses[
-                    y - 1 + PADDING : y + 2 + PADDING, x - 1 + PADDING : x + 2 + PADDING
-                ] += 1
-                # Mark the ones that flashed and remove them from the mask
-                can_still_flash[y, x] = False
-                # Count number of flashes
-                flashes += 1
-
-        # Zero any octopusses that flashed
-        octopusses[octopusses > MAX_ENERGY] = 0
-
-        logger.info("Step %d:\n%s", step + 1, octopusses)
+        flashes += simulate_step(octopusses)
+        logger.debug("Step %d:\n%s", step + 1, octopusses.as_array())
     return f"{flashes}"
 
 
@@ -2,6 +2,7 @@ import logging
 from typing import Iterable, Sequence, TextIO
 
 from ..cli import run_with_file_argument
+from ..logs import lazy
 from .graph import read_graph
 from .interfaces import END_NODE, START_NODE, IGraph, Node
 
@@ -29,7 +30,7 @@ def main(input: TextIO) -> str:
     graph: IGraph = read_graph(input)
     paths = 0
     for path in get_paths(graph, [START_NODE]):
-        logger.info("Found path %s", ", ".join(path))
+        logger.debug("Found path %s", lazy(", ".join, path))
         paths += 1
     return f"{paths}"
 
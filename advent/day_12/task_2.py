@@ -3,6 +3,7 @@ from collections import Counter
 from typing import Iterable, Sequence, TextIO
 
 from ..cli import run_with_file_argument
+from ..logs import lazy
 from .graph import read_graph
 from .interfaces import END_NODE, START_NODE, IGraph, Node
 
@@ -42,7 +43,7 @@ def main(input: TextIO) -> str:
     graph: IGraph = read_graph(input)
     paths = 0
     for path in get_paths(graph, [START_NODE]):
-        logger.info("Found path %s", ", ".join(path))
+        logger.debug("Found path %s", lazy(", ".join, path))
         paths += 1
     return f"{paths}"
 
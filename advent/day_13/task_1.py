@@ -9,6 +9,7 @@ import numpy.typing as npt
 
 from ..cli import run_with_file_argument
 from ..io_utils import get_lines
+from ..logs import lazy
 
 logger = logging.getLogger(__name__)
 PATTERN = re.compile(r"^fold along (?P<axis>[xy])=(?P<value>\d+)$")
@@ -99,14 +100,17 @@ FOLDING_MAP: Dict[FoldAxis, Callable[[npt.NDArray[bool], int], npt.NDArray[bool]
 
 def main(input: TextIO) -> str:
     paper = get_paper(input)
-    logger.info("Initial paper\n%s", format_paper(paper))
+    logger.debug("Initial paper\n%s", lazy(format_paper, paper))
     # not now analyze only the first fold
     folds = get_folds(input)
     folds = itertools.islice(folds, 1)
     for axis, value in folds:
         folding_callback = FOLDING_MAP[axis]
         paper = folding_callback(paper, value)
-        logger.info("After folding %s at %s\n%s", axis.name, value, format_paper(paper))
+        logger.debug(
+            "After folding %s at %s\n%s", axis.name, value, lazy(format_paper, paper)
+        )
+    logger.info("Folded paper\n%s", lazy(format_paper, paper))
 
     number_of_points = np.sum(paper > 0)
 
@@ -4,6 +4,7 @@ from typing import TextIO
 import numpy as np
 
 from ..cli import run_with_file_argument
+from ..logs import lazy
 from .task_1 import FOLDING_MAP, format_paper, get_folds, get_paper
 
 logger = logging.getLogger(__name__)
@@ -11,13 +12,16 @@ logger = logging.getLogger(__name__)
 
 def main(input: TextIO) -> str:
     paper = get_paper(input)
-    logger.info("Initial paper\n%s", format_paper(paper))
+    logger.debug("Initial paper\n%s", lazy(format_paper, paper))
     # not now analyze only the first fold
     folds = get_folds(input)
     for axis, value in folds:
         folding_callback = FOLDING_MAP[axis]
         paper = folding_callback(paper, value)
-        logger.info("After folding %s at %s\n%s", axis.name, value, format_paper(paper))
+        logger.debug(
+            "After folding %s at %s\n%s", axis.name, value, lazy(format_paper, paper)
+        )
+    logger.info("Folded paper\n%s", lazy(format_paper, paper))
 
     number_of_points = np.sum(paper > 0)
 
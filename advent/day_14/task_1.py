@@ -3,13 +3,14 @@ import logging
 import re
 from typing import Dict, Iterable, List, NewType, TextIO, Tuple, TypeVar
 
-from returns.curry import partial
-
 from ..cli import run_with_file_argument
 from ..io_utils import get_lines, read_empty_line
+from ..strategies import alternative
 
 logger = logging.getLogger(__name__)
 
+STEPS = 10
+
 Element = NewType("Element", str)
 
 
@@ -57,7 +58,7 @@ def grow_polymer(polymer: Iterable[Element], rules: RulesDict) -> Iterable[Eleme
     yield end
 
 
-def main(input: TextIO, steps: int) -> str:
+def main(input: TextIO, steps: int = STEPS) -> str:
     polymer: Iterable[Element] = get_polymer(input)
     logger.info("Initial polymer %s", "".join(polymer))
 
@@ -83,5 +84,13 @@ def main(input: TextIO, steps: int) -> str:
     return f"{most_common_count - least_common_count}"
 
 
+@alternative(main, "memoized")
+def main_memoized(input: TextIO) -> str:
+    # Imported here, as task 2 builds on this module
+    from .task_2 import main as count_memoized
+
+    return count_memoized(input, steps=STEPS)
+
+
 if __name__ == "__main__":
-    run_with_file_argument(partial(main, steps=10))
+    run_with_file_argument(main)
@@ -1,14 +1,17 @@
 import logging
 from typing import Dict, Iterable, TextIO, Tuple
 
-from returns.curry import partial
-
 from ..cli import run_with_file_argument
 from ..io_utils import read_empty_line
-from .task_1 import Element, RulesDict, get_polymer, get_rules, rolling_window
+from ..strategies import alternative
+from .task_1 import Element, RulesDict, get_polymer, get_rules
+from .task_1 import main as enumerate_main
+from .task_1 import rolling_window
 
 logger = logging.getLogger(__name__)
 
+STEPS = 40
+
 ElementCounts = Dict[Element, int]
 
 
@@ -44,7 +47,7 @@ def grow_polymer(
     return result
 
 
-def main(input: TextIO, steps: int) -> str:
+def main(input: TextIO, steps: int = STEPS) -> str:
     polymer: Iterable[Element] = get_polymer(input)
     logger.info("Initial polymer %s", "".join(polymer))
 
@@ -67,5 +70,10 @@ def main(input: TextIO, steps: int) -> str:
     return f"{most_common_count - least_common_count}"
 
 
+@alternative(main, "enumeration", reference=True)
+def main_enumeration(input: TextIO) -> str:
+    return enumerate_main(input, steps=STEPS)
+
+
 if __name__ == "__main__":
-    run_with_file_argument(partial(main, steps=40))
+    run_with_file_argument(main)
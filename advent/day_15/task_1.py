@@ -1,101 +1,93 @@
 from __future__ import annotations
 
 import logging
-from typing import Iterable, NamedTuple, TextIO
+from typing import Callable, Iterator, Tuple
 
-import numpy as np
 import numpy.typing as npt
-from tqdm import tqdm
 
+from ..cache import cached_array
 from ..cli import run_with_file_argument
-from ..io_utils import read_numbers_array
+from ..grid import ORTHOGONAL_DELTAS, Grid2D
+from ..inputs import reads_buffer
+from ..io_utils import Buffer, parse_digit_grid
+from ..memory import fits, require
+from ..shortest_path import dial, get_entry_cost_edges
+from ..tracing import span
 
 logger = logging.getLogger(__name__)
 
+MAX_RISK = 9
+# Peak bytes per cell of the two ways of searching, measured with tracemalloc
+TABLES_CELL_BYTES = 700
+LAZY_CELL_BYTES = 200
 
-class Point(NamedTuple):
-    y: int
-    x: int
-
-    def get_left(self) -> Point:
-        return Point(x=self.x - 1, y=self.y)
-
-    def get_right(self) -> Point:
-        return Point(x=self.x + 1, y=self.y)
-
-    def get_above(self) -> Point:
-        return Point(x=self.x, y=self.y - 1)
-
-    def get_below(self) -> Point:
-        return Point(x=self.x, y=self.y + 1)
+RiskCallback = Callable[[int, int], int]
 
 
 def find_route_risk(world: npt.NDArray[int]) -> int:
-    height, width = world.shape
+    grid = Grid2D.from_array(world)
 
-    # the distances are all set to "infinity"
-    max_value = np.iinfo(world.dtype).max
-    distances = np.zeros_like(world)
-    distances.fill(max_value)
+    # we start at top left and are supposed to end at bottom right
+    start_point = grid.index(y=0, x=0)
+    end_point = grid.index(y=grid.height - 1, x=grid.width - 1)
+
+    # risks are small integers, so a bucket queue beats a heap
+    get_neighbours = get_entry_cost_edges(
+        grid.neighbours4.to_lists(), grid.values.tolist()
+    )
+    path = dial(
+        start_point,
+        get_neighbours,
+        is_target=lambda point: point == end_point,
+        max_cost=MAX_RISK,
+    )
+    assert path is not None, "End point not reachable"
+    return path.cost
+
+
+def find_route_risk_lazy(get_risk: RiskCallback, height: int, width: int) -> int:
+    """
+    Like `find_route_risk`, for worlds too big for neighbour tables: the neighbours
+    and their risks are worked out only for the points the search reaches.
+    """
+
+    def get_neighbours(point: int) -> Iterator[Tuple[int, int]]:
+        y, x = divmod(point, width)
+        for dy, dx in ORTHOGONAL_DELTAS:
+            neighbour_y = y + dy
+            neighbour_x = x + dx
+            if 0 <= neighbour_y < height and 0 <= neighbour_x < width:
+                yield neighbour_y * width + neighbour_x, get_risk(
+                    neighbour_y, neighbour_x
+                )
+
+    end_point = height * width - 1
+    path = dial(
+        0,
+        get_neighbours,
+        is_target=lambda point: point == end_point,
+        max_cost=MAX_RISK,
+    )
+    assert path is not None, "End point not reachable"
+    return path.cost
+
+
+def get_route_risk(world: npt.NDArray[int]) -> int:
+    if fits(world.size * TABLES_CELL_BYTES, "Neighbour tables"):
+        return find_route_risk(world)
+    require(world.size * LAZY_CELL_BYTES, "Route search")
+    rows = world.tolist()
+    height, width = world.shape
+    return find_route_risk_lazy(lambda y, x: rows[y][x], height, width)
 
-    # Mask of visited points
-    visited = np.zeros_like(world, dtype=bool)
 
-    # we start at top left and are supposed to end at bottom right
-    start_point = Point(y=0, x=0)
-    end_point = Point(y=height - 1, x=width - 1)
-
-    # we visit the starting points
-    distances[start_point] = 0
-
-    def get_neighbours(point: Point) -> Iterable[Point]:
-        # left
-        left = point.get_left()
-        if left.x >= 0:
-            yield left
-        # right
-        right = point.get_right()
-        if right.x < width:
-            yield right
-        # above
-        above = point.get_above()
-        if above.y >= 0:
-            yield above
-        # below
-        below = point.get_below()
-        if below.y < height:
-            yield below
-
-    def get_unvisited_neighbours(point: Point) -> Iterable[Point]:
-        for point in get_neighbours(point):
-            if not visited[point]:
-                yield point
-
-    def choose_current() -> Point:
-        # Choose unvisited point with lowest distance
-        y, x = np.unravel_index(
-            np.argmin(np.where(visited, max_value, distances)), distances.shape
-        )
-        return Point(y=int(y), x=int(x))
-
-    # calculate distances from start point to all other points
-    # using Dijkstra's algorithm
-    for _ in tqdm(range(width * height)):
-        current = choose_current()
-        for neighbour in get_unvisited_neighbours(current):
-            cost = world[neighbour]
-            distances[neighbour] = min(distances[neighbour], distances[current] + cost)
-        visited[current] = True
-
-    # query for distance to end point
-    risk: int = distances[end_point]
-    return risk
-
-
-def main(input: TextIO) -> str:
+@reads_buffer
+def main(input: Buffer) -> str:
     # read the map
-    world = read_numbers_array(input)
-    risk = find_route_risk(world)
+    with span("parse"):
+        world = cached_array(parse_digit_grid, input)
+    with span("solve"):
+        risk = get_route_risk(world)
     return f"{risk}"
 
 
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
 import logging
-from typing import TextIO
+from functools import partial
+from typing import List
 
 import numpy as np
 import numpy.typing as npt
 
+from ..cache import cached_array
 from ..cli import run_with_file_argument
-from ..io_utils import read_numbers_array
-from .task_1 import find_route_risk
+from ..inputs import reads_buffer
+from ..io_utils import Buffer, parse_digit_grid
+from ..memory import fits, require
+from ..tracing import span
+from .task_1 import (LAZY_CELL_BYTES, TABLES_CELL_BYTES, find_route_risk,
+                     find_route_risk_lazy)
 
 logger = logging.getLogger(__name__)
 
@@ -37,13 +43,38 @@ def enlarge_world(world: npt.NDArray[int]) -> npt.NDArray[int]:
     return enlarged_world
 
 
-def main(input: TextIO) -> str:
+def get_enlarged_risk(rows: List[List[int]], y: int, x: int) -> int:
+    """Risk of a point of the enlarged world, without enlarging it."""
+    y_diff, tile_y = divmod(y, len(rows))
+    x_diff, tile_x = divmod(x, len(rows[0]))
+    return (rows[tile_y][tile_x] + x_diff + y_diff - 1) % 9 + 1
+
+
+@reads_buffer
+def main(input: Buffer) -> str:
     # read the map
-    world = read_numbers_array(input)
-    # enlarge
-    enlarged_world = enlarge_world(world)
-    # find route
-    risk = find_route_risk(enlarged_world)
+    with span("parse"):
+        world = cached_array(parse_digit_grid, input)
+    height, width = world.shape
+    enlarged_size = world.size * ENLARGE_TIMES ** 2
+    if fits(
+        enlarged_size * (world.itemsize + TABLES_CELL_BYTES),
+        "Enlarged world with neighbour tables",
+    ):
+        # enlarge
+        with span("enlarge"):
+            enlarged_world = enlarge_world(world)
+        # find route
+        with span("solve"):
+            risk = find_route_risk(enlarged_world)
+    else:
+        require(enlarged_size * LAZY_CELL_BYTES, "Route search")
+        with span("solve"):
+            risk = find_route_risk_lazy(
+                partial(get_enlarged_risk, world.tolist()),
+                height * ENLARGE_TIMES,
+                width * ENLARGE_TIMES,
+            )
     return f"{risk}"
 
 
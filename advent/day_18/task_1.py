@@ -268,21 +268,21 @@ def split_number(
 
 
 def reduce_snailfish_number(number: ContainerNumber) -> ContainerNumber:
-    logger.info("Reducing number %r", number)
+    logger.debug("Reducing number %r", number)
     while True:
         container_node = find_leftmost_nested_pair(number)
         if container_node is not None:
             number = explode_number(number, container_node)
-            logger.info("After exploding %r", number)
+            logger.debug("After exploding %r", number)
             continue
         literal_node = find_leftmost_big_number(number)
         if literal_node is not None:
             number = split_number(number, literal_node)
-            logger.info("After splitting %r", number)
+            logger.debug("After splitting %r", number)
             continue
         # No more action to take
         break
-    logger.info("Reduced to %r", number)
+    logger.debug("Reduced to %r", number)
     return number
 
 
@@ -6,19 +6,28 @@ import math
 import re
 from collections import Counter
 from itertools import combinations, starmap
-from typing import Dict, Iterable, List, TextIO, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, List, TextIO, Tuple
 
-import networkx as nx
 import numpy as np
 import numpy.typing as npt
-from networkx.drawing.nx_pydot import write_dot
 
+from ..cache import cached_arrays
 from ..cli import run_with_file_argument
 from ..io_utils import read_line
+from ..lazy import lazy_import
+from ..tracing import span
+
+if TYPE_CHECKING:
+    import networkx as nx
+    from networkx.drawing import nx_pydot
+else:
+    nx = lazy_import("networkx")
+    nx_pydot = lazy_import("networkx.drawing.nx_pydot")
 
 logger = logging.getLogger(__name__)
 
 HEADER_PATTERN = re.compile(r"^\-\-\-\sscanner\s\d+\s\-\-\-$")
+NEIGHBOURHOOD_GRAPH_PATH = "neighbourhood_graph.png"
 
 
 def read_beacons(input: TextIO) -> Iterable[npt.NDArray]:
@@ -34,6 +43,21 @@ def read_beacons(input: TextIO) -> Iterable[npt.NDArray]:
         yield np.array(beacons)
 
 
+def read_scanners(input: TextIO) -> Tuple[npt.NDArray[int], npt.NDArray[np.intp]]:
+    """Beacons of all the scanners in one array, and the offsets where each starts."""
+    scanners = list(read_beacons(input))
+    offsets = np.zeros(len(scanners) + 1, dtype=np.intp)
+    np.cumsum([len(beacons) for beacons in scanners], out=offsets[1:])
+    beacons = np.concatenate(scanners) if scanners else np.empty((0, 3), dtype=int)
+    return beacons, offsets
+
+
+def split_scanners(
+    beacons: npt.NDArray[int], offsets: npt.NDArray[np.intp]
+) -> List[npt.NDArray[int]]:
+    return [beacons[start:end] for start, end in zip(offsets, offsets[1:])]
+
+
 def distance(a: npt.NDArray[int], b: npt.NDArray[int]) -> float:
     dist: float = np.linalg.norm(a - b)
     return dist
@@ -235,11 +259,21 @@ def build_neighbourhood_graph(scanners: List[npt.NDArray[int]]) -> nx.Graph:
             )
             neighbourhood_graph.add_edge(a_idx, b_idx)
 
-    nx.nx_pydot.to_pydot(neighbourhood_graph).write_png("neighbourhood_graph.png")
+    write_neighbourhood_graph(neighbourhood_graph)
 
     return neighbourhood_graph
 
 
+def write_neighbourhood_graph(neighbourhood_graph: nx.Graph) -> None:
+    # Rendering pulls in pydot and needs graphviz installed, so it is a debug aid only
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    try:
+        nx_pydot.to_pydot(neighbourhood_graph).write_png(NEIGHBOURHOOD_GRAPH_PATH)
+    except FileNotFoundError:
+        logger.warning("Graphviz not found, not writing %s", NEIGHBOURHOOD_GRAPH_PATH)
+
+
 def traverse_and_resolve_scanners(
     scanners: List[npt.NDArray[int]], neighbourhood_graph: nx.Graph
 ) -> npt.NDArray[int]:
@@ -283,18 +317,23 @@ def traverse_and_resolve_scanners(
 
 
 def main(input: TextIO) -> str:
-    scanners = list(read_beacons(input))
+    with span("parse"):
+        scanners = split_scanners(*cached_arrays(read_scanners, input))
 
-    check_for_repeating_distances(scanners)
+    with span("check distances"):
+        check_for_repeating_distances(scanners)
 
-    neighbourhood_graph = build_neighbourhood_graph(scanners)
+    with span("build graph"):
+        neighbourhood_graph = build_neighbourhood_graph(scanners)
 
-    traverse_and_resolve_scanners(scanners, neighbourhood_graph)
+    with span("resolve scanners"):
+        traverse_and_resolve_scanners(scanners, neighbourhood_graph)
     # Now all beacons are in the same dimension space
     # So we can just see how many unique points we have
 
-    all_beacons = set(map(tuple, itertools.chain.from_iterable(scanners)))
-    number_of_beacons = len(all_beacons)
+    with span("count beacons"):
+        all_beacons = set(map(tuple, itertools.chain.from_iterable(scanners)))
+        number_of_beacons = len(all_beacons)
     logger.info("Unique beacons %d", number_of_beacons)
     return f"{number_of_beacons}"
 
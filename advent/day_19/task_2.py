@@ -8,15 +8,16 @@ from collections import Counter
 from itertools import combinations, starmap
 from typing import Dict, Iterable, List, TextIO, Tuple
 
-import networkx as nx
 import numpy as np
 import numpy.typing as npt
-from networkx.drawing.nx_pydot import write_dot
 
+from ..cache import cached_arrays
 from ..cli import run_with_file_argument
 from ..io_utils import read_line
+from ..tracing import span
 from .task_1 import (build_neighbourhood_graph, check_for_repeating_distances,
-                     read_beacons, traverse_and_resolve_scanners)
+                     read_scanners, split_scanners,
+                     traverse_and_resolve_scanners)
 
 logger = logging.getLogger(__name__)
 
@@ -27,15 +28,20 @@ def manhattan_distance(a: npt.NDArray, b: npt.NDArray) -> float:
 
 
 def main(input: TextIO) -> str:
-    scanners = list(read_beacons(input))
-    check_for_repeating_distances(scanners)
-    neighbourhood_graph = build_neighbourhood_graph(scanners)
-    scanner_positions = traverse_and_resolve_scanners(scanners, neighbourhood_graph)
-
-    scanner_distances = itertools.starmap(
-        manhattan_distance, combinations(scanner_positions, 2)
-    )
-    biggest_distance = max(scanner_distances)
+    with span("parse"):
+        scanners = split_scanners(*cached_arrays(read_scanners, input))
+    with span("check distances"):
+        check_for_repeating_distances(scanners)
+    with span("build graph"):
+        neighbourhood_graph = build_neighbourhood_graph(scanners)
+    with span("resolve scanners"):
+        scanner_positions = traverse_and_resolve_scanners(scanners, neighbourhood_graph)
+
+    with span("find biggest distance"):
+        scanner_distances = itertools.starmap(
+            manhattan_distance, combinations(scanner_positions, 2)
+        )
+        biggest_distance = max(scanner_distances)
     return f"{biggest_distance}"
 
 
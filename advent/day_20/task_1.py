@@ -5,88 +5,64 @@ from typing import TextIO
 
 import numpy as np
 import numpy.typing as npt
-from returns.curry import partial
 
 from ..cli import run_with_file_argument
+from ..grid import get_window_codes
 from ..io_utils import get_lines, read_empty_line, read_line
+from ..logs import lazy
 
 logger = logging.getLogger(__name__)
 
 CHAR_MAPPING = {"#": 1, ".": 0}
 INVERSE_MAPPING = {v: k for k, v in CHAR_MAPPING.items()}
 
+ITERATIONS = 2
 
-def map_line(line: str) -> npt.NDArray[int]:
+
+def map_line(line: str) -> npt.NDArray[np.int_]:
     integers = map(CHAR_MAPPING.__getitem__, line)
     return np.array(list(integers), dtype=int)
 
 
-def get_algorithm(input: TextIO) -> npt.NDArray[int]:
+def get_algorithm(input: TextIO) -> npt.NDArray[np.int_]:
     algorithm = map_line(read_line(input))
-    assert algorithm.shape == (2 ** 9,)
+    assert algorithm.shape == (2**9,)
     return algorithm
 
 
-def read_image(input: TextIO) -> npt.NDArray[int]:
+def read_image(input: TextIO) -> npt.NDArray[np.int_]:
     return np.array(list(map(map_line, get_lines(input))), dtype=int)
 
 
-def format_image(image: npt.NDArray[int]) -> str:
+def format_image(image: npt.NDArray[np.int_]) -> str:
     return "\n".join(
         map(lambda line: "".join(map(INVERSE_MAPPING.__getitem__, line)), image)
     )
 
 
-POSITION_DECODER = 2 ** (np.arange(9)[::-1])
-
-
-def enhance_pixel(square: npt.NDArray[int], algorithm: npt.NDArray[int]) -> int:
-    assert square.shape == (3, 3)
-    index = np.sum(np.ravel(square) * POSITION_DECODER)
-    pixel_value: int = algorithm[index]
-    return pixel_value
-
-
 def enhance_image(
-    image: npt.NDArray[int], algorithm: npt.NDArray[int], fill_value: int
-) -> npt.NDArray[int]:
-    height, width = image.shape
-    padding = 1
-    # We pad the image so that we can take points also around the edge pixels
-    extruded_image = np.pad(
-        image,
-        [(padding * 2, padding * 2), (padding * 2, padding * 2)],
-        mode="constant",
-        constant_values=fill_value,
-    )
-
-    target_image_height = height + 2 * padding
-    target_image_width = width + 2 * padding
-    target_image = np.zeros((target_image_height, target_image_width), dtype=int)
-
-    for y in range(target_image_height):
-        for x in range(target_image_width):
-            square = extruded_image[
-                y + padding - 1 : y + padding + 2, x + padding - 1 : x + padding + 2
-            ]
-            target_image[y, x] = enhance_pixel(square, algorithm)
+    image: npt.NDArray[np.int_], algorithm: npt.NDArray[np.int_], fill_value: int
+) -> npt.NDArray[np.int_]:
+    # The image grows by a pixel on each side, as pixels around the edge pixels
+    # also take them into account
+    target_image: npt.NDArray[np.int_] = algorithm[get_window_codes(image, fill_value)]
     return target_image
 
 
-def main(input: TextIO, iterations: int) -> str:
+def main(input: TextIO, iterations: int = ITERATIONS) -> str:
     algorithm = get_algorithm(input)
     read_empty_line(input)
     image = read_image(input)
-    logger.info("Input image:\n%s", format_image(image))
+    logger.debug("Input image:\n%s", lazy(format_image, image))
 
     for iteration in range(iterations):
         fill_value = 0 if iteration % 2 == 0 else 1
         image = enhance_image(image, algorithm, fill_value)
-        logger.info("Enhanced image:\n%s", format_image(image))
+        logger.debug("Enhanced image:\n%s", lazy(format_image, image))
 
     pixels_lit = np.sum(image)
     return f"{pixels_lit}"
 
 
 if __name__ == "__main__":
-    run_with_file_argument(partial(main, iterations=2))
+    run_with_file_argument(main)
@@ -5,9 +5,13 @@ import logging
 from returns.curry import partial
 
 from ..cli import run_with_file_argument
-from .task_1 import main
+from .task_1 import main as enhance_main
 
 logger = logging.getLogger(__name__)
 
+ITERATIONS = 50
+
+main = partial(enhance_main, iterations=ITERATIONS)
+
 if __name__ == "__main__":
-    run_with_file_argument(partial(main, iterations=50))
+    run_with_file_argument(main)
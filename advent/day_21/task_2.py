@@ -2,13 +2,14 @@ from __future__ import annotations
 
 import logging
 from collections import Counter, defaultdict
+from functools import lru_cache
 from typing import (Dict, Iterable, Iterator, Literal, NamedTuple, TextIO,
                     Tuple, Union)
 
-from tqdm import tqdm
-
 from ..cli import run_with_file_argument
 from ..io_utils import read_line
+from ..progress import track
+from ..strategies import alternative
 from .task_1 import BOARD_SIZE, PATTERN
 
 logger = logging.getLogger(__name__)
@@ -84,23 +85,51 @@ def get_outcomes(
             )
 
 
+@lru_cache(maxsize=None)
+def count_wins(current_player: Player, other_player: Player) -> Tuple[int, int]:
+    """
+    Number of universes in which the current and the other player win. Games reach
+    the same positions and scores in many universes, so they are counted once.
+    """
+    current_wins = other_wins = 0
+    for outcome, number_of_universes in THREE_ROLLS_POSSIBILITIES.items():
+        new_current_player = current_player.move(outcome)
+        if new_current_player.score >= MAX_SCORE:
+            current_wins += number_of_universes
+        else:
+            next_wins, next_other_wins = count_wins(other_player, new_current_player)
+            current_wins += number_of_universes * next_other_wins
+            other_wins += number_of_universes * next_wins
+    return current_wins, other_wins
+
+
+def report_wins(player_1_wins: int, player_2_wins: int) -> str:
+    logger.info("Player 1 wins in %d universes", player_1_wins)
+    logger.info("Player 2 wins in %d universes", player_2_wins)
+    return f"{max(player_1_wins, player_2_wins)}"
+
+
 def main(input: TextIO) -> str:
+    player_1_wins, player_2_wins = count_wins(
+        Player(id=1, position=read_position(input), score=0),
+        Player(id=2, position=read_position(input), score=0),
+    )
+    return report_wins(player_1_wins, player_2_wins)
+
+
+@alternative(main, "enumeration", reference=True)
+def main_enumeration(input: TextIO) -> str:
     results: Dict[WinningPlayer, int] = defaultdict(int)
-    for winning_player, number_of_universes in tqdm(
+    for winning_player, number_of_universes in track(
         get_outcomes(
             current_player=Player(id=1, position=read_position(input), score=0),
             other_player=Player(id=2, position=read_position(input), score=0),
             universes=1,
-        )
+        ),
+        "outcomes",
     ):
         results[winning_player] += number_of_universes
-
-    player_1_wins = results[1]
-    logger.info("Player 1 wins in %d universes", player_1_wins)
-    player_2_wins = results[2]
-    logger.info("Player 2 wins in %d universes", player_2_wins)
-
-    return f"{max(player_1_wins, player_2_wins)}"
+    return report_wins(results[1], results[2])
 
 
 if __name__ == "__main__":
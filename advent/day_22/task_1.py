@@ -2,14 +2,16 @@ from __future__ import annotations
 
 import logging
 import re
-from dataclasses import dataclass
-from typing import Iterable, TextIO
+from dataclasses import astuple, dataclass, fields
+from typing import Iterable, Iterator, TextIO
 
 import numpy as np
 import numpy.typing as npt
 
+from ..cache import cached_array
 from ..cli import run_with_file_argument
 from ..io_utils import get_lines
+from ..tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +58,17 @@ def read_instructions(input: TextIO) -> Iterable[Instruction]:
     return map(read_instruction, get_lines(input))
 
 
+def read_instruction_table(input: TextIO) -> npt.NDArray[int]:
+    """Instructions as rows of their fields, with the state as 0 or 1."""
+    rows = [astuple(instruction) for instruction in read_instructions(input)]
+    return np.array(rows, dtype=int).reshape(-1, len(fields(Instruction)))
+
+
+def get_instructions(table: npt.NDArray[int]) -> Iterator[Instruction]:
+    for state, *bounds in table.tolist():
+        yield Instruction(bool(state), *bounds)
+
+
 def filter_instructions(
     instructions: Iterable[Instruction], max_axis: int
 ) -> Iterable[Instruction]:
@@ -90,10 +103,16 @@ def apply_instructions(
 
 def main(input: TextIO) -> str:
     max_axis = 50
-    instructions = filter_instructions(read_instructions(input), max_axis)
-    reactor = get_reactor(max_axis)
-    apply_instructions(instructions, reactor, max_axis)
-    reactor_cubes_on = np.sum(reactor)
+    with span("parse"):
+        instructions = list(
+            filter_instructions(
+                get_instructions(cached_array(read_instruction_table, input)), max_axis
+            )
+        )
+    with span("solve"):
+        reactor = get_reactor(max_axis)
+        apply_instructions(instructions, reactor, max_axis)
+        reactor_cubes_on = np.sum(reactor)
     return f"{reactor_cubes_on}"
 
 
@@ -6,10 +6,13 @@ import operator
 from typing import Iterable, List, Set, TextIO, Tuple
 
 import numpy as np
-import tqdm
 
+from ..cache import cached_array
 from ..cli import run_with_file_argument
-from .task_1 import Instruction, read_instructions
+from ..memory import fits, require
+from ..progress import progress
+from ..tracing import span
+from .task_1 import Instruction, get_instructions, read_instruction_table
 
 logger = logging.getLogger(__name__)
 
@@ -46,33 +49,19 @@ class Reactor:
             self._get_cube_slice(self.valid_x_points, self.x_points, x_slice),
         ] = value
 
-    @staticmethod
-    def _get_cube_size(points: List[int], index: int) -> int:
-        start = points[index]
-        stop = points[index + 1]
-        return stop - start
-
-    def get_volume(
-        self, *, z_cube_index: int, y_cube_index: int, x_cube_index: int
-    ) -> int:
-        z_size = self._get_cube_size(self.z_points, z_cube_index)
-        y_size = self._get_cube_size(self.y_points, y_cube_index)
-        x_size = self._get_cube_size(self.x_points, x_cube_index)
-        return x_size * y_size * z_size
-
     def sum(self) -> int:
+        # Sizes of the cells between consecutive points along each axis
+        z_sizes = np.diff(np.array(self.z_points, dtype=np.int64))
+        y_sizes = np.diff(np.array(self.y_points, dtype=np.int64))
+        x_sizes = np.diff(np.array(self.x_points, dtype=np.int64))
+        plane_volumes = np.outer(y_sizes, x_sizes)
+        # The cube has a slot for every point, the last ones start no cell
+        cells = self.cube[:-1, :-1, :-1]
         result = 0
-        with tqdm.tqdm(total=len(self)) as pbar:
-            for z_cube_index in range(len(self.z_points) - 1):
-                for y_cube_index in range(len(self.y_points) - 1):
-                    for x_cube_index in range(len(self.x_points) - 1):
-                        if self.cube[z_cube_index, y_cube_index, x_cube_index]:
-                            result += self.get_volume(
-                                z_cube_index=z_cube_index,
-                                y_cube_index=y_cube_index,
-                                x_cube_index=x_cube_index,
-                            )
-                        pbar.update(1)
+        with progress("sum planes", total=len(z_sizes)) as meter:
+            for z_size, plane in zip(z_sizes.tolist(), cells):
+                result += z_size * int(plane_volumes[plane].sum())
+                meter.update()
         return result
 
     def __len__(self) -> int:
@@ -80,7 +69,11 @@ class Reactor:
         return functools.reduce(operator.mul, shape)
 
 
-def get_reactor(instructions: List[Instruction]) -> Reactor:
+Points = Tuple[List[int], List[int], List[int]]
+
+
+def get_points(instructions: List[Instruction]) -> Points:
+    """Coordinates where some instruction's cuboid starts or ends, along each axis."""
     x_points = sorted(
         {
             mark
@@ -102,6 +95,11 @@ def get_reactor(instructions: List[Instruction]) -> Reactor:
             for mark in [instruction.min_z, instruction.max_z + 1]
         }
     )
+    return x_points, y_points, z_points
+
+
+def get_reactor(instructions: List[Instruction]) -> Reactor:
+    x_points, y_points, z_points = get_points(instructions)
     reactor = Reactor(x_points=x_points, y_points=y_points, z_points=z_points)
     logger.info("Created reactor of size %s", f"{len(reactor):,}")
     return reactor
@@ -116,15 +114,69 @@ def apply_instructions(instructions: List[Instruction], reactor: Reactor) -> Non
         ] = instruction.state
 
 
+def count_lit_by_planes(instructions: List[Instruction], points: Points) -> int:
+    """
+    Like summing a `Reactor`, holding only one z plane of it at a time: every plane
+    replays the instructions whose cuboids cross it.
+    """
+    x_points, y_points, z_points = points
+    x_indices, y_indices, z_indices = (
+        {point: index for index, point in enumerate(axis_points)}
+        for axis_points in points
+    )
+    cuboids = [
+        (
+            instruction.state,
+            slice(z_indices[instruction.min_z], z_indices[instruction.max_z + 1]),
+            slice(y_indices[instruction.min_y], y_indices[instruction.max_y + 1]),
+            slice(x_indices[instruction.min_x], x_indices[instruction.max_x + 1]),
+        )
+        for instruction in instructions
+    ]
+    z_sizes = np.diff(np.array(z_points, dtype=np.int64))
+    plane_volumes = np.outer(
+        np.diff(np.array(y_points, dtype=np.int64)),
+        np.diff(np.array(x_points, dtype=np.int64)),
+    )
+    plane = np.zeros(plane_volumes.shape, dtype=bool)
+    result = 0
+    with progress("sum planes", total=len(z_sizes)) as meter:
+        for z_index, z_size in enumerate(z_sizes.tolist()):
+            plane[:] = False
+            for state, z_slice, y_slice, x_slice in cuboids:
+                if z_slice.start <= z_index < z_slice.stop:
+                    plane[y_slice, x_slice] = state
+            result += z_size * int(plane_volumes[plane].sum())
+            meter.update()
+    return result
+
+
 def main(input: TextIO) -> str:
     logger.info("Reading instructions")
-    instructions = list(read_instructions(input))
-    logger.info("Creating reactor")
-    reactor = get_reactor(instructions)
-    logger.info("Applying instructions")
-    apply_instructions(instructions, reactor)
-    logger.info("Calculating cubes lit")
-    return f"{reactor.sum()}"
+    with span("parse"):
+        instructions = list(
+            get_instructions(cached_array(read_instruction_table, input))
+        )
+    points = x_points, y_points, z_points = get_points(instructions)
+    # A byte for the state of every cell, and the volumes of a plane's cells
+    plane_cells = len(y_points) * len(x_points)
+    volumes_size = plane_cells * np.dtype(np.int64).itemsize
+    if fits(plane_cells * len(z_points) + volumes_size, "Dense reactor"):
+        logger.info("Creating reactor")
+        with span("create reactor"):
+            reactor = get_reactor(instructions)
+        logger.info("Applying instructions")
+        with span("apply instructions"):
+            apply_instructions(instructions, reactor)
+        logger.info("Calculating cubes lit")
+        with span("sum"):
+            cubes_lit = reactor.sum()
+    else:
+        require(plane_cells + volumes_size, "Reactor plane")
+        logger.info("Calculating cubes lit plane by plane")
+        with span("sum"):
+            cubes_lit = count_lit_by_planes(instructions, points)
+    return f"{cubes_lit}"
 
 
 if __name__ == "__main__":
@@ -4,7 +4,8 @@ from typing import Any, List, Tuple
 import pytest
 
 from .task_1 import Instruction
-from .task_2 import apply_instructions, get_reactor
+from .task_2 import (apply_instructions, count_lit_by_planes, get_points,
+                     get_reactor)
 
 TASK_2_SAMPLES: List[Tuple[List[Instruction], int]] = [
     # manual sample 4 (line with break and a skip)
@@ -804,3 +805,11 @@ def test_task_2(
     apply_instructions(instructions, reactor)
     actual = reactor.sum()
     assert actual == expected_cubes_lit
+
+
+@pytest.mark.parametrize("instructions,expected_cubes_lit", TASK_2_SAMPLES)
+def test_count_lit_by_planes(
+    instructions: List[Instruction], expected_cubes_lit: int
+) -> None:
+    actual = count_lit_by_planes(instructions, get_points(instructions))
+    assert actual == expected_cubes_lit
@@ -1,13 +1,20 @@
+from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, Generic, Iterable, List, Optional, Set, Tuple, TypeVar
+from typing import (TYPE_CHECKING, Dict, Generic, Iterable, List, Optional,
+                    Set, Tuple, TypeVar)
 
-import networkx as nx
-from networkx.algorithms.shortest_paths import generic as nx_algo
-from pydantic.generics import GenericModel
 from returns.curry import partial
 
+from ..lazy import lazy_import
 from .enums import Amphipod
 
+if TYPE_CHECKING:
+    import networkx as nx
+    from networkx.algorithms.shortest_paths import generic as nx_algo
+else:
+    nx = lazy_import("networkx")
+    nx_algo = lazy_import("networkx.algorithms.shortest_paths.generic")
+
 FieldType = TypeVar("FieldType", bound=Enum)
 
 
@@ -16,7 +23,8 @@ class MoveType(Enum):
     LEAVE_ROOM = "leave"
 
 
-class PossibleMove(GenericModel, Generic[FieldType]):
+@dataclass
+class PossibleMove(Generic[FieldType]):
     from_field: FieldType
     """Source field of the move."""
 
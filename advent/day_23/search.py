@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from typing import (Callable, Dict, Hashable, Iterable, List, Optional, Set,
+                    Tuple, TypeVar)
+
+from ..shortest_path import a_star, get_distances
+from .enums import Amphipod
+from .map import (MOVE_COSTS, FieldType, PossibleMove, get_allowed_moves,
+                  get_move_energy, move)
+
+logger = logging.getLogger(__name__)
+
+IDType = TypeVar("IDType", bound=Hashable)
+
+Board = Dict[FieldType, Optional[Amphipod]]
+
+
+def get_energy_heuristic(
+    edges: Iterable[Tuple[FieldType, FieldType]],
+    rooms: Dict[Amphipod, Set[FieldType]],
+) -> Callable[[Board[FieldType]], int]:
+    """
+    Lower bound of the energy still needed to sort a board: every amphipod outside of
+    its room has to at least walk to the nearest field of that room.
+    """
+    neighbours: Dict[FieldType, List[Tuple[FieldType, int]]] = defaultdict(list)
+    for node_a, node_b in edges:
+        neighbours[node_a].append((node_b, 1))
+        neighbours[node_b].append((node_a, 1))
+
+    room_distances: Dict[Amphipod, Dict[FieldType, int]] = {}
+    for amphipod, room in rooms.items():
+        distances: Dict[FieldType, int] = {}
+        for room_field in room:
+            for field, distance in get_distances(room_field, neighbours.__getitem__).items():
+                distances[field] = min(distance, distances.get(field, distance))
+        room_distances[amphipod] = distances
+
+    def estimate_energy(board: Board[FieldType]) -> int:
+        return sum(
+            MOVE_COSTS[amphipod] * room_distances[amphipod][field]
+            for field, amphipod in board.items()
+            if amphipod is not None
+        )
+
+    return estimate_energy
+
+
+def find_cheapest_moves(
+    *,
+    starting_board: Board[FieldType],
+    target_board: Board[FieldType],
+    possible_moves: List[PossibleMove[FieldType]],
+    board_hasher: Callable[[Board[FieldType]], IDType],
+    estimate_energy: Callable[[Board[FieldType]], int],
+) -> Tuple[List[PossibleMove[FieldType]], int]:
+    """
+    A* search over the boards, where each allowed move is an edge weighted by the
+    energy it takes.
+    """
+    boards: Dict[IDType, Board[FieldType]] = {}
+
+    def get_board_id(board: Board[FieldType]) -> IDType:
+        board_id = board_hasher(board)
+        boards.setdefault(board_id, board)
+        return board_id
+
+    def get_next_boards(board_id: IDType) -> Iterable[Tuple[IDType, int]]:
+        board = boards[board_id]
+        for allowed_move in get_allowed_moves(board, possible_moves):
+            yield get_board_id(move(board, allowed_move)), get_move_energy(
+                board, allowed_move
+            )
+
+    target_board_id = board_hasher(target_board)
+    path = a_star(
+        get_board_id(starting_board),
+        get_next_boards,
+        is_target=lambda board_id: board_id == target_board_id,
+        heuristic=lambda board_id: estimate_energy(boards[board_id]),
+    )
+    assert path is not None, "Board cannot be sorted"
+    logger.info("Explored %d boards", len(boards))
+
+    # Recover the moves between the consecutive boards of the path
+    moves: List[PossibleMove[FieldType]] = []
+    for board_id, next_board_id in zip(path.nodes, path.nodes[1:]):
+        board = boards[board_id]
+        moves.append(
+            next(
+                allowed_move
+                for allowed_move in get_allowed_moves(board, possible_moves)
+                if board_hasher(move(board, allowed_move)) == next_board_id
+            )
+        )
+    return moves, path.cost
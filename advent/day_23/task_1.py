@@ -5,11 +5,13 @@ import multiprocessing
 import random
 import sys
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Tuple
 
 from returns.curry import partial
 
 from ..cli import run_with_file_argument
+from ..strategies import alternative
 from .dfs import dfs
 from .dfs2 import dfs as dfs2
 from .enums import Amphipod
@@ -17,6 +19,7 @@ from .input_parsing import read_board
 from .map import (FieldType, MoveType, PossibleMove, format_amphipod,
                   get_blank_board, get_possible_moves, get_target_board,
                   is_allowed_move, move)
+from .search import find_cheapest_moves, get_energy_heuristic
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +60,46 @@ class Field(Enum):
 
 IDType = str
 
+ROOMS = {
+    Amphipod.AMBER: {Field.AH, Field.AL},
+    Amphipod.BRONZE: {Field.BH, Field.BL},
+    Amphipod.COPPER: {Field.CH, Field.CL},
+    Amphipod.DESERT: {Field.DH, Field.DL},
+}
+HALLWAY = {Field.LF, Field.LN, Field.AB, Field.BC, Field.CD, Field.RN, Field.RF}
+EDGES = [
+    (Field.LF, Field.LN),
+    (Field.LN, Field.AX),
+    (Field.AX, Field.AH),
+    (Field.AH, Field.AL),
+    (Field.AX, Field.AB),
+    (Field.AB, Field.BX),
+    (Field.BX, Field.BH),
+    (Field.BH, Field.BL),
+    (Field.BX, Field.BC),
+    (Field.BC, Field.CX),
+    (Field.CX, Field.CH),
+    (Field.CH, Field.CL),
+    (Field.CX, Field.CD),
+    (Field.CD, Field.DX),
+    (Field.DX, Field.DH),
+    (Field.DH, Field.DL),
+    (Field.DX, Field.RN),
+    (Field.RN, Field.RF),
+]
+
+
+@lru_cache(maxsize=None)
+def get_field_moves() -> Tuple[PossibleMove[Field], ...]:
+    # The moves only depend on the map, so they are worked out once per process
+    return tuple(
+        get_possible_moves(nodes=Field, edges=EDGES, rooms=ROOMS, hallway=HALLWAY)
+    )
+
+
+def warm_up() -> None:
+    get_field_moves()
+
 
 def get_board_id(
     nodes: Iterable[FieldType], board: Dict[FieldType, Optional[Amphipod]]
@@ -90,48 +133,62 @@ def run_dfs(
     )
 
 
-def main(input: TextIO) -> str:
+def read_boards(
+    input: TextIO,
+) -> Tuple[Dict[Field, Optional[Amphipod]], Dict[Field, Optional[Amphipod]]]:
     blank_board = get_blank_board(Field)
 
     input_board = {Field(key): amphipod for key, amphipod in read_board(input).items()}
     starting_board: Dict[Field, Optional[Amphipod]] = {**blank_board, **input_board}
-    rooms = {
-        Amphipod.AMBER: {Field.AH, Field.AL},
-        Amphipod.BRONZE: {Field.BH, Field.BL},
-        Amphipod.COPPER: {Field.CH, Field.CL},
-        Amphipod.DESERT: {Field.DH, Field.DL},
-    }
     target_board: Dict[Field, Optional[Amphipod]] = {
         **blank_board,
-        **get_target_board(rooms),
+        **get_target_board(ROOMS),
     }
-    possible_moves = get_possible_moves(
-        nodes=Field,
-        edges=[
-            (Field.LF, Field.LN),
-            (Field.LN, Field.AX),
-            (Field.AX, Field.AH),
-            (Field.AH, Field.AL),
-            (Field.AX, Field.AB),
-            (Field.AB, Field.BX),
-            (Field.BX, Field.BH),
-            (Field.BH, Field.BL),
-            (Field.BX, Field.BC),
-            (Field.BC, Field.CX),
-            (Field.CX, Field.CH),
-            (Field.CH, Field.CL),
-            (Field.CX, Field.CD),
-            (Field.CD, Field.DX),
-            (Field.DX, Field.DH),
-            (Field.DH, Field.DL),
-            (Field.DX, Field.RN),
-            (Field.RN, Field.RF),
-        ],
-        rooms=rooms,
-        hallway={Field.LF, Field.LN, Field.AB, Field.BC, Field.CD, Field.RN, Field.RF},
+    return starting_board, target_board
+
+
+def report_moves(
+    starting_board: Dict[Field, Optional[Amphipod]],
+    moves: List[PossibleMove[Field]],
+    energy: int,
+) -> str:
+    logger.info("Best solution with %d moves and energy %d", len(moves), energy)
+    board = starting_board
+    # logger.info("Starting board\n%s", format_board(board))
+    for best_move in moves:
+        amphipod = board[best_move.from_field]
+        assert amphipod is not None
+        logger.info(
+            "Step: %s %s -> %s",
+            amphipod.name,
+            best_move.from_field.value,
+            best_move.to_field.value,
+        )
+        board = move(board, best_move)
+        # logger.info("Board\n%s", format_board(board))
+    return f"{energy}"
+
+
+def main(input: TextIO) -> str:
+    starting_board, target_board = read_boards(input)
+    possible_moves = list(get_field_moves())
+    logger.info("Found %d possible moves", len(possible_moves))
+
+    moves, energy = find_cheapest_moves(
+        starting_board=starting_board,
+        target_board=target_board,
+        possible_moves=possible_moves,
+        board_hasher=partial(get_board_id, Field),
+        estimate_energy=get_energy_heuristic(EDGES, ROOMS),
     )
+    return report_moves(starting_board, moves, energy)
+
+
+@alternative(main, "dfs")
+def main_dfs(input: TextIO) -> str:
+    starting_board, target_board = read_boards(input)
+    possible_moves = list(get_field_moves())
     board_hasher = partial(get_board_id, Field)
-    logger.info("Found %d possible moves", len(possible_moves))
 
     moves, energy = dfs2(
         starting_board=starting_board,
@@ -153,21 +210,7 @@ def main(input: TextIO) -> str:
     #     )
 
     # for moves, energy in results:
-    logger.info("Best solution with %d moves and energy %d", len(moves), energy)
-    board = starting_board
-    # logger.info("Starting board\n%s", format_board(board))
-    for best_move in moves:
-        amphipod = board[best_move.from_field]
-        assert amphipod is not None
-        logger.info(
-            "Step: %s %s -> %s",
-            amphipod.name,
-            best_move.from_field.value,
-            best_move.to_field.value,
-        )
-        board = move(board, best_move)
-        # logger.info("Board\n%s", format_board(board))
-    return f"{energy}"
+    return report_moves(starting_board, moves, energy)
 
 
 if __name__ == "__main__":
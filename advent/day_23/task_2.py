@@ -1,15 +1,19 @@
 from __future__ import annotations
 
 import logging
-import sys
 from enum import Enum
-from typing import Dict, Optional, TextIO
+from functools import lru_cache
+from typing import Dict, Optional, TextIO, Tuple
+
+from returns.curry import partial
 
 from ..cli import run_with_file_argument
+from ..logs import lazy
 from .enums import Amphipod
-from .map import get_possible_moves
-from .task_1 import (dfs, format_amphipod, get_blank_board, get_target_board,
-                     move, read_board)
+from .map import PossibleMove, get_possible_moves
+from .search import find_cheapest_moves, get_energy_heuristic
+from .task_1 import (format_amphipod, get_blank_board, get_board_id,
+                     get_target_board, move, read_board)
 
 logger = logging.getLogger(__name__)
 
@@ -68,78 +72,91 @@ def format_board(board: Dict[Field, Optional[Amphipod]]) -> str:
   #########"""
 
 
+ROOMS = {
+    Amphipod.AMBER: {Field.AH, Field.AL, Field.A1, Field.A2},
+    Amphipod.BRONZE: {Field.BH, Field.BL, Field.B1, Field.B2},
+    Amphipod.COPPER: {Field.CH, Field.CL, Field.C1, Field.C2},
+    Amphipod.DESERT: {Field.DH, Field.DL, Field.D1, Field.D2},
+}
+HALLWAY = {Field.LF, Field.LN, Field.AB, Field.BC, Field.CD, Field.RN, Field.RF}
+EDGES = [
+    (Field.LF, Field.LN),
+    (Field.LN, Field.AX),
+    (Field.AX, Field.AH),
+    (Field.AH, Field.A1),
+    (Field.A1, Field.A2),
+    (Field.A2, Field.AL),
+    (Field.AX, Field.AB),
+    (Field.AB, Field.BX),
+    (Field.BX, Field.BH),
+    (Field.BH, Field.B1),
+    (Field.B1, Field.B2),
+    (Field.B2, Field.BL),
+    (Field.BX, Field.BC),
+    (Field.BC, Field.CX),
+    (Field.CX, Field.CH),
+    (Field.CH, Field.C1),
+    (Field.C1, Field.C2),
+    (Field.C2, Field.CL),
+    (Field.CX, Field.CD),
+    (Field.CD, Field.DX),
+    (Field.DX, Field.DH),
+    (Field.DH, Field.D1),
+    (Field.D1, Field.D2),
+    (Field.D2, Field.DL),
+    (Field.DX, Field.RN),
+    (Field.RN, Field.RF),
+]
+# The folded part of the diagram that is not in the input
+HIDDEN_BOARD = {
+    Field.A1: Amphipod.DESERT,
+    Field.B1: Amphipod.COPPER,
+    Field.C1: Amphipod.BRONZE,
+    Field.D1: Amphipod.AMBER,
+    Field.A2: Amphipod.DESERT,
+    Field.B2: Amphipod.BRONZE,
+    Field.C2: Amphipod.AMBER,
+    Field.D2: Amphipod.COPPER,
+}
+
+
+@lru_cache(maxsize=None)
+def get_field_moves() -> Tuple[PossibleMove[Field], ...]:
+    # The moves only depend on the map, so they are worked out once per process
+    return tuple(
+        get_possible_moves(nodes=Field, edges=EDGES, rooms=ROOMS, hallway=HALLWAY)
+    )
+
+
+def warm_up() -> None:
+    get_field_moves()
+
+
 def main(input: TextIO) -> str:
     blank_board = get_blank_board(Field)
 
     input_board = {Field(key): amphipod for key, amphipod in read_board(input).items()}
-    hidden_board = {
-        Field.A1: Amphipod.DESERT,
-        Field.B1: Amphipod.COPPER,
-        Field.C1: Amphipod.BRONZE,
-        Field.C2: Amphipod.AMBER,
-        Field.A2: Amphipod.DESERT,
-        Field.B2: Amphipod.BRONZE,
-        Field.C2: Amphipod.AMBER,
-        Field.D2: Amphipod.COPPER,
-    }
     starting_board: Dict[Field, Optional[Amphipod]] = {
         **blank_board,
         **input_board,
-        **hidden_board,
-    }
-    rooms = {
-        Amphipod.AMBER: {Field.AH, Field.AL, Field.A1, Field.A2},
-        Amphipod.BRONZE: {Field.BH, Field.BL, Field.B1, Field.B2},
-        Amphipod.COPPER: {Field.CH, Field.CL, Field.C1, Field.C2},
-        Amphipod.DESERT: {Field.DH, Field.DL, Field.D1, Field.D2},
+        **HIDDEN_BOARD,
     }
     target_board: Dict[Field, Optional[Amphipod]] = {
         **blank_board,
-        **get_target_board(rooms),
+        **get_target_board(ROOMS),
     }
-    possible_moves = get_possible_moves(
-        nodes=Field,
-        edges=[
-            (Field.LF, Field.LN),
-            (Field.LN, Field.AX),
-            (Field.AX, Field.AH),
-            (Field.AH, Field.A1),
-            (Field.A1, Field.A2),
-            (Field.A2, Field.AL),
-            (Field.AX, Field.AB),
-            (Field.AB, Field.BX),
-            (Field.BX, Field.BH),
-            (Field.BH, Field.B1),
-            (Field.B1, Field.B2),
-            (Field.B2, Field.BL),
-            (Field.BX, Field.BC),
-            (Field.BC, Field.CX),
-            (Field.CX, Field.CH),
-            (Field.CH, Field.C1),
-            (Field.C1, Field.C2),
-            (Field.C2, Field.CL),
-            (Field.CX, Field.CD),
-            (Field.CD, Field.DX),
-            (Field.DX, Field.DH),
-            (Field.DH, Field.D1),
-            (Field.D1, Field.D2),
-            (Field.D2, Field.DL),
-            (Field.DX, Field.RN),
-            (Field.RN, Field.RF),
-        ],
-        rooms=rooms,
-        hallway={Field.LF, Field.LN, Field.AB, Field.BC, Field.CD, Field.RN, Field.RF},
-    )
+    possible_moves = list(get_field_moves())
     logger.info("Found %d possible moves", len(possible_moves))
-    moves, energy = dfs(
-        nodes=Field,
+    moves, energy = find_cheapest_moves(
         starting_board=starting_board,
         target_board=target_board,
         possible_moves=possible_moves,
+        board_hasher=partial(get_board_id, Field),
+        estimate_energy=get_energy_heuristic(EDGES, ROOMS),
     )
     logger.info("Best solution with %d moves and energy %d", len(moves), energy)
     board = starting_board
-    logger.info("Starting board\n%s", format_board(board))
+    logger.info("Starting board\n%s", lazy(format_board, board))
     for best_move in moves:
         amphipod = board[best_move.from_field]
         assert amphipod is not None
@@ -150,10 +167,9 @@ def main(input: TextIO) -> str:
             best_move.to_field.value,
         )
         board = move(board, best_move)
-        logger.info("Board\n%s", format_board(board))
+        logger.debug("Board\n%s", lazy(format_board, board))
     return f"{energy}"
 
 
 if __name__ == "__main__":
-    sys.setrecursionlimit(sys.getrecursionlimit() * 100)
     run_with_file_argument(main)
@@ -4,9 +4,8 @@ import multiprocessing
 from functools import partial
 from typing import Iterable, List, Optional, TextIO, Tuple
 
-from tqdm import tqdm
-
 from ..cli import run_with_file_argument
+from ..progress import track
 from .parser import compile_program
 
 logger = logging.getLogger(__name__)
@@ -23,8 +22,8 @@ def check_number(program, inputs: List[int]) -> Optional[int]:
 def main(input: TextIO) -> str:
     program = compile_program(input)
     numbers = range(9, 1 - 1, -1)
-    possible_inputs: Iterable[List[int]] = tqdm(
-        map(list, itertools.product(*([numbers] * 14))), total=9 ** 14
+    possible_inputs: Iterable[List[int]] = track(
+        map(list, itertools.product(*([numbers] * 14))), "inputs", total=9 ** 14
     )
     with multiprocessing.Pool() as pool:
         results = pool.imap(partial(check_number, program), possible_inputs, 100_000)
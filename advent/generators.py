@@ -0,0 +1,487 @@
+"""
+Synthetic inputs for scaling tests.
+
+Every generator takes the requested size and a seeded random generator and returns
+the text of an input file that the given day's parser accepts. What the size means
+depends on the day (number of lines, side of a grid, number of scanners, ...) and is
+described by `InputGenerator.unit`. Days whose inputs have no natural size still
+get a generator, but their unit is `FIXED` and the size is ignored.
+"""
+
+import itertools
+import random
+import string
+from typing import Callable, Dict, List, NamedTuple, Set, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .day_08.task_1 import SEGMENTS_BY_DIGIT
+
+FIXED = "fixed"
+
+
+class InputGenerator(NamedTuple):
+    generate: Callable[[int, random.Random], str]
+    unit: str
+
+    @property
+    def scalable(self) -> bool:
+        return self.unit != FIXED
+
+
+GENERATORS: Dict[int, InputGenerator] = {}
+
+
+def register(
+    day: int, unit: str
+) -> Callable[
+    [Callable[[int, random.Random], str]], Callable[[int, random.Random], str]
+]:
+    def decorator(
+        generate: Callable[[int, random.Random], str],
+    ) -> Callable[[int, random.Random], str]:
+        assert day not in GENERATORS, f"Day {day} already has a generator"
+        GENERATORS[day] = InputGenerator(generate=generate, unit=unit)
+        return generate
+
+    return decorator
+
+
+def generate_input(day: int, size: int, seed: int) -> str:
+    return GENERATORS[day].generate(size, random.Random(seed))
+
+
+def lines(rows: List[str]) -> str:
+    return "".join(f"{row}\n" for row in rows)
+
+
+def digit_grid(size: int, rng: random.Random, digits: str) -> str:
+    return lines(["".join(rng.choices(digits, k=size)) for _ in range(size)])
+
+
+@register(1, unit="readings")
+def generate_day_01(size: int, rng: random.Random) -> str:
+    depth = 100
+    readings: List[str] = []
+    for _ in range(size):
+        depth = max(0, depth + rng.randint(-20, 30))
+        readings.append(f"{depth}")
+    return lines(readings)
+
+
+@register(2, unit="commands")
+def generate_day_02(size: int, rng: random.Random) -> str:
+    directions = ["forward", "down", "up"]
+    return lines([f"{rng.choice(directions)} {rng.randint(1, 9)}" for _ in range(size)])
+
+
+@register(3, unit="numbers, rounded up to a power of two")
+def generate_day_03(size: int, rng: random.Random) -> str:
+    # With every prefix of the given width present, each rating step keeps exactly
+    # half of the candidates, so no column ever runs out of zeros or ones. The
+    # random tails keep the ratings from being all ones and all zeros.
+    width = max(1, (size - 1).bit_length())
+    tail_width = 4
+    prefixes = list(range(2**width))
+    rng.shuffle(prefixes)
+    return lines(
+        [
+            f"{prefix:0{width}b}{rng.randrange(2 ** tail_width):0{tail_width}b}"
+            for prefix in prefixes
+        ]
+    )
+
+
+@register(4, unit="boards")
+def generate_day_04(size: int, rng: random.Random) -> str:
+    numbers = list(range(max(100, size)))
+    called = numbers.copy()
+    rng.shuffle(called)
+    boards: List[str] = []
+    for _ in range(size):
+        board = rng.sample(numbers, 25)
+        rows = [
+            " ".join(f"{number:2d}" for number in board[row * 5 : (row + 1) * 5])
+            for row in range(5)
+        ]
+        boards.append("\n" + lines(rows))
+    return ",".join(map(str, called)) + "\n" + "".join(boards)
+
+
+@register(5, unit="lines")
+def generate_day_05(size: int, rng: random.Random) -> str:
+    extent = 1000
+    vents: List[str] = []
+    for _ in range(size):
+        start_x, start_y = rng.randrange(extent), rng.randrange(extent)
+        kind = rng.randrange(3)
+        if kind == 0:  # horizontal
+            end_x, end_y = rng.randrange(extent), start_y
+        elif kind == 1:  # vertical
+            end_x, end_y = start_x, rng.randrange(extent)
+        else:  # diagonal at 45 degrees
+            length = rng.randrange(extent)
+            end_x = start_x + length * rng.choice([-1, 1])
+            end_y = start_y + length * rng.choice([-1, 1])
+            if not (0 <= end_x < extent and 0 <= end_y < extent):
+                end_x, end_y = start_x, start_y
+        vents.append(f"{start_x},{start_y} -> {end_x},{end_y}")
+    return lines(vents)
+
+
+@register(6, unit="fish")
+def generate_day_06(size: int, rng: random.Random) -> str:
+    return ",".join(str(rng.randint(1, 5)) for _ in range(size)) + "\n"
+
+
+@register(7, unit="crabs")
+def generate_day_07(size: int, rng: random.Random) -> str:
+    return ",".join(str(rng.randrange(size)) for _ in range(size)) + "\n"
+
+
+@register(8, unit="displays")
+def generate_day_08(size: int, rng: random.Random) -> str:
+    segments = "abcdefg"
+    displays: List[str] = []
+    for _ in range(size):
+        wiring = dict(zip(segments, rng.sample(segments, len(segments))))
+        patterns = [
+            "".join(
+                rng.sample(
+                    sorted(wiring[s.value] for s in digit_segments), len(digit_segments)
+                )
+            )
+            for digit_segments in SEGMENTS_BY_DIGIT.values()
+        ]
+        outputs = [rng.choice(patterns) for _ in range(4)]
+        rng.shuffle(patterns)
+        displays.append(f"{' '.join(patterns)} | {' '.join(outputs)}")
+    return lines(displays)
+
+
+@register(9, unit="grid side")
+def generate_day_09(size: int, rng: random.Random) -> str:
+    return digit_grid(size, rng, string.digits)
+
+
+CHUNK_PAIRS = {"(": ")", "[": "]", "{": "}", "<": ">"}
+
+
+def generate_chunks(rng: random.Random, length: int, corrupted: bool) -> str:
+    stack: List[str] = []
+    chars: List[str] = []
+    corrupt_at = rng.randrange(length // 2, length) if corrupted else -1
+    for position in range(length):
+        if position == corrupt_at and stack:
+            expected = stack[-1]
+            chars.append(rng.choice([c for c in CHUNK_PAIRS.values() if c != expected]))
+            break
+        if stack and rng.random() < 0.4:
+            chars.append(stack.pop())
+        else:
+            opening = rng.choice(list(CHUNK_PAIRS))
+            chars.append(opening)
+            stack.append(CHUNK_PAIRS[opening])
+    if not corrupted and not stack:
+        chars.append("(")  # make sure the line is incomplete
+    return "".join(chars)
+
+
+@register(10, unit="lines")
+def generate_day_10(size: int, rng: random.Random) -> str:
+    # The completion scores need an odd number of incomplete lines
+    incomplete = max(1, size // 2) | 1
+    kinds = [False] * incomplete + [True] * max(0, size - incomplete)
+    rng.shuffle(kinds)
+    return lines(
+        [generate_chunks(rng, rng.randint(20, 110), corrupted) for corrupted in kinds]
+    )
+
+
+@register(11, unit="grid side")
+def generate_day_11(size: int, rng: random.Random) -> str:
+    # Random grids need not ever flash all at once, which task 2 waits for
+    return digit_grid(size, rng, string.digits)
+
+
+@register(12, unit="edges")
+def generate_day_12(size: int, rng: random.Random) -> str:
+    # The number of paths grows exponentially, so keep the sizes small
+    cave_count = max(2, int(size**0.5) + 2)
+    small = [f"{a}{b}" for a, b in itertools.product(string.ascii_lowercase, repeat=2)]
+    small.remove("do")  # keep names away from "start" and "end" lookalikes
+    big = [name.upper() for name in small]
+    caves = rng.sample(small, cave_count) + rng.sample(big, max(1, cave_count // 3))
+    edges: Set[Tuple[str, str]] = {("start", caves[0]), (caves[-1], "end")}
+    while len(edges) < size:
+        a, b = rng.sample(caves + ["start", "end"], 2)
+        if a.isupper() and b.isupper():
+            continue  # two connected big caves would allow infinitely many paths
+        if (b, a) not in edges:
+            edges.add((a, b))
+    return lines([f"{a}-{b}" for a, b in sorted(edges)])
+
+
+@register(13, unit="dots")
+def generate_day_13(size: int, rng: random.Random) -> str:
+    folds = 6
+    width = height = 2 ** (folds + 2) * 5 + 1
+    dots = {(rng.randrange(width), rng.randrange(height)) for _ in range(size)}
+    # Dots in the far corners keep the paper as big as the folds expect
+    dots |= {(width - 1, 0), (0, height - 1)}
+    instructions: List[str] = []
+    fold_width, fold_height = width, height
+    for fold in range(folds):
+        if fold % 2 == 0:
+            fold_width //= 2
+            instructions.append(f"fold along x={fold_width}")
+        else:
+            fold_height //= 2
+            instructions.append(f"fold along y={fold_height}")
+    return lines([f"{x},{y}" for x, y in sorted(dots)]) + "\n" + lines(instructions)
+
+
+@register(14, unit="template length")
+def generate_day_14(size: int, rng: random.Random) -> str:
+    elements = rng.sample(string.ascii_uppercase, 10)
+    template = "".join(rng.choices(elements, k=max(2, size)))
+    rules = [
+        f"{a}{b} -> {rng.choice(elements)}"
+        for a, b in itertools.product(elements, repeat=2)
+    ]
+    return f"{template}\n\n" + lines(rules)
+
+
+@register(15, unit="grid side")
+def generate_day_15(size: int, rng: random.Random) -> str:
+    return digit_grid(size, rng, "123456789")
+
+
+def generate_packet(rng: random.Random, literals: int) -> str:
+    version = f"{rng.randrange(8):03b}"
+    if literals <= 1:
+        groups = [f"{rng.randrange(16):04b}" for _ in range(rng.randint(1, 4))]
+        flagged = [f"1{group}" for group in groups[:-1]] + [f"0{groups[-1]}"]
+        return version + "100" + "".join(flagged)
+
+    type_id = rng.choice([0, 1, 2, 3, 5, 6, 7])
+    if type_id >= 5:  # comparisons take exactly two operands
+        split = rng.randint(1, literals - 1)
+        budgets = [split, literals - split]
+    else:
+        children = rng.randint(2, min(literals, 8))
+        cuts = sorted(rng.sample(range(1, literals), children - 1))
+        budgets = [b - a for a, b in zip([0, *cuts], [*cuts, literals])]
+    subpackets = "".join(generate_packet(rng, budget) for budget in budgets)
+    if len(subpackets) < 2**15 and rng.random() < 0.5:
+        header = f"0{len(subpackets):015b}"
+    else:
+        header = f"1{len(budgets):011b}"
+    return version + f"{type_id:03b}" + header + subpackets
+
+
+@register(16, unit="literal packets")
+def generate_day_16(size: int, rng: random.Random) -> str:
+    bits = generate_packet(rng, max(1, size))
+    bits += "0" * (-len(bits) % 8)
+    return (
+        "".join(f"{int(bits[i : i + 4], 2):X}" for i in range(0, len(bits), 4)) + "\n"
+    )
+
+
+@register(17, unit="target distance")
+def generate_day_17(size: int, rng: random.Random) -> str:
+    size = max(size, 4)
+    min_x = size + rng.randrange(size)
+    max_x = min_x + size // 2
+    min_y = -(size + rng.randrange(size))
+    max_y = min_y + size // 2
+    return f"target area: x={min_x}..{max_x}, y={min_y}..{max_y}\n"
+
+
+def generate_snailfish(rng: random.Random, depth: int) -> str:
+    if depth == 4 or (depth > 1 and rng.random() < 0.3):
+        return str(rng.randrange(10))
+    left = generate_snailfish(rng, depth + 1)
+    right = generate_snailfish(rng, depth + 1)
+    return f"[{left},{right}]"
+
+
+@register(18, unit="numbers")
+def generate_day_18(size: int, rng: random.Random) -> str:
+    return lines([generate_snailfish(rng, 1) for _ in range(size)])
+
+
+def get_rotations() -> List[npt.NDArray[int]]:
+    rotations: List[npt.NDArray[int]] = []
+    for permutation in itertools.permutations(range(3)):
+        for signs in itertools.product([1, -1], repeat=3):
+            matrix = np.zeros((3, 3), dtype=int)
+            for row, (column, sign) in enumerate(zip(permutation, signs)):
+                matrix[row, column] = sign
+            if round(np.linalg.det(matrix)) == 1:
+                rotations.append(matrix)
+    assert len(rotations) == 24
+    return rotations
+
+
+SCANNER_RANGE = 1000
+SCANNER_SPACING = 1100
+SHARED_BEACONS = 12
+OWN_BEACONS = 4
+
+
+@register(19, unit="scanners")
+def generate_day_19(size: int, rng: random.Random) -> str:
+    # Scanners sit on a line, so only neighbours see each other's beacons.
+    # Every pair of squared distances within sight of one scanner is unique and
+    # has distinct absolute coordinate differences, which the solver relies on.
+    size = max(size, 1)
+    positions = np.array(
+        [
+            [i * SCANNER_SPACING, rng.randint(-50, 50), rng.randint(-50, 50)]
+            for i in range(size)
+        ]
+    )
+    beacons: List[npt.NDArray[int]] = []
+    seen_by: List[List[int]] = [[] for _ in range(size)]
+    distances: Set[int] = set()
+
+    def visible_from(beacon: npt.NDArray[int]) -> List[int]:
+        return [
+            i
+            for i, position in enumerate(positions)
+            if np.max(np.abs(beacon - position)) <= SCANNER_RANGE
+        ]
+
+    def try_add(beacon: npt.NDArray[int]) -> bool:
+        scanners = visible_from(beacon)
+        if not scanners:
+            return False
+        neighbours = {other for i in scanners for other in seen_by[i]}
+        new_distances: Set[int] = set()
+        for other in neighbours:
+            vector = np.abs(beacons[other] - beacon)
+            squared = int(np.sum(vector**2))
+            if len(set(vector)) < 3 or squared in distances or squared in new_distances:
+                return False
+            new_distances.add(squared)
+        distances.update(new_distances)
+        for i in scanners:
+            seen_by[i].append(len(beacons))
+        beacons.append(beacon)
+        return True
+
+    def random_beacon(
+        low: npt.NDArray[int], high: npt.NDArray[int]
+    ) -> npt.NDArray[int]:
+        return np.array([rng.randint(lo, hi) for lo, hi in zip(low, high)])
+
+    margin = 20
+    for i in range(size - 1):
+        low = np.maximum(positions[i], positions[i + 1]) - SCANNER_RANGE + margin
+        high = np.minimum(positions[i], positions[i + 1]) + SCANNER_RANGE - margin
+        added = 0
+        while added < SHARED_BEACONS:
+            added += try_add(random_beacon(low, high))
+    for i, position in enumerate(positions):
+        added = 0
+        while added < OWN_BEACONS:
+            beacon = random_beacon(
+                position - SCANNER_RANGE + margin, position + SCANNER_RANGE - margin
+            )
+            if visible_from(beacon) == [i]:
+                added += try_add(beacon)
+
+    rotations = get_rotations()
+    reports: List[str] = []
+    for i, position in enumerate(positions):
+        # The first rotation is the identity, scanner 0 defines the coordinates
+        rotation = rotations[0] if i == 0 else rng.choice(rotations)
+        visible = [beacons[index] for index in seen_by[i]]
+        rng.shuffle(visible)
+        relative = [(beacon - position) @ rotation for beacon in visible]
+        rows = [",".join(str(int(value)) for value in beacon) for beacon in relative]
+        reports.append(f"--- scanner {i} ---\n" + lines(rows))
+    return "\n".join(reports)
+
+
+@register(20, unit="image side")
+def generate_day_20(size: int, rng: random.Random) -> str:
+    # The solver assumes the infinite background flips on every step
+    algorithm = "#" + "".join(rng.choices("#.", k=510)) + "."
+    return f"{algorithm}\n\n" + digit_grid(size, rng, "#.")
+
+
+@register(21, unit=FIXED)
+def generate_day_21(size: int, rng: random.Random) -> str:
+    return lines(
+        [
+            f"Player {player} starting position: {rng.randint(1, 10)}"
+            for player in [1, 2]
+        ]
+    )
+
+
+@register(22, unit="steps")
+def generate_day_22(size: int, rng: random.Random) -> str:
+    steps: List[str] = []
+    for step in range(size):
+        # A few small steps around the origin for the initialization procedure
+        extent, length = (50, 30) if step < max(1, size // 20) else (100_000, 40_000)
+        state = "on" if step == 0 else rng.choice(["on", "off"])
+        ranges: List[str] = []
+        for axis in "xyz":
+            start = rng.randint(-extent, extent - length)
+            ranges.append(f"{axis}={start}..{start + rng.randint(0, length)}")
+        steps.append(f"{state} {','.join(ranges)}")
+    return lines(steps)
+
+
+@register(23, unit=FIXED)
+def generate_day_23(size: int, rng: random.Random) -> str:
+    amphipods = list("AABBCCDD")
+    rng.shuffle(amphipods)
+    upper = "#".join(amphipods[:4])
+    lower = "#".join(amphipods[4:])
+    return (
+        "#############\n"
+        "#...........#\n"
+        f"###{upper}###\n"
+        f"  #{lower}#\n"
+        "  #########"
+    )
+
+
+MODEL_NUMBER_DIGITS = 14
+
+
+@register(24, unit=FIXED)
+def generate_day_24(size: int, rng: random.Random) -> str:
+    instructions: List[str] = []
+    for _ in range(MODEL_NUMBER_DIGITS):
+        pops = rng.random() < 0.5
+        instructions.extend(
+            [
+                "inp w",
+                "mul x 0",
+                "add x z",
+                "mod x 26",
+                f"div z {26 if pops else 1}",
+                f"add x {rng.randint(-16, -1) if pops else rng.randint(10, 16)}",
+                "eql x w",
+                "eql x 0",
+                "mul y 0",
+                "add y 25",
+                "mul y x",
+                "add y 1",
+                "mul z y",
+                "mul y 0",
+                "add y w",
+                f"add y {rng.randint(1, 16)}",
+                "mul y x",
+                "add z y",
+            ]
+        )
+    return lines(instructions)
@@ -0,0 +1,147 @@
+"""
+Two dimensional grids stored as flat arrays.
+
+Cells are addressed by their flat index `y * width + x`. The neighbours of all cells
+are computed once per grid into CSR style tables: the neighbours of cell `i` are
+`indices[offsets[i]:offsets[i + 1]]`. Hot loops work with plain integers instead of
+allocating a point for every neighbour they visit, and whole-grid neighbourhood
+operations become single numpy calls.
+"""
+
+from functools import cached_property
+from typing import Any, List, NamedTuple, Sequence, Tuple, TypeVar
+
+import numpy as np
+import numpy.typing as npt
+
+# (dy, dx) in the order neighbours are listed
+ORTHOGONAL_DELTAS: Sequence[Tuple[int, int]] = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+DIAGONAL_DELTAS: Sequence[Tuple[int, int]] = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+WINDOW_SIZE = 3
+
+IntegerT = TypeVar("IntegerT", bound=np.integer[Any])
+
+
+class Neighbourhood(NamedTuple):
+    offsets: npt.NDArray[np.intp]
+    indices: npt.NDArray[np.intp]
+    # The cell each entry of `indices` is a neighbour of
+    sources: npt.NDArray[np.intp]
+
+    def of(self, index: int) -> npt.NDArray[np.intp]:
+        return self.indices[self.offsets[index] : self.offsets[index + 1]]
+
+    def to_lists(self) -> List[List[int]]:
+        """Neighbours as Python lists, faster to iterate one cell at a time."""
+        indices = self.indices.tolist()
+        offsets = self.offsets.tolist()
+        return [indices[start:end] for start, end in zip(offsets, offsets[1:])]
+
+
+def build_neighbourhood(
+    height: int, width: int, deltas: Sequence[Tuple[int, int]]
+) -> Neighbourhood:
+    ys, xs = np.divmod(np.arange(height * width, dtype=np.intp), width)
+    neighbour_ys = ys[:, np.newaxis] + np.array([dy for dy, _ in deltas])
+    neighbour_xs = xs[:, np.newaxis] + np.array([dx for _, dx in deltas])
+    valid = (
+        (neighbour_ys >= 0)
+        & (neighbour_ys < height)
+        & (neighbour_xs >= 0)
+        & (neighbour_xs < width)
+    )
+    # Boolean indexing goes row by row, so the neighbours stay grouped by cell
+    indices = (neighbour_ys * width + neighbour_xs)[valid]
+    degrees = valid.sum(axis=1)
+    offsets = np.zeros(height * width + 1, dtype=np.intp)
+    np.cumsum(degrees, out=offsets[1:])
+    sources = np.repeat(np.arange(height * width, dtype=np.intp), degrees)
+    return Neighbourhood(offsets=offsets, indices=indices, sources=sources)
+
+
+class Grid2D:
+    def __init__(self, values: npt.NDArray[Any], height: int, width: int) -> None:
+        assert values.shape == (height * width,), "Values do not match the shape"
+        self.values = values
+        self.height = height
+        self.width = width
+
+    @classmethod
+    def from_array(cls, array: npt.NDArray[Any]) -> "Grid2D":
+        """Wrap a 2D array, sharing its memory if it is contiguous."""
+        assert array.ndim == 2, "Grid must be two dimensional"
+        height, width = array.shape
+        return cls(np.ascontiguousarray(array).reshape(-1), height, width)
+
+    @property
+    def size(self) -> int:
+        return self.height * self.width
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.height, self.width
+
+    def index(self, y: int, x: int) -> int:
+        return y * self.width + x
+
+    def coordinates(self, index: int) -> Tuple[int, int]:
+        y, x = divmod(index, self.width)
+        return y, x
+
+    def as_array(self) -> npt.NDArray[Any]:
+        return self.values.reshape(self.shape)
+
+    @cached_property
+    def neighbours4(self) -> Neighbourhood:
+        return build_neighbourhood(self.height, self.width, ORTHOGONAL_DELTAS)
+
+    @cached_property
+    def neighbours8(self) -> Neighbourhood:
+        return build_neighbourhood(
+            self.height, self.width, [*ORTHOGONAL_DELTAS, *DIAGONAL_DELTAS]
+        )
+
+    def get_neighbourhood(self, diagonal: bool) -> Neighbourhood:
+        return self.neighbours8 if diagonal else self.neighbours4
+
+    def count_neighbours(
+        self, mask: npt.NDArray[np.bool_], diagonal: bool = False
+    ) -> npt.NDArray[np.intp]:
+        """For every cell, the number of its neighbours that are set in `mask`."""
+        neighbourhood = self.get_neighbourhood(diagonal)
+        counts: npt.NDArray[np.intp] = np.bincount(
+            neighbourhood.indices[mask[neighbourhood.sources]], minlength=self.size
+        )
+        return counts
+
+    def min_neighbours(
+        self, values: npt.NDArray[IntegerT], diagonal: bool = False
+    ) -> npt.NDArray[IntegerT]:
+        """For every cell, the minimum of `values` over its neighbours."""
+        neighbourhood = self.get_neighbourhood(diagonal)
+        if not len(neighbourhood.indices):
+            # A single cell has no neighbours to reduce over
+            return np.full_like(values, np.iinfo(values.dtype).max)
+        minimums: npt.NDArray[IntegerT] = np.minimum.reduceat(
+            values[neighbourhood.indices], neighbourhood.offsets[:-1]
+        )
+        return minimums
+
+
+def get_window_codes(
+    image: npt.NDArray[np.integer[Any]], fill_value: int
+) -> npt.NDArray[np.intp]:
+    """
+    Read the 3x3 window around every pixel of a 0/1 image as a 9 bit number, row by
+    row with the top left pixel as the most significant bit. The image is grown by a
+    pixel on each side, with pixels outside of it having `fill_value`.
+    """
+    margin = WINDOW_SIZE - 1
+    padded = np.pad(image, margin, mode="constant", constant_values=fill_value)
+    height, width = image.shape[0] + margin, image.shape[1] + margin
+    codes = np.zeros((height, width), dtype=np.intp)
+    for dy in range(WINDOW_SIZE):
+        for dx in range(WINDOW_SIZE):
+            codes <<= 1
+            codes |= padded[dy : dy + height, dx : dx + width]
+    return codes
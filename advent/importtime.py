@@ -0,0 +1,94 @@
+import logging
+import re
+import subprocess
+import sys
+from typing import List, NamedTuple, Optional, Tuple
+
+import click
+
+logger = logging.getLogger(__name__)
+
+MARKER = "advent-importtime-start"
+LINE_PATTERN = re.compile(
+    r"^import time:\s+(?P<self>\d+)\s+\|\s+(?P<cumulative>\d+)\s+\|(?P<indent>\s+)"
+    r"(?P<name>\S+)$"
+)
+
+
+class ImportTiming(NamedTuple):
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportTiming]:
+    """
+    Parse `-X importtime` output, keeping only imports that happened after the marker
+    (so the interpreter's own startup imports are left out).
+    """
+    _, found, imports = stderr.partition(MARKER)
+    assert found, "Import time marker not found"
+    timings: List[ImportTiming] = []
+    for line in imports.splitlines():
+        match = LINE_PATTERN.match(line)
+        if match is None:
+            continue
+        timings.append(
+            ImportTiming(
+                name=match.group("name"),
+                self_us=int(match.group("self")),
+                cumulative_us=int(match.group("cumulative")),
+                depth=(len(match.group("indent")) - 1) // 2,
+            )
+        )
+    return timings
+
+
+def measure_import(module_name: str) -> List[ImportTiming]:
+    code = f"import sys; sys.stderr.write({MARKER!r} + '\\n'); import {module_name}"
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        encoding="utf-8",
+        check=True,
+    )
+    return parse_importtime(process.stderr)
+
+
+def get_total_us(timings: List[ImportTiming]) -> int:
+    return sum(timing.cumulative_us for timing in timings if timing.depth == 0)
+
+
+@click.command()
+@click.argument("module_names", nargs=-1, required=True)
+@click.option("--top", type=int, default=10, show_default=True)
+@click.option(
+    "--budget-ms",
+    type=float,
+    help="Fail if importing any of the modules takes longer than this.",
+)
+def imports(
+    module_names: Tuple[str, ...], top: int, budget_ms: Optional[float]
+) -> None:
+    """Report import times of the given modules, like `python -X importtime`."""
+    over_budget: List[str] = []
+    for module_name in module_names:
+        timings = measure_import(module_name)
+        total_ms = get_total_us(timings) / 1000
+        click.echo(f"{module_name}: {total_ms:.1f} ms, {len(timings)} modules")
+        slowest = sorted(timings, key=lambda timing: timing.self_us, reverse=True)
+        for timing in slowest[:top]:
+            click.echo(
+                f"  {timing.self_us / 1000:8.1f} ms self "
+                f"{timing.cumulative_us / 1000:8.1f} ms cumulative  {timing.name}"
+            )
+        if budget_ms is not None and total_ms > budget_ms:
+            over_budget.append(module_name)
+
+    if over_budget:
+        raise click.ClickException(
+            f"Import time budget of {budget_ms} ms exceeded by: "
+            + ", ".join(over_budget)
+        )
@@ -0,0 +1,87 @@
+"""
+Opening task inputs, as text streams or, for tasks that ask for it, as buffers.
+"""
+
+import gzip
+import logging
+import mmap
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, TextIO, Union
+
+from .io_utils import Buffer
+from .readahead import open_gzip_text
+
+logger = logging.getLogger(__name__)
+
+BufferTaskCallback = Callable[[Buffer], str]
+# Tasks read TextIO, unless they are marked with `reads_buffer`
+TaskCallback = Callable[[Any], str]
+
+READS_BUFFER_MARKER = "__advent_reads_buffer__"
+
+# The input file tasks are reading, so that parsed inputs can be stored next to it
+current_input_path: Optional[Path] = None
+
+
+def open_input(input_file_path: Path) -> TextIO:
+    if input_file_path.suffix == ".gz":
+        logger.debug("Reading %s as GZIP file", input_file_path)
+        return open_gzip_text(input_file_path)
+    else:
+        logger.debug("Reading %s as plain file", input_file_path)
+        return input_file_path.open(mode="r", encoding="utf-8")
+
+
+@contextmanager
+def open_buffer(input_file_path: Path) -> Iterator[Buffer]:
+    """
+    Memory-map a plain input, so it is not copied into Python objects. GZIP files
+    cannot be mapped and are decompressed into memory instead.
+    """
+    if input_file_path.suffix == ".gz":
+        logger.debug("Decompressing %s into memory", input_file_path)
+        with gzip.open(input_file_path, mode="rb") as compressed_file:
+            yield compressed_file.read()
+        return
+
+    with input_file_path.open(mode="rb") as file:
+        if input_file_path.stat().st_size == 0:
+            yield b""  # empty files cannot be mapped
+            return
+        logger.debug("Memory-mapping %s", input_file_path)
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            try:
+                view.release()
+                mapped.close()
+            except BufferError:
+                # Arrays made from the buffer are still alive, the mapping will be
+                # closed once they are garbage collected
+                logger.debug("Leaving %s mapped, its buffer is in use", input_file_path)
+
+
+def reads_buffer(callback: BufferTaskCallback) -> BufferTaskCallback:
+    """Mark a task that wants its input as a buffer of bytes instead of text."""
+    setattr(callback, READS_BUFFER_MARKER, True)
+    return callback
+
+
+@contextmanager
+def open_task_input(
+    callback: TaskCallback, input_file_path: Path
+) -> Iterator[Union[TextIO, Buffer]]:
+    global current_input_path
+    previous_input_path, current_input_path = current_input_path, input_file_path
+    try:
+        if getattr(callback, READS_BUFFER_MARKER, False):
+            with open_buffer(input_file_path) as buffer:
+                yield buffer
+        else:
+            with open_input(input_file_path) as input:
+                yield input
+    finally:
+        current_input_path = previous_input_path
@@ -1,8 +1,12 @@
-from typing import Iterable, TextIO
+from typing import Iterable, TextIO, Union
 
 import numpy as np
 import numpy.typing as npt
 
+Buffer = Union[bytes, memoryview]
+
+INPUT_SUFFIXES = (".txt", ".txt.gz")
+
 
 def get_lines(input: TextIO) -> Iterable[str]:
     stripped_lines = map(str.strip, input)
@@ -14,8 +18,64 @@ def read_empty_line(input: TextIO) -> None:
     assert input.readline().strip() == ""  # expect empty line
 
 
-def read_numbers_array(input: TextIO) -> npt.NDArray[int]:
-    return np.array([list(map(int, line)) for line in get_lines(input)], dtype=int)
+NEWLINE = ord("\n")
+CARRIAGE_RETURN = ord("\r")
+
+
+def parse_digit_grid(data: Buffer) -> npt.NDArray[np.uint8]:
+    """
+    Parse lines of decimal digits into a 2D array in one vectorized step. The rows are
+    read through a strided view of the buffer, so the only copy made is the result.
+    """
+    chars = np.frombuffer(data, dtype=np.uint8)
+    if CARRIAGE_RETURN in chars:
+        chars = chars[chars != CARRIAGE_RETURN]
+    content = np.flatnonzero(chars != NEWLINE)
+    assert len(content), "Empty grid"
+    chars = chars[content[0] : content[-1] + 1]
+
+    newlines = np.flatnonzero(chars == NEWLINE)
+    width = int(newlines[0]) if len(newlines) else len(chars)
+    height = len(newlines) + 1
+    assert np.array_equal(
+        newlines, np.arange(width, len(chars), width + 1)
+    ), "Rows of different lengths"
+    rows = np.lib.stride_tricks.as_strided(
+        chars, shape=(height, width), strides=(width + 1, 1), writeable=False
+    )
+    grid: npt.NDArray[np.uint8] = rows - ord("0")
+    # Anything but a digit wraps around to a value above 9
+    assert np.all(grid <= 9), "Non-digit characters in grid"
+    return grid
+
+
+POWERS_OF_TEN = 10 ** np.arange(19, dtype=np.int64)
+
+
+def parse_integers(data: Buffer) -> npt.NDArray[np.int64]:
+    """
+    Parse non-negative decimal integers separated by whitespace, or by words without
+    digits, in one vectorized step instead of creating a Python int per number.
+    """
+    chars = np.frombuffer(data, dtype=np.uint8)
+    digits = chars - np.uint8(ord("0"))
+    digit_indices = np.flatnonzero(digits <= 9)
+    if not len(digit_indices):
+        return np.zeros(0, dtype=np.int64)
+    # Numbers are the runs of consecutive digits
+    breaks = np.flatnonzero(np.diff(digit_indices) != 1) + 1
+    starts = np.concatenate(([0], breaks))
+    ends = np.concatenate((breaks, [len(digit_indices)]))
+    lengths = ends - starts
+    assert np.max(lengths) < len(POWERS_OF_TEN), "Numbers of over 18 digits"
+    exponents = np.repeat(ends, lengths) - 1 - np.arange(len(digit_indices))
+    values = digits[digit_indices] * POWERS_OF_TEN[exponents]
+    numbers: npt.NDArray[np.int64] = np.add.reduceat(values, starts)
+    return numbers
+
+
+def read_numbers_array(input: TextIO) -> npt.NDArray[np.uint8]:
+    return parse_digit_grid(input.read().encode("ascii"))
 
 
 def read_line(input: TextIO) -> str:
@@ -0,0 +1,45 @@
+import importlib
+import logging
+import sys
+from types import ModuleType
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LazyModule(ModuleType):
+    """Stand-in for a module that is only imported on first attribute access."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self._lazy_module: Optional[ModuleType] = None
+
+    def _load(self) -> ModuleType:
+        if self._lazy_module is None:
+            logger.debug("Importing %s on first use", self.__name__)
+            self._lazy_module = importlib.import_module(self.__name__)
+        return self._lazy_module
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._lazy_module is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> ModuleType:
+    return LazyModule(name)
+
+
+def resolve_lazy_imports(package: str) -> None:
+    """Import what loaded modules of the package deferred, e.g. before timing them."""
+    for name, module in list(sys.modules.items()):
+        if name != package and not name.startswith(f"{package}."):
+            continue
+        for value in list(vars(module).values()):
+            if isinstance(value, LazyModule):
+                value._load()
@@ -1,10 +1,153 @@
+"""
+Logging setup with profiles that trade detail for speed.
+
+* `debug` lets every record of the tasks through, however many there are.
+* `default` shows INFO and up, and lets each logging call site emit only so many
+  records per second, so chatty loops cannot dominate a run.
+* `performance` shows only warnings, so disabled calls return before creating records.
+
+The profile is picked with `--log-profile` or `ADVENT_LOG_PROFILE`.
+
+Records that are throttled or below the level are never formatted, so costly
+arguments should be passed through `lazy` rather than formatted up front:
+
+    logger.debug("After folding\n%s", lazy(format_paper, paper))
+"""
+
 import logging
+import os
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+PROFILE_VARIABLE = "ADVENT_LOG_PROFILE"
+DEFAULT_PROFILE = "default"
+TASK_LOGGERS = ["__main__", "advent"]
+
+
+class Lazy:
+    """Log argument that calls `function(*args)` only when the record is formatted."""
+
+    __slots__ = ("function", "args")
+
+    def __init__(self, function: Callable[..., Any], args: Tuple[Any, ...]) -> None:
+        self.function = function
+        self.args = args
+
+    def __str__(self) -> str:
+        return str(self.function(*self.args))
+
+    def __repr__(self) -> str:
+        return repr(self.function(*self.args))
+
+
+def lazy(function: Callable[..., Any], *args: Any) -> Lazy:
+    return Lazy(function, args)
+
+
+class Throttle(NamedTuple):
+    # Let through every `sample_every`-th record of each call site
+    sample_every: int = 1
+    # and out of those at most `per_second`, after an initial `burst`
+    per_second: Optional[float] = None
+    burst: int = 10
+
+
+class CallSite:
+    __slots__ = ("calls", "tokens", "updated", "suppressed")
+
+    def __init__(self, burst: int) -> None:
+        self.calls = 0
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.suppressed = 0
+
+
+class ThrottleFilter(logging.Filter):
+    """
+    Samples and rate limits records below WARNING per logging call site, with the
+    throttle of the closest configured ancestor of the record's logger.
+    """
+
+    def __init__(self, throttles: Dict[str, Throttle]) -> None:
+        super().__init__()
+        self.throttles = throttles
+        self.logger_throttles: Dict[str, Optional[Throttle]] = {}
+        self.call_sites: Dict[Tuple[str, int], CallSite] = {}
+
+    def get_throttle(self, logger_name: str) -> Optional[Throttle]:
+        try:
+            return self.logger_throttles[logger_name]
+        except KeyError:
+            pass
+        name = logger_name
+        while name not in self.throttles and "." in name:
+            name = name.rpartition(".")[0]
+        throttle = self.throttles.get(name)
+        self.logger_throttles[logger_name] = throttle
+        return throttle
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        throttle = self.get_throttle(record.name)
+        if throttle is None:
+            return True
+        key = (record.pathname, record.lineno)
+        call_site = self.call_sites.get(key)
+        if call_site is None:
+            call_site = self.call_sites[key] = CallSite(throttle.burst)
+
+        call_site.calls += 1
+        if (call_site.calls - 1) % throttle.sample_every != 0:
+            return False
+        if throttle.per_second is not None:
+            now = time.monotonic()
+            call_site.tokens = min(
+                call_site.tokens + (now - call_site.updated) * throttle.per_second,
+                throttle.burst,
+            )
+            call_site.updated = now
+            if call_site.tokens < 1:
+                call_site.suppressed += 1
+                return False
+            call_site.tokens -= 1
+        if call_site.suppressed:
+            record.msg = f"{record.msg} [{call_site.suppressed} similar suppressed]"
+            call_site.suppressed = 0
+        return True
+
+
+class LogProfile(NamedTuple):
+    level: int
+    throttles: Dict[str, Throttle]
+
+
+LOG_PROFILES: Dict[str, LogProfile] = {
+    "debug": LogProfile(level=logging.DEBUG, throttles={}),
+    "default": LogProfile(
+        level=logging.INFO,
+        throttles={name: Throttle(per_second=20) for name in TASK_LOGGERS},
+    ),
+    "performance": LogProfile(level=logging.WARNING, throttles={}),
+}
+
 
+def setup_logging(profile_name: Optional[str] = None) -> None:
+    if profile_name is None:
+        profile_name = os.environ.get(PROFILE_VARIABLE, DEFAULT_PROFILE)
+    assert profile_name in LOG_PROFILES, f"Unknown log profile {profile_name}"
+    profile = LOG_PROFILES[profile_name]
 
-def setup_logging() -> None:
     logging.basicConfig(
         level=logging.INFO,
         format="[%(asctime)s][%(levelname)-7s][%(name)s] %(message)s",
     )
-    logging.getLogger("__main__").setLevel(logging.DEBUG)
-    logging.getLogger("advent").setLevel(logging.DEBUG)
+    for name in TASK_LOGGERS:
+        logging.getLogger(name).setLevel(profile.level)
+    # Handler filters run before formatting, so dropped records cost no formatting
+    for handler in logging.getLogger().handlers:
+        for existing_filter in list(handler.filters):
+            if isinstance(existing_filter, ThrottleFilter):
+                handler.removeFilter(existing_filter)
+        if profile.throttles:
+            handler.addFilter(ThrottleFilter(profile.throttles))
@@ -0,0 +1,104 @@
+"""
+Memory budget for tasks whose arrays grow with the range of the input's coordinates
+rather than with its size.
+
+The budget is set with `--memory-budget` or `ADVENT_MEMORY_BUDGET`, like `512M` or
+`2G`. Tasks estimate what their dense representation needs and ask whether it `fits`,
+falling back to a sparse, chunked or streaming variant if it does not:
+
+    if fits(board_bytes, "dense board"):
+        return count_overlaps_dense(edges, shape)
+    require(points_bytes, "sparse points")
+    return count_overlaps_sparse(edges, shape)
+
+`require` raises `MemoryBudgetExceeded` with the estimate before anything is
+allocated, instead of the task running out of memory half way through. Without a
+budget everything fits.
+"""
+
+import logging
+import os
+import re
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+BUDGET_VARIABLE = "ADVENT_MEMORY_BUDGET"
+SIZE_REGEXP = re.compile(r"^(?P<number>\d+(\.\d+)?)\s*(?P<unit>[KMGT]?)i?B?$", re.I)
+UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+current_budget: Optional[int] = None
+
+
+class MemoryBudgetExceeded(Exception):
+    def __init__(self, what: str, needed: int, budget: int) -> None:
+        super().__init__(
+            f"{what} needs about {format_size(needed)}, "
+            f"over the memory budget of {format_size(budget)}"
+        )
+        self.what = what
+        self.needed = needed
+        self.budget = budget
+
+
+def parse_size(text: str) -> int:
+    """Number of bytes in a size like `1500`, `64K`, `512MiB` or `1.5G`."""
+    match = SIZE_REGEXP.match(text.strip())
+    if match is None:
+        raise ValueError(f"Invalid size {text!r}")
+    return int(float(match.group("number")) * UNITS[match.group("unit").upper()])
+
+
+def format_size(size: int) -> str:
+    return f"{size / 1024 / 1024:,.1f} MiB"
+
+
+def get_memory_budget() -> Optional[int]:
+    if current_budget is not None:
+        return current_budget
+    text = os.environ.get(BUDGET_VARIABLE)
+    return parse_size(text) if text else None
+
+
+@contextmanager
+def memory_budget(budget: int) -> Iterator[None]:
+    """Limit the memory tasks plan to use in the block to `budget` bytes."""
+    global current_budget
+    previous, current_budget = current_budget, budget
+    try:
+        yield
+    finally:
+        current_budget = previous
+
+
+def fits(size: int, what: str) -> bool:
+    budget = get_memory_budget()
+    if budget is None or size <= budget:
+        return True
+    logger.info(
+        "%s would need about %s, over the budget of %s",
+        what,
+        format_size(size),
+        format_size(budget),
+    )
+    return False
+
+
+def require(size: int, what: str) -> None:
+    budget = get_memory_budget()
+    if budget is not None and size > budget:
+        raise MemoryBudgetExceeded(what, size, budget)
+
+
+def get_chunk_length(item_size: int, count: int, what: str) -> int:
+    """
+    How many of `count` items taking `item_size` bytes each to process at a time to
+    stay within the budget.
+    """
+    if fits(item_size * count, what):
+        return max(count, 1)
+    require(item_size, what)
+    budget = get_memory_budget()
+    assert budget is not None
+    return budget // item_size
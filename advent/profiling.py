@@ -0,0 +1,164 @@
+import cProfile
+import logging
+import pstats
+import threading
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import (DefaultDict, Dict, FrozenSet, Iterator, List, Optional,
+                    Tuple)
+
+import click
+
+logger = logging.getLogger(__name__)
+
+# pstats identifies functions by (file name, line number, function name)
+Function = Tuple[str, int, str]
+
+MAX_STACK_DEPTH = 64
+MIN_STACK_SECONDS = 1e-6
+MEMORY_TOP_LINES = 10
+MEMORY_POLL_INTERVAL = 0.01
+MEMORY_SNAPSHOT_GROWTH = 1.1
+
+
+def get_label(function: Function) -> str:
+    file_name, line_number, name = function
+    if file_name == "~":  # built-in
+        return name
+    return f"{name} ({Path(file_name).name}:{line_number})"
+
+
+def get_collapsed_stacks(stats: pstats.Stats) -> Dict[str, float]:
+    """
+    Rebuild call stacks from the caller graph that cProfile records. The profile only
+    knows direct callers, so a function's own time is split between its callers in
+    proportion to the time spent under each of them, all the way up to the roots.
+    """
+    entries = stats.stats  # type: ignore[attr-defined]
+    stacks: DefaultDict[str, float] = defaultdict(float)
+
+    def walk_up(
+        function: Function, path: List[str], seconds: float, seen: FrozenSet[Function]
+    ) -> None:
+        callers = {
+            caller: caller_stats
+            for caller, caller_stats in entries[function][4].items()
+            if caller in entries and caller not in seen
+        }
+        if not callers or len(path) >= MAX_STACK_DEPTH:
+            stacks[";".join(reversed(path))] += seconds
+            return
+        total = sum(caller_stats[3] for caller_stats in callers.values())
+        for caller, caller_stats in callers.items():
+            share = caller_stats[3] / total if total > 0 else 1 / len(callers)
+            if seconds * share < MIN_STACK_SECONDS:
+                continue
+            walk_up(
+                caller, [*path, get_label(caller)], seconds * share, seen | {caller}
+            )
+
+    for function, (_, _, self_seconds, _, _) in entries.items():
+        if self_seconds > 0:
+            walk_up(
+                function, [get_label(function)], self_seconds, frozenset({function})
+            )
+    return dict(stacks)
+
+
+def write_collapsed_stacks(stats: pstats.Stats, path: Path) -> None:
+    """Write stacks in the format of `flamegraph.pl` and speedscope, in microseconds."""
+    stacks = get_collapsed_stacks(stats)
+    with path.open(mode="w", encoding="utf-8") as file:
+        for stack, seconds in sorted(stacks.items()):
+            microseconds = round(seconds * 1_000_000)
+            if microseconds > 0:
+                file.write(f"{stack} {microseconds}\n")
+
+
+@contextmanager
+def profiled(output_path: Path) -> Iterator[None]:
+    """
+    Profile the block with cProfile. The stats are dumped to `output_path` and
+    collapsed stacks for flame graphs next to it, with a `.folded` suffix.
+    """
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        stats = pstats.Stats(profile)
+        stats.dump_stats(output_path)
+        folded_path = output_path.with_suffix(".folded")
+        write_collapsed_stacks(stats, folded_path)
+        logger.info("Wrote profile to %s and %s", output_path, folded_path)
+
+
+class PeakSnapshotter(threading.Thread):
+    """
+    Takes a tracemalloc snapshot whenever traced memory grows past the previous
+    snapshot, so the report shows what was allocated near the peak rather than the
+    little that is still alive once the task returns.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(name="peak-snapshotter", daemon=True)
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self.snapshot_size = 0
+        self.stopped = threading.Event()
+
+    def take_snapshot_if_grown(self) -> None:
+        current, _ = tracemalloc.get_traced_memory()
+        if current > self.snapshot_size * MEMORY_SNAPSHOT_GROWTH:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.snapshot_size = current
+
+    def run(self) -> None:
+        while not self.stopped.wait(MEMORY_POLL_INTERVAL):
+            self.take_snapshot_if_grown()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
+        self.take_snapshot_if_grown()
+
+
+def report_memory(
+    snapshot: tracemalloc.Snapshot, snapshot_size: int, peak: int, top: int
+) -> None:
+    click.echo(
+        f"Peak traced memory {peak / 1024 / 1024:.1f} MiB, "
+        f"top lines at {snapshot_size / 1024 / 1024:.1f} MiB:",
+        err=True,
+    )
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, threading.__file__),
+        ]
+    )
+    for statistic in snapshot.statistics("lineno")[:top]:
+        frame = statistic.traceback[0]
+        click.echo(
+            f"  {statistic.size / 1024:10.1f} KiB {statistic.count:8d} blocks  "
+            f"{frame.filename}:{frame.lineno}",
+            err=True,
+        )
+
+
+@contextmanager
+def memory_traced(top: int = MEMORY_TOP_LINES) -> Iterator[None]:
+    """Trace allocations in the block and report the peak and the top lines."""
+    tracemalloc.start()
+    snapshotter = PeakSnapshotter()
+    snapshotter.start()
+    try:
+        yield
+    finally:
+        snapshotter.stop()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert snapshotter.snapshot is not None
+        report_memory(snapshotter.snapshot, snapshotter.snapshot_size, peak, top)
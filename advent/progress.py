@@ -0,0 +1,235 @@
+"""
+Progress and throughput of long running loops.
+
+Loops report the work they have done to a named `progress` meter:
+
+    with progress("sum", total=len(planes)) as meter:
+        for plane in planes:
+            ...
+            meter.update()
+
+or wrap what they iterate over with `track`:
+
+    for outcome in track(get_outcomes(...), "outcomes"):
+        ...
+
+Meters only read the clock once their count passes the next checkpoint, which is
+spaced out by the measured rate, so updating one costs an addition and a comparison.
+Every `interval` seconds, and once when it closes, a meter reports its count, rate
+and ETA on stderr and/or as a JSON line to a metrics file.
+
+While no reporting is set up `progress` returns a shared do-nothing meter and
+`track` returns the iterable itself.
+"""
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from types import TracebackType
+from typing import (IO, Iterable, Iterator, NamedTuple, Optional, Type,
+                    TypeVar, Union)
+
+import click
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+REPORT_INTERVAL = 1.0
+# How many times per report interval a meter reads the clock
+CHECKS_PER_INTERVAL = 10
+
+
+class Snapshot(NamedTuple):
+    name: str
+    done: int
+    total: Optional[int]
+    elapsed: float
+    rate: float
+    """Units of work per second."""
+    eta: Optional[float]
+    """Seconds left at the current rate, if the total is known."""
+    finished: bool
+
+
+def format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+def format_snapshot(snapshot: Snapshot) -> str:
+    if snapshot.total:
+        amount = (
+            f"{snapshot.done:,}/{snapshot.total:,} "
+            f"({snapshot.done / snapshot.total:.0%})"
+        )
+    else:
+        amount = f"{snapshot.done:,}"
+    text = f"{snapshot.name}: {amount} {snapshot.rate:,.1f} it/s"
+    if snapshot.finished:
+        return f"{text} done in {format_duration(snapshot.elapsed)}"
+    if snapshot.eta is not None:
+        return f"{text} ETA {format_duration(snapshot.eta)}"
+    return text
+
+
+class Reporter:
+    def __init__(
+        self,
+        *,
+        show: bool,
+        metrics_file: Optional[IO[str]],
+        interval: float = REPORT_INTERVAL,
+    ) -> None:
+        self.show = show
+        self.metrics_file = metrics_file
+        self.interval = interval
+
+    def report(self, snapshot: Snapshot) -> None:
+        if self.show:
+            click.echo(format_snapshot(snapshot), err=True)
+        if self.metrics_file is not None:
+            self.metrics_file.write(
+                json.dumps({"time": time.time(), **snapshot._asdict()}) + "\n"
+            )
+            self.metrics_file.flush()
+
+
+class Meter:
+    __slots__ = (
+        "reporter",
+        "name",
+        "total",
+        "count",
+        "next_check",
+        "start",
+        "next_report",
+    )
+
+    def __init__(self, reporter: Reporter, name: str, total: Optional[int]) -> None:
+        self.reporter = reporter
+        self.name = name
+        self.total = total
+        self.count = 0
+        self.next_check = 1
+        self.start = time.perf_counter()
+        self.next_report = self.start + reporter.interval
+
+    def update(self, count: int = 1) -> None:
+        self.count += count
+        if self.count >= self.next_check:
+            self.check()
+
+    def check(self) -> None:
+        now = time.perf_counter()
+        if now >= self.next_report:
+            self.reporter.report(self.get_snapshot(now, finished=False))
+            self.next_report = now + self.reporter.interval
+        rate = self.count / max(now - self.start, 1e-9)
+        step = rate * self.reporter.interval / CHECKS_PER_INTERVAL
+        self.next_check = self.count + max(1, int(step))
+
+    def get_snapshot(self, now: float, finished: bool) -> Snapshot:
+        elapsed = now - self.start
+        rate = self.count / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if self.total is not None and rate > 0:
+            eta = max(self.total - self.count, 0) / rate
+        return Snapshot(
+            name=self.name,
+            done=self.count,
+            total=self.total,
+            elapsed=elapsed,
+            rate=rate,
+            eta=eta,
+            finished=finished,
+        )
+
+    def __enter__(self) -> "Meter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.reporter.report(
+            self.get_snapshot(time.perf_counter(), finished=exc_type is None)
+        )
+
+
+class NoopMeter:
+    __slots__ = ()
+
+    def update(self, count: int = 1) -> None:
+        pass
+
+    def __enter__(self) -> "NoopMeter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        pass
+
+
+NOOP_METER = NoopMeter()
+
+current_reporter: Optional[Reporter] = None
+
+
+def progress(name: str, total: Optional[int] = None) -> Union[Meter, NoopMeter]:
+    reporter = current_reporter
+    if reporter is None:
+        return NOOP_METER
+    return Meter(reporter, name, total)
+
+
+def track(iterable: Iterable[T], name: str, total: Optional[int] = None) -> Iterable[T]:
+    if current_reporter is None:
+        return iterable
+    return iterate_tracked(iterable, name, total)
+
+
+def iterate_tracked(
+    iterable: Iterable[T], name: str, total: Optional[int]
+) -> Iterator[T]:
+    with progress(name, total) as meter:
+        for item in iterable:
+            yield item
+            meter.update()
+
+
+@contextmanager
+def progress_reporting(
+    *,
+    show: bool,
+    metrics_path: Optional[Path] = None,
+    interval: float = REPORT_INTERVAL,
+) -> Iterator[Reporter]:
+    """
+    Report the progress of the meters opened in the block on stderr if `show` is set
+    and as JSON lines appended to `metrics_path` if given.
+    """
+    global current_reporter
+    assert current_reporter is None, "Already reporting progress"
+    metrics_file = None
+    if metrics_path is not None:
+        metrics_file = metrics_path.open(mode="a", encoding="utf-8")
+    reporter = current_reporter = Reporter(
+        show=show, metrics_file=metrics_file, interval=interval
+    )
+    try:
+        yield reporter
+    finally:
+        current_reporter = None
+        if metrics_file is not None:
+            metrics_file.close()
+            logger.info("Appended progress metrics to %s", metrics_path)
@@ -0,0 +1,120 @@
+"""
+GZIP decompression on a background thread.
+
+zlib releases the GIL while inflating, so a thread that decompresses ahead of the
+reader lets decompression overlap with the task parsing what was already inflated.
+"""
+
+import io
+import logging
+import queue
+import threading
+import zlib
+from pathlib import Path
+from typing import TextIO, Union
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 256 * 1024
+QUEUE_CHUNKS = 16
+PUT_TIMEOUT = 0.1
+
+# zlib window bits that expect a GZIP header and trailer
+GZIP_WBITS = zlib.MAX_WBITS | 16
+
+EOF = b""
+
+Chunk = Union[bytes, BaseException]
+
+
+class ReadAheadGzipReader(io.RawIOBase):
+    """
+    Raw binary stream of the decompressed contents of a GZIP file. At most
+    `queue_chunks` inflated chunks are kept ahead of the reader.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        chunk_size: int = CHUNK_SIZE,
+        queue_chunks: int = QUEUE_CHUNKS,
+    ) -> None:
+        super().__init__()
+        self.path = path
+        self.chunk_size = chunk_size
+        self.chunks: "queue.Queue[Chunk]" = queue.Queue(maxsize=queue_chunks)
+        self.current = memoryview(EOF)
+        self.finished = False
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(
+            target=self.inflate, name=f"inflate {path.name}", daemon=True
+        )
+        self.thread.start()
+
+    def put(self, chunk: Chunk) -> bool:
+        # Gives up once the reader is closed, so the thread never blocks forever
+        while not self.stopped.is_set():
+            try:
+                self.chunks.put(chunk, timeout=PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def inflate(self) -> None:
+        try:
+            with self.path.open(mode="rb") as file:
+                decompressor = zlib.decompressobj(GZIP_WBITS)
+                in_member = False
+                while compressed := file.read(self.chunk_size):
+                    # A file can consist of several concatenated GZIP members
+                    while compressed:
+                        in_member = True
+                        data = decompressor.decompress(compressed)
+                        if data and not self.put(data):
+                            return
+                        if not decompressor.eof:
+                            break
+                        compressed = decompressor.unused_data
+                        decompressor = zlib.decompressobj(GZIP_WBITS)
+                        in_member = False
+                if in_member:
+                    raise EOFError(
+                        "Compressed file ended before the end-of-stream marker "
+                        "was reached"
+                    )
+            self.put(EOF)
+        except BaseException as ex:
+            self.put(ex)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Union[bytearray, memoryview]) -> int:  # type: ignore
+        if not self.current:
+            if self.finished:
+                return 0
+            chunk = self.chunks.get()
+            if isinstance(chunk, BaseException):
+                self.finished = True
+                raise chunk
+            if chunk == EOF:
+                self.finished = True
+                return 0
+            self.current = memoryview(chunk)
+        size = min(len(buffer), len(self.current))
+        buffer[:size] = self.current[:size]
+        self.current = self.current[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self.stopped.set()
+            self.thread.join()
+        super().close()
+
+
+def open_gzip_text(path: Path, encoding: str = "utf-8") -> TextIO:
+    """Open a GZIP file like `gzip.open(path, mode="rt")`, inflating it ahead."""
+    buffered = io.BufferedReader(ReadAheadGzipReader(path), buffer_size=CHUNK_SIZE)
+    return io.TextIOWrapper(buffered, encoding=encoding)
@@ -0,0 +1,158 @@
+import importlib
+import logging
+import pkgutil
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+import click
+
+from .inputs import TaskCallback, open_task_input
+from .io_utils import INPUT_SUFFIXES, get_lines
+from .lazy import resolve_lazy_imports
+from .specs import TaskSpec, TaskSpecType, parse_task_spec
+from .tracing import span, tracing
+
+logger = logging.getLogger(__name__)
+
+DAY_PATTERN = re.compile(r"^day_(?P<day>\d{2})$")
+TASK_PATTERN = re.compile(r"^task_(?P<task>\d+)$")
+
+
+class TaskResult(NamedTuple):
+    spec: TaskSpec
+    result: str
+    import_time: float
+    solve_time: float
+
+
+def load_task(day: int, task: int) -> Tuple[TaskCallback, float]:
+    """
+    Import the task module and return its `main` together with the time the import
+    took. Modules that are already loaded are reused, so their import time is zero.
+    Dependencies the module imports lazily are loaded here too, so that they are
+    accounted for as import time rather than solve time.
+    """
+    module_name = TaskSpec(day=day, task=task, input_path=Path()).module_name
+    if module_name in sys.modules:
+        module = sys.modules[module_name]
+        import_time = 0.0
+    else:
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        resolve_lazy_imports(module_name.rpartition(".")[0])
+        import_time = time.perf_counter() - start
+    callback: TaskCallback = getattr(module, "main")
+    return callback, import_time
+
+
+def discover_tasks() -> List[Tuple[int, int]]:
+    """Find all (day, task) pairs that have a task module, without importing them."""
+    package_path = Path(__file__).parent
+    tasks: List[Tuple[int, int]] = []
+    for day_module in pkgutil.iter_modules([str(package_path)]):
+        day_match = DAY_PATTERN.match(day_module.name)
+        if not day_module.ispkg or day_match is None:
+            continue
+        day = int(day_match.group("day"))
+        for task_module in pkgutil.iter_modules([str(package_path / day_module.name)]):
+            task_match = TASK_PATTERN.match(task_module.name)
+            if task_match is not None:
+                tasks.append((day, int(task_match.group("task"))))
+    return sorted(tasks)
+
+
+def find_inputs(data_dir: Path, day: int) -> List[Path]:
+    day_dir = data_dir / f"day_{day:02d}"
+    if not day_dir.is_dir():
+        return []
+    return sorted(
+        path
+        for path in day_dir.iterdir()
+        if path.is_file() and path.name.endswith(INPUT_SUFFIXES)
+    )
+
+
+def run_task(spec: TaskSpec) -> TaskResult:
+    with span(f"import {spec.module_name}"):
+        callback, import_time = load_task(spec.day, spec.task)
+    with open_task_input(callback, spec.input_path) as file, span(str(spec)):
+        start = time.perf_counter()
+        result = callback(file)
+        solve_time = time.perf_counter() - start
+    return TaskResult(
+        spec=spec, result=result, import_time=import_time, solve_time=solve_time
+    )
+
+
+def run_tasks(
+    specs: Iterable[TaskSpec],
+) -> Iterable[Tuple[TaskSpec, Optional[TaskResult]]]:
+    for spec in specs:
+        try:
+            yield spec, run_task(spec)
+        except Exception:
+            logger.exception("Task %s failed", spec)
+            yield spec, None
+
+
+def read_task_specs(tasks_file: Path) -> List[TaskSpec]:
+    with tasks_file.open(mode="r", encoding="utf-8") as file:
+        return list(map(parse_task_spec, get_lines(file)))
+
+
+@click.command()
+@click.argument("specs", type=TaskSpecType(), nargs=-1)
+@click.option(
+    "--tasks-file",
+    type=click.Path(file_okay=True, dir_okay=False, readable=True, path_type=Path),
+    help="File with one DAY:TASK:INPUT triple per line.",
+)
+@click.option(
+    "--trace",
+    "trace_path",
+    type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+    help="Write timing spans of the tasks and their phases here as a Chrome trace.",
+)
+def run(
+    specs: Tuple[TaskSpec, ...], tasks_file: Optional[Path], trace_path: Optional[Path]
+) -> None:
+    """Run many tasks in a single, warm interpreter."""
+    all_specs = list(specs)
+    if tasks_file is not None:
+        all_specs.extend(read_task_specs(tasks_file))
+    if not all_specs:
+        raise click.UsageError("No tasks to run")
+    if trace_path is not None:
+        with tracing(trace_path):
+            run_and_report(all_specs)
+    else:
+        run_and_report(all_specs)
+
+
+def run_and_report(all_specs: List[TaskSpec]) -> None:
+    total_import_time = 0.0
+    total_solve_time = 0.0
+    failures = 0
+    for spec, task_result in run_tasks(all_specs):
+        if task_result is None:
+            failures += 1
+            click.echo(f"{spec}: FAILED")
+            continue
+        total_import_time += task_result.import_time
+        total_solve_time += task_result.solve_time
+        click.echo(
+            f"{spec}: {task_result.result} "
+            f"(import {task_result.import_time:.3f}s, "
+            f"solve {task_result.solve_time:.3f}s)"
+        )
+
+    click.echo(
+        f"Ran {len(all_specs)} tasks: "
+        f"shared startup {total_import_time:.3f}s, "
+        f"solving {total_solve_time:.3f}s"
+    )
+    if failures:
+        raise click.ClickException(f"{failures} task(s) failed")
@@ -0,0 +1,286 @@
+"""
+Running the whole calendar at once on a process pool.
+
+Every input is read once into shared memory, which the forked workers inherit, so
+tasks of the same day do not read or decompress it again. Tasks are started longest
+first, going by the runtimes of previous runs stored in the history file, which
+keeps the pool busy until the end instead of leaving a long task for last. Tasks
+without history are started first of all, as they may be long too.
+"""
+
+import io
+import json
+import logging
+import os
+import signal
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from types import FrameType
+from typing import Dict, Iterator, List, NamedTuple, Optional, TextIO, Union
+
+import click
+
+from .bench import format_bar, get_benchmark_key, get_benchmark_specs
+from .cores import get_core_count
+from .daemon import ignore_interrupts
+from .inputs import READS_BUFFER_MARKER, TaskCallback, open_buffer
+from .io_utils import Buffer
+from .runner import load_task
+from .specs import TaskSpec
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_PATH = Path("runtimes.json")
+DEFAULT_PATTERN = "*/*/input.*"
+TASK_TIMEOUT = 60.0
+
+
+class TaskTimeout(Exception):
+    pass
+
+
+class SharedInput(NamedTuple):
+    memory: SharedMemory
+    # The memory may be rounded up to whole pages
+    size: int
+
+
+# Inputs by their path, inherited by the forked workers
+shared_inputs: Dict[Path, SharedInput] = {}
+
+
+class CalendarResult(NamedTuple):
+    key: str
+    result: Optional[str]
+    error: Optional[str]
+    start: float
+    end: float
+    worker: int
+
+    @property
+    def wall_time(self) -> float:
+        return self.end - self.start
+
+
+class WorkerUsage(NamedTuple):
+    worker: int
+    tasks: int
+    busy_time: float
+
+
+def read_history(path: Path) -> Dict[str, float]:
+    if not path.exists():
+        return {}
+    with path.open(mode="r", encoding="utf-8") as file:
+        history: Dict[str, float] = json.load(file)
+    return history
+
+
+def write_history(path: Path, history: Dict[str, float]) -> None:
+    with path.open(mode="w", encoding="utf-8") as file:
+        json.dump(dict(sorted(history.items())), file, indent=2)
+        file.write("\n")
+
+
+def schedule(specs: List[TaskSpec], history: Dict[str, float]) -> List[TaskSpec]:
+    """Order the tasks longest first, tasks without history before all others."""
+    return sorted(
+        specs,
+        key=lambda spec: -history.get(get_benchmark_key(spec), float("inf")),
+    )
+
+
+def load_shared_input(input_path: Path) -> SharedInput:
+    with open_buffer(input_path) as buffer:
+        data = memoryview(buffer)
+        # Shared memory cannot be empty
+        memory = SharedMemory(create=True, size=max(data.nbytes, 1))
+        shared_buffer = memory.buf
+        assert shared_buffer is not None, "Shared memory is not mapped"
+        shared_buffer[: data.nbytes] = data
+        shared_input = SharedInput(memory=memory, size=data.nbytes)
+        data.release()
+    return shared_input
+
+
+def open_shared_input(
+    callback: TaskCallback, input_path: Path
+) -> Union[TextIO, Buffer]:
+    shared_input = shared_inputs[input_path]
+    shared_buffer = shared_input.memory.buf
+    assert shared_buffer is not None, "Shared memory is closed"
+    view = shared_buffer[: shared_input.size]
+    if getattr(callback, READS_BUFFER_MARKER, False):
+        return view
+    return io.StringIO(str(view, "utf-8"))
+
+
+def raise_timeout(signal_number: int, frame: Optional[FrameType]) -> None:
+    raise TaskTimeout()
+
+
+def run_calendar_task(spec: TaskSpec, timeout: float) -> CalendarResult:
+    callback, _ = load_task(spec.day, spec.task)
+    start = time.monotonic()
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    result = error = None
+    try:
+        result = callback(open_shared_input(callback, spec.input_path))
+    except TaskTimeout:
+        error = f"timed out after {timeout}s"
+    except Exception as ex:
+        error = repr(ex)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+    return CalendarResult(
+        key=get_benchmark_key(spec),
+        result=result,
+        error=error,
+        start=start,
+        end=time.monotonic(),
+        worker=os.getpid(),
+    )
+
+
+def initialize_worker() -> None:
+    ignore_interrupts()
+    signal.signal(signal.SIGALRM, raise_timeout)
+    # Even the warnings of the whole calendar would drown the results
+    logging.getLogger().setLevel(logging.WARNING)
+    for logger_name in ["advent", "__main__"]:
+        logging.getLogger(logger_name).setLevel(logging.ERROR)
+
+
+def run_calendar(
+    specs: List[TaskSpec], jobs: int, timeout: float
+) -> Iterator[CalendarResult]:
+    """Run the tasks in the given order on `jobs` workers, yielding as they finish."""
+    for spec in specs:
+        # Imported before forking, so that every worker starts warm
+        load_task(spec.day, spec.task)
+        if spec.input_path not in shared_inputs:
+            shared_inputs[spec.input_path] = load_shared_input(spec.input_path)
+    # Unlike those of a pool, these workers are not daemonic, so tasks may start
+    # processes of their own
+    executor = ProcessPoolExecutor(
+        max_workers=jobs, mp_context=get_context("fork"), initializer=initialize_worker
+    )
+    try:
+        # Free workers take the next task in order, so the longest go first
+        futures = [executor.submit(run_calendar_task, spec, timeout) for spec in specs]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # Tasks not started yet are dropped when interrupted
+        executor.shutdown(cancel_futures=True)
+        for shared_input in shared_inputs.values():
+            shared_input.memory.close()
+            shared_input.memory.unlink()
+        shared_inputs.clear()
+
+
+def get_worker_usage(results: List[CalendarResult]) -> List[WorkerUsage]:
+    busy_times: Dict[int, float] = defaultdict(float)
+    task_counts: Dict[int, int] = defaultdict(int)
+    for calendar_result in results:
+        busy_times[calendar_result.worker] += calendar_result.wall_time
+        task_counts[calendar_result.worker] += 1
+    return [
+        WorkerUsage(worker=worker, tasks=task_counts[worker], busy_time=busy_time)
+        for worker, busy_time in sorted(busy_times.items())
+    ]
+
+
+def report(results: List[CalendarResult], jobs: int) -> None:
+    # At least a tick, so that instant tasks do not divide by zero
+    makespan = max(max(r.end for r in results) - min(r.start for r in results), 1e-9)
+    critical = max(results, key=lambda calendar_result: calendar_result.wall_time)
+    total_time = sum(calendar_result.wall_time for calendar_result in results)
+    # No schedule of independent tasks beats its longest task or a perfect split
+    lower_bound = max(critical.wall_time, total_time / jobs)
+    click.echo(
+        f"Ran {len(results)} tasks in {makespan:.3f}s on {jobs} workers, "
+        f"{total_time:.3f}s of work"
+    )
+    click.echo(f"Critical path {critical.wall_time:.3f}s ({critical.key})")
+    click.echo(
+        f"Lower bound {lower_bound:.3f}s, "
+        f"schedule efficiency {lower_bound / makespan:.0%}"
+    )
+    for usage in get_worker_usage(results):
+        click.echo(
+            f"  worker {usage.worker:>7}: {usage.tasks:3d} tasks "
+            f"{usage.busy_time / makespan:4.0%} "
+            f"{format_bar(usage.busy_time, makespan)}"
+        )
+
+
+@click.command()
+@click.option(
+    "--data-dir",
+    type=click.Path(file_okay=False, dir_okay=True, exists=True, path_type=Path),
+    default=Path("data"),
+    show_default=True,
+)
+@click.option(
+    "--filter",
+    "pattern",
+    default=DEFAULT_PATTERN,
+    show_default=True,
+    help="Glob matched against DAY/TASK/INPUT keys, e.g. 'day_1?/*/input*'.",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="Worker processes  [default: cores available].",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=TASK_TIMEOUT,
+    show_default=True,
+    help="Seconds after which a task is given up.",
+)
+@click.option(
+    "--history",
+    "history_path",
+    type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+    default=DEFAULT_HISTORY_PATH,
+    show_default=True,
+    help="Runtimes of previous runs, which order the tasks, updated after the run.",
+)
+def calendar(
+    data_dir: Path,
+    pattern: str,
+    jobs: Optional[int],
+    timeout: float,
+    history_path: Path,
+) -> None:
+    """Run all the tasks concurrently, longest first."""
+    history = read_history(history_path)
+    specs = schedule(list(get_benchmark_specs(data_dir, pattern)), history)
+    if not specs:
+        raise click.UsageError(f"No inputs match {pattern}")
+    jobs = min(jobs or get_core_count(), len(specs))
+
+    results: List[CalendarResult] = []
+    for calendar_result in run_calendar(specs, jobs, timeout):
+        results.append(calendar_result)
+        outcome = calendar_result.result
+        if calendar_result.error is not None:
+            outcome = f"FAILED {calendar_result.error}"
+        click.echo(
+            f"{calendar_result.key}: {outcome} ({calendar_result.wall_time:.3f}s)"
+        )
+        # Tasks that time out are at least this long, so they are started early
+        history[calendar_result.key] = calendar_result.wall_time
+
+    report(results, jobs)
+    write_history(history_path, history)
+    failures = sum(r.error is not None for r in results)
+    if failures:
+        raise click.ClickException(f"{failures} task(s) failed")
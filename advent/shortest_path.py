@@ -0,0 +1,180 @@
+"""
+Shortest paths over implicit graphs.
+
+A graph is given by a callback listing the `(neighbour, cost)` edges leaving a node,
+so the nodes are only discovered as the search reaches them. Nodes just need to be
+hashable. Graphs stored as arrays, like the neighbour tables of `advent.grid`, are
+turned into such a callback with `get_entry_cost_edges`.
+
+* `dijkstra` orders the search with a binary heap,
+* `a_star` adds a heuristic lower bound of the remaining cost to the priorities,
+* `dial` keeps a bucket per distance, which beats a heap when costs are small
+  integers.
+
+All of them stop as soon as they settle a target node and return the path to it.
+"""
+
+import heapq
+import itertools
+from dataclasses import dataclass
+from typing import (Callable, Dict, Generic, Hashable, Iterable, Iterator,
+                    List, Optional, Sequence, Tuple, TypeVar)
+
+Node = TypeVar("Node", bound=Hashable)
+
+NeighboursCallback = Callable[[Node], Iterable[Tuple[Node, int]]]
+Heuristic = Callable[[Node], int]
+
+
+@dataclass
+class Path(Generic[Node]):
+    cost: int
+    """Total cost of the edges along the path."""
+
+    nodes: List[Node]
+    """Nodes from the start to the target, both included."""
+
+
+def get_path(
+    predecessors: Dict[Node, Node], start: Node, target: Node, cost: int
+) -> Path[Node]:
+    nodes = [target]
+    while nodes[-1] != start:
+        nodes.append(predecessors[nodes[-1]])
+    nodes.reverse()
+    return Path(cost=cost, nodes=nodes)
+
+
+def iterate_heap(
+    start: Node,
+    get_neighbours: NeighboursCallback[Node],
+    heuristic: Optional[Heuristic[Node]],
+    predecessors: Dict[Node, Node],
+) -> Iterator[Tuple[Node, int]]:
+    """Yield nodes with their distance from the start in the order they settle."""
+    distances: Dict[Node, int] = {start: 0}
+    settled = set()
+    # The counter breaks ties, so nodes never have to be compared
+    counter = itertools.count()
+    queue: List[Tuple[int, int, Node]] = [(0, next(counter), start)]
+    while queue:
+        _, _, node = heapq.heappop(queue)
+        if node in settled:
+            continue  # a stale entry, the node was reached cheaper since
+        settled.add(node)
+        distance = distances[node]
+        yield node, distance
+        for neighbour, cost in get_neighbours(node):
+            assert cost >= 0, "Negative edge costs are not supported"
+            new_distance = distance + cost
+            if neighbour in settled or new_distance >= distances.get(
+                neighbour, new_distance + 1
+            ):
+                continue
+            distances[neighbour] = new_distance
+            predecessors[neighbour] = node
+            priority = new_distance
+            if heuristic is not None:
+                priority += heuristic(neighbour)
+            heapq.heappush(queue, (priority, next(counter), neighbour))
+
+
+def search_heap(
+    start: Node,
+    get_neighbours: NeighboursCallback[Node],
+    is_target: Callable[[Node], bool],
+    heuristic: Optional[Heuristic[Node]],
+) -> Optional[Path[Node]]:
+    predecessors: Dict[Node, Node] = {}
+    for node, distance in iterate_heap(start, get_neighbours, heuristic, predecessors):
+        if is_target(node):
+            return get_path(predecessors, start, node, distance)
+    return None
+
+
+def dijkstra(
+    start: Node,
+    get_neighbours: NeighboursCallback[Node],
+    is_target: Callable[[Node], bool],
+) -> Optional[Path[Node]]:
+    """Cheapest path from `start` to a target, or None if no target is reachable."""
+    return search_heap(start, get_neighbours, is_target, heuristic=None)
+
+
+def a_star(
+    start: Node,
+    get_neighbours: NeighboursCallback[Node],
+    is_target: Callable[[Node], bool],
+    heuristic: Heuristic[Node],
+) -> Optional[Path[Node]]:
+    """
+    Like `dijkstra`, exploring nodes that look closer to a target first. The path is
+    the cheapest as long as the heuristic never overestimates the remaining cost and
+    does not drop along an edge by more than the edge costs.
+    """
+    return search_heap(start, get_neighbours, is_target, heuristic=heuristic)
+
+
+def get_distances(
+    start: Node, get_neighbours: NeighboursCallback[Node]
+) -> Dict[Node, int]:
+    """Distances from `start` to every node reachable from it."""
+    return dict(iterate_heap(start, get_neighbours, None, {}))
+
+
+def dial(
+    start: Node,
+    get_neighbours: NeighboursCallback[Node],
+    is_target: Callable[[Node], bool],
+    max_cost: int,
+) -> Optional[Path[Node]]:
+    """
+    Like `dijkstra` for integer edge costs of at most `max_cost`. A cyclic array of
+    `max_cost + 1` buckets holds the nodes by their distance, so queueing a node costs
+    a list append instead of a heap push.
+    """
+    bucket_count = max_cost + 1
+    buckets: List[List[Node]] = [[] for _ in range(bucket_count)]
+    distances: Dict[Node, int] = {start: 0}
+    predecessors: Dict[Node, Node] = {}
+    settled = set()
+    buckets[0].append(start)
+    queued = 1
+    distance = 0
+    while queued:
+        bucket = buckets[distance % bucket_count]
+        while bucket:
+            node = bucket.pop()
+            queued -= 1
+            if node in settled or distances[node] != distance:
+                continue  # a stale entry, the node was reached cheaper since
+            settled.add(node)
+            if is_target(node):
+                return get_path(predecessors, start, node, distance)
+            for neighbour, cost in get_neighbours(node):
+                assert 0 <= cost <= max_cost, f"Edge cost {cost} out of bounds"
+                new_distance = distance + cost
+                if neighbour in settled or new_distance >= distances.get(
+                    neighbour, new_distance + 1
+                ):
+                    continue
+                distances[neighbour] = new_distance
+                predecessors[neighbour] = node
+                buckets[new_distance % bucket_count].append(neighbour)
+                queued += 1
+        distance += 1
+    return None
+
+
+def get_entry_cost_edges(
+    neighbours: Sequence[Sequence[int]], entry_costs: Sequence[int]
+) -> NeighboursCallback[int]:
+    """
+    Edges of a graph of integer nodes, with `neighbours[node]` listing the neighbours
+    of each node and moving into a node costing `entry_costs[node]`.
+    """
+    edges = [
+        [(neighbour, entry_costs[neighbour]) for neighbour in node_neighbours]
+        for node_neighbours in neighbours
+    ]
+    return edges.__getitem__
@@ -0,0 +1,143 @@
+"""
+Parsed inputs stored next to the inputs, so that light tasks can skip parsing.
+
+The sidecars of `data/day_05/input.txt.gz` live in `data/day_05/input.txt.gz.parsed/`,
+a file per parser named after it. A file is a small JSON header followed by the raw
+arrays the parser returned, each aligned so it can be memory-mapped back in place:
+
+    ADVARRS1 | header length (uint32 LE) | header | padding | array | padding | ...
+
+The header records the hash of the input the arrays were parsed from and the parser's
+key, so a sidecar is ignored, and eventually rewritten, once either changes. Arrays
+are mapped copy-on-write, so tasks can modify them without touching the file.
+
+Sidecars are only read and written when `ADVENT_SIDECARS` is set to `1`, as most
+inputs parse about as fast as their sidecars are mapped, and they clutter the data
+directory.
+"""
+
+import json
+import logging
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+logger = logging.getLogger(__name__)
+
+SIDECARS_VARIABLE = "ADVENT_SIDECARS"
+SIDECAR_SUFFIX = ".parsed"
+MAGIC = b"ADVARRS1"
+HEADER_LENGTH = struct.Struct("<I")
+ALIGNMENT = 64
+
+Arrays = Tuple[npt.NDArray[Any], ...]
+
+
+def align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_arrays(
+    path: Path, arrays: Sequence[npt.NDArray[Any]], **metadata: str
+) -> None:
+    arrays = [np.ascontiguousarray(array) for array in arrays]
+    assert not any(array.dtype.hasobject for array in arrays), "Objects not supported"
+    descriptions: List[Dict[str, Any]] = []
+    # The offsets are relative to the end of the header, whose length they affect
+    offset = 0
+    for array in arrays:
+        descriptions.append(
+            {"dtype": array.dtype.str, "shape": array.shape, "offset": offset}
+        )
+        offset = align(offset + array.nbytes)
+    header = json.dumps({**metadata, "arrays": descriptions}).encode("utf-8")
+    data_start = align(len(MAGIC) + HEADER_LENGTH.size + len(header))
+    with path.open(mode="wb") as file:
+        file.write(MAGIC)
+        file.write(HEADER_LENGTH.pack(len(header)))
+        file.write(header)
+        for array, description in zip(arrays, descriptions):
+            file.seek(data_start + description["offset"])
+            file.write(array.data)
+        file.truncate(data_start + offset)
+
+
+def read_header(path: Path) -> Tuple[Dict[str, Any], int]:
+    with path.open(mode="rb") as file:
+        assert file.read(len(MAGIC)) == MAGIC, f"{path} is not an arrays file"
+        (header_length,) = HEADER_LENGTH.unpack(file.read(HEADER_LENGTH.size))
+        header: Dict[str, Any] = json.loads(file.read(header_length))
+    return header, align(len(MAGIC) + HEADER_LENGTH.size + header_length)
+
+
+def read_arrays(path: Path) -> Tuple[Dict[str, Any], Arrays]:
+    """Read the header of an arrays file and map its arrays, copy-on-write."""
+    header, data_start = read_header(path)
+    arrays: List[npt.NDArray[Any]] = []
+    if not header["arrays"] or path.stat().st_size == data_start:
+        # Empty files cannot be mapped
+        return header, tuple(
+            np.empty(description["shape"], dtype=description["dtype"])
+            for description in header["arrays"]
+        )
+    mapped = np.memmap(path, dtype=np.uint8, mode="c")
+    for description in header["arrays"]:
+        dtype = np.dtype(description["dtype"])
+        shape = tuple(description["shape"])
+        start = data_start + description["offset"]
+        size = dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+        arrays.append(mapped[start : start + size].view(dtype).reshape(shape))
+    return header, tuple(arrays)
+
+
+def sidecars_enabled() -> bool:
+    return os.environ.get(SIDECARS_VARIABLE, "0") == "1"
+
+
+def get_sidecar_path(input_path: Path, parser_name: str) -> Path:
+    return input_path.parent / f"{input_path.name}{SIDECAR_SUFFIX}" / parser_name
+
+
+def load_sidecar(
+    input_path: Path, parser_name: str, parser_key: str, input_hash: str
+) -> Optional[Arrays]:
+    path = get_sidecar_path(input_path, parser_name)
+    try:
+        header, arrays = read_arrays(path)
+    except FileNotFoundError:
+        return None
+    except (AssertionError, ValueError, KeyError, struct.error) as ex:
+        logger.warning("Ignoring broken sidecar %s: %s", path, ex)
+        return None
+    if header.get("input") != input_hash or header.get("parser") != parser_key:
+        logger.debug("Ignoring stale sidecar %s", path)
+        return None
+    return arrays
+
+
+def store_sidecar(
+    input_path: Path,
+    parser_name: str,
+    parser_key: str,
+    input_hash: str,
+    arrays: Arrays,
+) -> None:
+    path = get_sidecar_path(input_path, parser_name)
+    try:
+        path.parent.mkdir(exist_ok=True)
+        fd, temporary_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    except OSError as ex:
+        logger.debug("Not writing a sidecar for %s: %s", input_path, ex)
+        return
+    os.close(fd)
+    temporary_path = Path(temporary_name)
+    try:
+        write_arrays(temporary_path, arrays, input=input_hash, parser=parser_key)
+        temporary_path.replace(path)
+    finally:
+        temporary_path.unlink(missing_ok=True)
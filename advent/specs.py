@@ -0,0 +1,39 @@
+"""
+Tasks to run, given on the command line as DAY:TASK:INPUT triples. Kept apart from the
+runner, so that the thin client can parse them without importing any task machinery.
+"""
+
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import click
+
+
+class TaskSpec(NamedTuple):
+    day: int
+    task: int
+    input_path: Path
+
+    @property
+    def module_name(self) -> str:
+        return f"advent.day_{self.day:02d}.task_{self.task}"
+
+    def __str__(self) -> str:
+        return f"{self.module_name} {self.input_path}"
+
+
+def parse_task_spec(value: str) -> TaskSpec:
+    day, task, input_path = value.split(":", 2)
+    return TaskSpec(day=int(day), task=int(task), input_path=Path(input_path))
+
+
+class TaskSpecType(click.ParamType):
+    name = "DAY:TASK:INPUT"
+
+    def convert(
+        self, value: str, param: Optional[click.Parameter], ctx: Optional[click.Context]
+    ) -> TaskSpec:
+        try:
+            return parse_task_spec(value)
+        except ValueError:
+            self.fail(f"{value!r} is not in DAY:TASK:INPUT format", param, ctx)
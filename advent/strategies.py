@@ -0,0 +1,147 @@
+"""
+Alternative strategies of solving a task.
+
+A task's `main` is its default strategy. Other ways of solving the same task are
+registered on it with `alternative`:
+
+    @alternative(main, "simulation", reference=True)
+    def simulate(input: TextIO) -> str:
+        ...
+
+References are slow but obviously correct strategies, which faster ones are checked
+against on inputs small enough for them.
+"""
+
+import logging
+import multiprocessing
+import queue
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from .inputs import TaskCallback, open_task_input
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES_ATTRIBUTE = "__advent_strategies__"
+DEFAULT_STRATEGY = "main"
+
+
+class Strategy(NamedTuple):
+    name: str
+    solve: TaskCallback
+    reference: bool
+
+
+class StrategyResult(NamedTuple):
+    strategy: str
+    result: Optional[str]
+    error: Optional[str]
+    wall_time: float
+
+
+def alternative(
+    main: TaskCallback, name: str, reference: bool = False
+) -> Callable[[TaskCallback], TaskCallback]:
+    """Register the decorated function as another strategy of solving `main`'s task."""
+    assert name != DEFAULT_STRATEGY, f"{DEFAULT_STRATEGY} is the task's main"
+
+    def register(solve: TaskCallback) -> TaskCallback:
+        strategies: Dict[str, Strategy] = main.__dict__.setdefault(
+            STRATEGIES_ATTRIBUTE, {}
+        )
+        assert name not in strategies, f"Strategy {name} already registered"
+        strategies[name] = Strategy(name=name, solve=solve, reference=reference)
+        return solve
+
+    return register
+
+
+def get_strategies(main: TaskCallback) -> Dict[str, Strategy]:
+    alternatives: Dict[str, Strategy] = getattr(main, STRATEGIES_ATTRIBUTE, {})
+    default = Strategy(name=DEFAULT_STRATEGY, solve=main, reference=False)
+    return {DEFAULT_STRATEGY: default, **alternatives}
+
+
+def get_references(main: TaskCallback, checked: str) -> List[Strategy]:
+    """
+    Strategies to check the `checked` one against: the references, or all the other
+    strategies if the task marks none as reference.
+    """
+    others = [
+        strategy for name, strategy in get_strategies(main).items() if name != checked
+    ]
+    references = [strategy for strategy in others if strategy.reference]
+    return references or others
+
+
+def run_strategy(strategy: Strategy, input_path: Path) -> StrategyResult:
+    start = time.perf_counter()
+    try:
+        with open_task_input(strategy.solve, input_path) as input:
+            result: str = strategy.solve(input)
+    except Exception as ex:
+        return StrategyResult(
+            strategy=strategy.name,
+            result=None,
+            error=repr(ex),
+            wall_time=time.perf_counter() - start,
+        )
+    return StrategyResult(
+        strategy=strategy.name,
+        result=result,
+        error=None,
+        wall_time=time.perf_counter() - start,
+    )
+
+
+def put_strategy_result(
+    results: "multiprocessing.Queue[StrategyResult]",
+    strategy: Strategy,
+    input_path: Path,
+) -> None:
+    results.put(run_strategy(strategy, input_path))
+
+
+def race_strategies(
+    strategies: List[Strategy], input_path: Path, timeout: Optional[float]
+) -> List[StrategyResult]:
+    """
+    Run the strategies in parallel processes until one of them solves the task. Return
+    the results in the order they finished, ending with the winner unless all of them
+    failed or the timeout ran out. The strategies still running are terminated.
+    """
+    # Forked processes inherit the task, even when it runs as `__main__`
+    context = multiprocessing.get_context("fork")
+    results: "multiprocessing.Queue[StrategyResult]" = context.Queue()
+    processes = [
+        context.Process(
+            target=put_strategy_result,
+            args=(results, strategy, input_path),
+            name=f"strategy {strategy.name}",
+            daemon=True,
+        )
+        for strategy in strategies
+    ]
+    finished: List[StrategyResult] = []
+    deadline = None if timeout is None else time.monotonic() + timeout
+    try:
+        for process in processes:
+            process.start()
+        while len(finished) < len(processes):
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            try:
+                strategy_result = results.get(timeout=remaining)
+            except queue.Empty:
+                break
+            finished.append(strategy_result)
+            if strategy_result.error is None:
+                break
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+    return finished
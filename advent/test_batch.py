@@ -0,0 +1,36 @@
+from pathlib import Path
+from typing import TextIO
+
+from .batch import find_batch_inputs, run_batch
+
+
+def count_lines(input: TextIO) -> str:
+    lines = input.readlines()
+    assert lines, "Empty input"
+    return f"{len(lines)}"
+
+
+def test_find_batch_inputs() -> None:
+    expected = [Path("data/day_01/input.txt.gz"), Path("data/day_01/sample.txt")]
+    assert find_batch_inputs("data/day_01") == expected
+    assert find_batch_inputs("data/day_01/*") == expected
+    assert find_batch_inputs("data/day_0[12]/sample.txt") == [
+        Path("data/day_01/sample.txt"),
+        Path("data/day_02/sample.txt"),
+    ]
+    assert find_batch_inputs("data/missing") == []
+
+
+def test_run_batch(tmp_path: Path) -> None:
+    for lines in range(5):
+        (tmp_path / f"input_{lines}.txt").write_text("x\n" * lines)
+    input_paths = find_batch_inputs(str(tmp_path))
+
+    results = list(run_batch(count_lines, input_paths, jobs=2, cache=None))
+    by_input = {Path(result.input).name: result for result in results}
+    assert len(by_input) == 5
+    assert "Empty input" in (by_input["input_0.txt"].error or "")
+    assert by_input["input_0.txt"].result is None
+    for lines in range(1, 5):
+        assert by_input[f"input_{lines}.txt"].result == f"{lines}"
+        assert by_input[f"input_{lines}.txt"].wall_time > 0
@@ -0,0 +1,121 @@
+import logging
+import multiprocessing
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import pytest
+from click.testing import CliRunner
+
+from . import bench
+from .bench import (TIME_FLOOR, BenchmarkResult, Results, find_changed_results,
+                    find_regressions, fit_exponent, get_benchmark_specs,
+                    measure_in_subprocess, write_baseline)
+from .specs import TaskSpec
+
+
+def get_result(wall_time: float) -> BenchmarkResult:
+    return BenchmarkResult(
+        wall_time=wall_time, cpu_time=wall_time, peak_rss_kib=1024, result="1", runs=1
+    )
+
+
+REGRESSION_SAMPLES: List[Tuple[float, float, bool]] = [
+    # baseline, current, regressed
+    (1.0, 1.0, False),
+    (1.0, 0.5, False),
+    (1.0, 1.1, False),
+    (1.0, 1.5, True),
+    # too small to be anything but noise
+    (0.001, 0.005, False),
+]
+
+
+@pytest.mark.parametrize("baseline_time,current_time,regressed", REGRESSION_SAMPLES)
+def test_find_regressions(
+    baseline_time: float, current_time: float, regressed: bool
+) -> None:
+    baseline: Results = {"day_01/task_1/input.txt": get_result(baseline_time)}
+    results: Results = {
+        "day_01/task_1/input.txt": get_result(current_time),
+        "day_01/task_2/input.txt": get_result(100.0),  # not in the baseline
+    }
+    regressions = find_regressions(baseline, results, threshold=0.2, min_slowdown=0.01)
+    assert bool(regressions) == regressed
+
+
+def test_find_changed_results() -> None:
+    baseline: Results = {
+        "day_01/task_1/input.txt": get_result(1.0),
+        "day_01/task_2/input.txt": get_result(1.0),
+    }
+    results: Results = {
+        "day_01/task_1/input.txt": get_result(1.0),
+        "day_01/task_2/input.txt": get_result(1.0)._replace(result="2"),
+        "day_02/task_1/input.txt": get_result(1.0)._replace(result="2"),
+    }
+    assert find_changed_results(baseline, results) == ["day_01/task_2/input.txt"]
+
+
+def benchmark_timing_out(
+    spec: TaskSpec, repeat: int, timeout: float
+) -> BenchmarkResult:
+    raise multiprocessing.TimeoutError()
+
+
+def benchmark_changing_result(
+    spec: TaskSpec, repeat: int, timeout: float
+) -> BenchmarkResult:
+    return get_result(1.0)._replace(result="2")
+
+
+@pytest.mark.parametrize("benchmark", [benchmark_timing_out, benchmark_changing_result])
+def test_run_fails_against_baseline(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    benchmark: Callable[[TaskSpec, int, float], BenchmarkResult],
+) -> None:
+    baseline_path = tmp_path / "benchmarks.json"
+    write_baseline(baseline_path, {"day_01/task_2/sample.txt": get_result(1.0)})
+    monkeypatch.setattr(bench, "benchmark", benchmark)
+    advent_logger = logging.getLogger("advent")
+    level = advent_logger.level
+    try:
+        outcome = CliRunner().invoke(
+            bench.run,
+            ["--filter", "day_01/task_2/sample.txt", "--baseline", str(baseline_path)],
+        )
+    finally:
+        # The benchmarks quieten the solvers, which would leak into other tests
+        advent_logger.setLevel(level)
+    assert outcome.exit_code != 0
+
+
+def test_get_benchmark_specs() -> None:
+    specs = list(get_benchmark_specs(Path("data"), "day_01/task_2/*"))
+    assert {spec.input_path.name for spec in specs} == {"sample.txt", "input.txt.gz"}
+    assert all((spec.day, spec.task) == (1, 2) for spec in specs)
+
+
+def test_measure_in_subprocess() -> None:
+    spec = TaskSpec(day=1, task=1, input_path=Path("data/day_01/sample.txt"))
+    measurement = measure_in_subprocess(spec, timeout=60)
+    assert measurement.result == "7"
+    assert measurement.wall_time > 0
+    assert measurement.peak_rss_kib >= measurement.start_rss_kib > 0
+
+
+EXPONENT_SAMPLES: List[Tuple[List[float], float]] = [
+    # times at sizes 10, 100, 1000, exponent
+    ([0.01, 0.01, 0.01], 0.0),
+    ([0.01, 0.1, 1.0], 1.0),
+    ([0.01, 1.0, 100.0], 2.0),
+    # below the timer resolution
+    ([0.0, 0.0, 0.0], 0.0),
+]
+
+
+@pytest.mark.parametrize("times,exponent", EXPONENT_SAMPLES)
+def test_fit_exponent(times: List[float], exponent: float) -> None:
+    assert fit_exponent([10, 100, 1000], times, TIME_FLOOR) == pytest.approx(
+        exponent, abs=1e-9
+    )
@@ -0,0 +1,129 @@
+import json
+import multiprocessing
+from functools import partial
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import numpy.typing as npt
+
+from .cache import TEMPORARY_PREFIX, ResultCache, cached_array
+
+
+def solve_task(input: str) -> str:
+    return input
+
+
+def solve_other_task(input: str) -> str:
+    return input
+
+
+def solve_iterated_task(input: str, iterations: int) -> str:
+    return input * iterations
+
+
+def parse_input(input: str) -> npt.NDArray[np.int64]:
+    parsed_inputs.append(input)
+    return np.arange(10)
+
+
+parsed_inputs: List[str] = []
+
+
+def test_cached_result(tmp_path: Path) -> None:
+    cache = ResultCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("1\n")
+    answers = iter(["first", "second", "third"])
+
+    def solve() -> str:
+        return next(answers)
+
+    assert cache.run(solve_task, input_path, solve) == "first"
+    assert cache.run(solve_task, input_path, solve) == "first"
+    input_path.write_text("2\n")
+    assert cache.run(solve_task, input_path, solve) == "second"
+
+
+def test_cached_result_of_partial(tmp_path: Path) -> None:
+    cache = ResultCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("1\n")
+    answers = iter(["first", "second"])
+
+    def solve() -> str:
+        return next(answers)
+
+    # Partials all live in `functools`, but are different tasks
+    task_1 = partial(solve_iterated_task, iterations=2)
+    task_2 = partial(solve_iterated_task, iterations=50)
+    assert cache.run(task_1, input_path, solve) == "first"
+    assert cache.run(task_2, input_path, solve) == "second"
+    assert cache.run(task_1, input_path, solve) == "first"
+
+    tasks = {
+        json.loads(path.read_text())["task"] for path in cache.results_dir.iterdir()
+    }
+    assert tasks == {
+        "advent.test_cache.solve_iterated_task(iterations=2)",
+        "advent.test_cache.solve_iterated_task(iterations=50)",
+    }
+
+
+def test_cached_array(tmp_path: Path) -> None:
+    cache = ResultCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("1\n")
+    parsed_inputs.clear()
+
+    def solve() -> str:
+        array = cached_array(parse_input, "1\n")
+        array[0] = 100  # tasks may modify their arrays
+        return str(array.sum())
+
+    first_result = cache.run(solve_task, input_path, solve)
+    # Another task with the same parser
+    second_result = cache.run(solve_other_task, input_path, solve)
+    assert first_result == second_result == "145"
+    assert parsed_inputs == ["1\n"]
+    # Outside of a cached run nothing is loaded
+    assert cached_array(parse_input, "1\n")[0] == 0
+
+
+def test_evict(tmp_path: Path) -> None:
+    cache = ResultCache(tmp_path / "cache", max_bytes=250)
+    for number in range(10):
+        cache.put_result(f"key{number}", "task", "input", "x" * 50)
+    remaining = sorted(path.stem for path in cache.results_dir.iterdir())
+    assert 0 < len(remaining) < 10
+    assert "key9" in remaining
+    assert cache.get_result("key9") == "x" * 50
+
+
+def put_results(cache: ResultCache, worker: int) -> None:
+    for number in range(50):
+        cache.put_result(f"key{worker}_{number}", "task", "input", "x" * 50)
+
+
+def test_evict_shared(tmp_path: Path) -> None:
+    cache = ResultCache(tmp_path / "cache", max_bytes=2000)
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=put_results, args=(cache, worker)) for worker in range(8)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    # Evicting entries that others are writing or evicting does not fail the puts
+    assert [process.exitcode for process in processes] == [0] * 8
+    assert sum(path.stat().st_size for path in cache.results_dir.iterdir()) < 4000
+
+
+def test_evict_skips_files_being_written(tmp_path: Path) -> None:
+    cache = ResultCache(tmp_path / "cache", max_bytes=100)
+    cache.results_dir.mkdir(parents=True)
+    temporary_path = cache.results_dir / f"{TEMPORARY_PREFIX}entry.json"
+    temporary_path.write_text("x" * 500)
+    cache.put_result("key", "task", "input", "x" * 50)
+    assert temporary_path.exists()
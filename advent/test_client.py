@@ -0,0 +1,20 @@
+import subprocess
+import sys
+
+CHECK_CLIENT_IMPORTS = """
+import sys
+from advent.__main__ import main
+main.get_command(None, "client")
+print(" ".join(name for name in ["numpy", "advent.runner"] if name in sys.modules))
+"""
+
+
+def test_client_imports_no_tasks() -> None:
+    # In a fresh interpreter, as the tests import everything
+    output = subprocess.run(
+        [sys.executable, "-c", CHECK_CLIENT_IMPORTS],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    assert output.strip() == ""
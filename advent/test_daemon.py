@@ -0,0 +1,30 @@
+import multiprocessing
+import threading
+from pathlib import Path
+
+from .client import request_solutions
+from .daemon import SolverServer, warm_up_tasks
+from .specs import TaskSpec
+
+
+def test_daemon_solves_requests(tmp_path: Path) -> None:
+    socket_path = tmp_path / "advent.sock"
+    warm_up_tasks([(1, 1), (23, 1)])
+    with multiprocessing.get_context("fork").Pool(processes=2) as pool:
+        with SolverServer(socket_path, pool, use_cache=False) as server:
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                specs = [
+                    TaskSpec(day=1, task=1, input_path=Path("data/day_01/sample.txt")),
+                    TaskSpec(day=1, task=2, input_path=Path("data/day_01/sample.txt")),
+                    TaskSpec(day=1, task=1, input_path=tmp_path / "missing.txt"),
+                ]
+                responses = list(request_solutions(socket_path, specs, True))
+            finally:
+                server.shutdown()
+                thread.join()
+
+    assert [response.result for response in responses] == ["7", "5", None]
+    assert responses[0].error is None
+    assert "FileNotFoundError" in (responses[2].error or "")
@@ -0,0 +1,56 @@
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+from .generators import GENERATORS, generate_input
+from .inputs import open_task_input
+from .runner import load_task
+
+# Tasks that do not finish (or are broken) on any input are left out
+GENERATOR_SAMPLES: List[Tuple[int, int, int]] = [
+    # day, task, size
+    (1, 1, 100),
+    (2, 2, 100),
+    (3, 2, 100),
+    (4, 2, 20),
+    (5, 2, 50),
+    (6, 2, 50),
+    (7, 2, 50),
+    (8, 2, 20),
+    (9, 2, 20),
+    (10, 2, 20),
+    (11, 1, 10),
+    (12, 2, 12),
+    (13, 2, 50),
+    (14, 2, 20),
+    (15, 2, 10),
+    (16, 2, 20),
+    (17, 1, 10),
+    (18, 2, 10),
+    (19, 2, 3),
+    (20, 2, 10),
+    (21, 1, 1),
+    (22, 2, 20),
+    (23, 1, 1),
+]
+
+
+@pytest.mark.parametrize("day,task,size", GENERATOR_SAMPLES)
+def test_generated_input_is_solvable(
+    day: int, task: int, size: int, tmp_path: Path
+) -> None:
+    input_path = tmp_path / "input.txt"
+    input_path.write_text(generate_input(day, size, seed=0))
+    callback, _ = load_task(day, task)
+    with open_task_input(callback, input_path) as input:
+        assert callback(input)
+
+
+def test_generators_are_deterministic() -> None:
+    for day in GENERATORS:
+        assert generate_input(day, 10, seed=1) == generate_input(day, 10, seed=1)
+
+
+def test_all_days_have_generators() -> None:
+    assert sorted(GENERATORS) == list(range(1, 25))
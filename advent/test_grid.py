@@ -0,0 +1,71 @@
+from typing import List, Set, Tuple
+
+import numpy as np
+import pytest
+
+from .grid import Grid2D, get_window_codes
+
+shape_samples: List[Tuple[int, int]] = [(1, 1), (1, 4), (3, 3), (4, 5)]
+
+
+def get_expected_neighbours(
+    grid: Grid2D, index: int, diagonal: bool
+) -> Set[Tuple[int, int]]:
+    y, x = grid.coordinates(index)
+    return {
+        (y + dy, x + dx)
+        for dy in (-1, 0, 1)
+        for dx in (-1, 0, 1)
+        if (dy, dx) != (0, 0)
+        and (diagonal or dy == 0 or dx == 0)
+        and 0 <= y + dy < grid.height
+        and 0 <= x + dx < grid.width
+    }
+
+
+@pytest.mark.parametrize("height,width", shape_samples)
+@pytest.mark.parametrize("diagonal", [False, True])
+def test_neighbourhood(height: int, width: int, diagonal: bool) -> None:
+    grid = Grid2D.from_array(np.arange(height * width).reshape(height, width))
+    neighbourhood = grid.get_neighbourhood(diagonal)
+    for index, neighbours in enumerate(neighbourhood.to_lists()):
+        assert neighbours == neighbourhood.of(index).tolist()
+        assert {grid.coordinates(neighbour) for neighbour in neighbours} == (
+            get_expected_neighbours(grid, index, diagonal)
+        )
+    assert neighbourhood.sources.tolist() == [
+        index
+        for index, neighbours in enumerate(neighbourhood.to_lists())
+        for _ in neighbours
+    ]
+
+
+def test_neighbourhood_operations() -> None:
+    values = np.array([[5, 3, 8], [1, 9, 2], [7, 4, 6]])
+    grid = Grid2D.from_array(values)
+    assert grid.min_neighbours(grid.values).reshape(grid.shape).tolist() == [
+        [1, 5, 2],
+        [5, 1, 6],
+        [1, 6, 2],
+    ]
+    mask = grid.values > 6
+    assert grid.count_neighbours(mask, diagonal=True).reshape(grid.shape).tolist() == [
+        [1, 2, 1],
+        [2, 2, 2],
+        [1, 2, 1],
+    ]
+    # The grid shares the memory of the array it wraps
+    grid.values[0] = 0
+    assert values[0, 0] == 0
+
+
+@pytest.mark.parametrize("fill_value", [0, 1])
+def test_get_window_codes(fill_value: int) -> None:
+    image = np.random.default_rng(0).integers(0, 2, size=(4, 6))
+    padded = np.pad(image, 2, constant_values=fill_value)
+    codes = get_window_codes(image, fill_value)
+    assert codes.shape == (6, 8)
+    for y in range(6):
+        for x in range(8):
+            bits = "".join(map(str, padded[y : y + 3, x : x + 3].ravel()))
+            assert codes[y, x] == int(bits, 2)
@@ -0,0 +1,37 @@
+import gzip
+from pathlib import Path
+from typing import List, TextIO
+
+import pytest
+
+from .inputs import TaskCallback, open_task_input, reads_buffer
+from .io_utils import Buffer
+
+
+def read_text(input: TextIO) -> str:
+    return input.read()
+
+
+@reads_buffer
+def read_buffer(input: Buffer) -> str:
+    return bytes(input).decode("utf-8")
+
+
+CONTENT_SAMPLES: List[str] = ["", "1\n2\n3\n"]
+
+
+@pytest.mark.parametrize("content", CONTENT_SAMPLES)
+@pytest.mark.parametrize("compressed", [False, True])
+def test_open_task_input(content: str, compressed: bool, tmp_path: Path) -> None:
+    if compressed:
+        input_path = tmp_path / "input.txt.gz"
+        with gzip.open(input_path, mode="wt", encoding="utf-8") as file:
+            file.write(content)
+    else:
+        input_path = tmp_path / "input.txt"
+        input_path.write_text(content, encoding="utf-8")
+
+    callbacks: List[TaskCallback] = [read_text, read_buffer]
+    for callback in callbacks:
+        with open_task_input(callback, input_path) as input:
+            assert callback(input) == content
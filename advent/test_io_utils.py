@@ -0,0 +1,57 @@
+from typing import List, Tuple
+
+import numpy as np
+import pytest
+
+from .io_utils import parse_digit_grid, parse_integers
+
+GRID_SAMPLES: List[bytes] = [
+    b"123\n456\n",
+    b"123\n456",
+    b"123\r\n456\r\n",
+    b"\n123\n456\n\n",
+]
+
+
+@pytest.mark.parametrize("data", GRID_SAMPLES)
+def test_parse_digit_grid(data: bytes) -> None:
+    grid = parse_digit_grid(memoryview(data))
+    assert grid.dtype == np.uint8
+    assert grid.tolist() == [[1, 2, 3], [4, 5, 6]]
+
+
+INVALID_GRID_SAMPLES: List[bytes] = [
+    b"",
+    b"123\n45\n",
+    b"123\n\n456\n",
+    b"\n\n",
+    b"123\n4a6\n",
+    b"123\n4/6\n",
+]
+
+
+@pytest.mark.parametrize("data", INVALID_GRID_SAMPLES)
+def test_parse_digit_grid_rejects_invalid_input(data: bytes) -> None:
+    with pytest.raises(AssertionError):
+        parse_digit_grid(data)
+
+
+def test_parse_single_row() -> None:
+    assert parse_digit_grid(b"0918").tolist() == [[0, 9, 1, 8]]
+
+
+INTEGER_SAMPLES: List[Tuple[bytes, List[int]]] = [
+    (b"199\n200\n208\n", [199, 200, 208]),
+    (b"  7 0\r\n\n42", [7, 0, 42]),
+    (b"forward 5\ndown 12\n", [5, 12]),
+    (b"999999999999999999\n", [999999999999999999]),
+    (b"", []),
+    (b"\n\n", []),
+]
+
+
+@pytest.mark.parametrize("data,expected", INTEGER_SAMPLES)
+def test_parse_integers(data: bytes, expected: List[int]) -> None:
+    numbers = parse_integers(memoryview(data))
+    assert numbers.dtype == np.int64
+    assert numbers.tolist() == expected
@@ -0,0 +1,71 @@
+import subprocess
+import sys
+from typing import List, Tuple
+
+import pytest
+
+from .importtime import get_total_us, measure_import
+
+HEAVY_DEPENDENCIES = ["pandas", "networkx", "pydot", "pydantic"]
+
+LAZY_MODULES: List[str] = [
+    "advent.day_01.task_1",
+    "advent.day_01.task_2",
+    "advent.day_02.task_1",
+    "advent.day_02.task_2",
+    "advent.day_03.task_1",
+    "advent.day_03.task_2",
+    "advent.day_19.task_1",
+    "advent.day_19.task_2",
+    "advent.day_23.task_1",
+    "advent.day_23.task_2",
+]
+
+
+@pytest.mark.parametrize("module_name", LAZY_MODULES)
+def test_heavy_dependencies_not_imported(module_name: str) -> None:
+    code = (
+        f"import sys, {module_name}; "
+        f"print(','.join(m for m in {HEAVY_DEPENDENCIES!r} if m in sys.modules))"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, encoding="utf-8", check=True
+    )
+    assert process.stdout.strip() == ""
+
+
+PANDAS_FREE_TASKS: List[Tuple[str, str]] = [
+    ("advent.day_01.task_1", "data/day_01/sample.txt"),
+    ("advent.day_01.task_2", "data/day_01/sample.txt"),
+    ("advent.day_02.task_1", "data/day_02/sample.txt"),
+    ("advent.day_02.task_2", "data/day_02/sample.txt"),
+    ("advent.day_03.task_1", "data/day_03/sample.txt"),
+    ("advent.day_03.task_2", "data/day_03/sample.txt"),
+]
+
+
+@pytest.mark.parametrize("module_name,input_path", PANDAS_FREE_TASKS)
+def test_task_solved_without_pandas(module_name: str, input_path: str) -> None:
+    code = "\n".join(
+        [
+            "import sys",
+            "from pathlib import Path",
+            "from advent.inputs import open_task_input",
+            f"from {module_name} import main",
+            f"with open_task_input(main, Path({input_path!r})) as input:",
+            "    main(input)",
+            "print('pandas' in sys.modules)",
+        ]
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, encoding="utf-8", check=True
+    )
+    assert process.stdout.strip() == "False"
+
+
+def test_measure_import() -> None:
+    timings = measure_import("advent.lazy")
+    names = {timing.name for timing in timings}
+    assert "advent.lazy" in names
+    assert "encodings" not in names  # interpreter startup is not included
+    assert get_total_us(timings) > 0
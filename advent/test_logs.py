@@ -0,0 +1,45 @@
+import logging
+from typing import List
+
+from .logs import Throttle, ThrottleFilter, lazy
+
+
+def make_record(lineno: int, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord(
+        "advent.day_01.task_1", level, "task_1.py", lineno, "message", None, None
+    )
+
+
+def test_lazy_formats_only_when_emitted() -> None:
+    calls: List[int] = []
+
+    def format_value(value: int) -> str:
+        calls.append(value)
+        return f"<{value}>"
+
+    logger = logging.getLogger("advent.test_logs")
+    logger.setLevel(logging.INFO)
+    logger.debug("Value %s", lazy(format_value, 1))
+    assert calls == []
+    assert str(lazy(format_value, 2)) == "<2>"
+    assert calls == [2]
+
+
+def test_throttle_filter_samples_per_call_site() -> None:
+    throttle_filter = ThrottleFilter({"advent": Throttle(sample_every=3)})
+    passed = [throttle_filter.filter(make_record(lineno=1)) for _ in range(7)]
+    assert passed == [True, False, False, True, False, False, True]
+    # Other call sites are counted separately
+    assert throttle_filter.filter(make_record(lineno=2))
+    # Warnings are never throttled
+    assert throttle_filter.filter(make_record(lineno=1, level=logging.WARNING))
+
+
+def test_throttle_filter_rate_limits() -> None:
+    throttle_filter = ThrottleFilter({"advent": Throttle(per_second=1e-6, burst=2)})
+    passed = [throttle_filter.filter(make_record(lineno=1)) for _ in range(5)]
+    assert passed == [True, True, False, False, False]
+    # Loggers without a configured ancestor are not throttled
+    other = make_record(lineno=1)
+    other.name = "numba"
+    assert throttle_filter.filter(other)
@@ -0,0 +1,107 @@
+import io
+import logging
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import pytest
+
+from .day_05.task_2 import main as day_05_main
+from .day_07.task_1 import main as day_07_task_1_main
+from .day_07.task_2 import main as day_07_task_2_main
+from .day_15.task_1 import main as day_15_task_1_main
+from .day_15.task_2 import main as day_15_task_2_main
+from .memory import (MemoryBudgetExceeded, fits, get_chunk_length,
+                     get_memory_budget, memory_budget, parse_size, require)
+
+# Lines far apart, so that their points take much less memory than a board
+SPREAD_LINES = """0,0 -> 0,2
+1000,1000 -> 1000,998
+0,1 -> 2,1
+"""
+
+
+@pytest.mark.parametrize(
+    "text,expected_size",
+    [("1500", 1500), ("64K", 65536), ("512MiB", 512 << 20), ("1.5G", 3 << 29)],
+)
+def test_parse_size(text: str, expected_size: int) -> None:
+    assert parse_size(text) == expected_size
+
+
+def test_parse_size_rejects_garbage() -> None:
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_memory_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("ADVENT_MEMORY_BUDGET", raising=False)
+    assert get_memory_budget() is None
+    assert fits(1 << 40, "everything")
+    with memory_budget(1000):
+        assert fits(1000, "board")
+        assert not fits(1001, "board")
+        with pytest.raises(MemoryBudgetExceeded, match="board needs about"):
+            require(1001, "board")
+        assert get_chunk_length(100, 5, "rows") == 5
+        assert get_chunk_length(100, 50, "rows") == 10
+    monkeypatch.setenv("ADVENT_MEMORY_BUDGET", "1K")
+    assert get_memory_budget() == 1024
+
+
+@pytest.mark.parametrize("budget", [8 << 20, 1000])
+def test_leaner_variant_gives_same_answer(budget: int) -> None:
+    with memory_budget(budget):
+        assert day_05_main(io.StringIO(SPREAD_LINES)) == "1"
+
+
+def test_too_small_budget_is_reported() -> None:
+    with memory_budget(100):
+        with pytest.raises(MemoryBudgetExceeded, match="Sparse line points"):
+            day_05_main(io.StringIO(SPREAD_LINES))
+
+
+DAY_07_SAMPLE = "16,1,2,0,4,2,7,1,2,14\n"
+
+CHUNKED_SAMPLES: List[Tuple[Callable[[io.StringIO], str], str]] = [
+    (day_07_task_1_main, "37"),
+    (day_07_task_2_main, "168"),
+]
+
+
+@pytest.mark.parametrize("main,expected", CHUNKED_SAMPLES)
+def test_distances_in_chunks(
+    main: Callable[[io.StringIO], str], expected: str, caplog: pytest.LogCaptureFixture
+) -> None:
+    caplog.set_level(logging.INFO)
+    # A few positions at a time out of 17
+    with memory_budget(500):
+        assert main(io.StringIO(DAY_07_SAMPLE)) == expected
+    assert "Distance matrix would need" in caplog.text
+
+
+DAY_15_SAMPLE_PATH = Path("data/day_15/sample.txt")
+
+LAZY_SEARCH_SAMPLES: List[Tuple[Callable[[bytes], str], int, str, str]] = [
+    (day_15_task_1_main, 30_000, "Neighbour tables", "40"),
+    (day_15_task_2_main, 600_000, "Enlarged world with neighbour tables", "315"),
+]
+
+
+@pytest.mark.parametrize("main,budget,skipped,expected", LAZY_SEARCH_SAMPLES)
+def test_lazy_route_search(
+    main: Callable[[bytes], str],
+    budget: int,
+    skipped: str,
+    expected: str,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    caplog.set_level(logging.INFO)
+    with memory_budget(budget):
+        assert main(DAY_15_SAMPLE_PATH.read_bytes()) == expected
+    assert f"{skipped} would need" in caplog.text
+
+
+def test_too_small_budget_for_route_search() -> None:
+    with memory_budget(1000):
+        with pytest.raises(MemoryBudgetExceeded, match="Route search"):
+            day_15_task_1_main(DAY_15_SAMPLE_PATH.read_bytes())
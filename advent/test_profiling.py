@@ -0,0 +1,43 @@
+import cProfile
+import pstats
+from pathlib import Path
+
+import pytest
+
+from .profiling import get_collapsed_stacks, memory_traced, profiled
+
+
+def inner() -> int:
+    return sum(i * i for i in range(100_000))
+
+
+def outer() -> int:
+    return inner() + inner()
+
+
+def test_get_collapsed_stacks() -> None:
+    profile = cProfile.Profile()
+    profile.runcall(outer)
+    stacks = get_collapsed_stacks(pstats.Stats(profile))
+    inner_stacks = [
+        stack for stack in stacks if stack.split(";")[-1].startswith("inner ")
+    ]
+    assert len(inner_stacks) == 1
+    (inner_stack,) = inner_stacks
+    assert inner_stack.split(";")[-2].startswith("outer ")
+    assert sum(stacks.values()) > 0
+
+
+def test_profiled(tmp_path: Path) -> None:
+    profile_path = tmp_path / "task.prof"
+    with profiled(profile_path):
+        outer()
+    assert pstats.Stats(str(profile_path)).total_calls > 0  # type: ignore
+    assert "outer (test_profiling.py" in (tmp_path / "task.folded").read_text()
+
+
+def test_memory_traced(capsys: pytest.CaptureFixture[str]) -> None:
+    with memory_traced():
+        data = bytearray(10 * 1024 * 1024)
+    del data
+    assert "Peak traced memory 10." in capsys.readouterr().err
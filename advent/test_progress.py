@@ -0,0 +1,49 @@
+import json
+from pathlib import Path
+
+from .progress import (NOOP_METER, Snapshot, format_snapshot, progress,
+                       progress_reporting, track)
+
+
+def test_progress_is_noop_when_not_reporting() -> None:
+    assert progress("sum", total=10) is NOOP_METER
+    items = [1, 2, 3]
+    assert track(items, "items") is items
+
+
+def test_progress_reporting(tmp_path: Path) -> None:
+    metrics_path = tmp_path / "metrics.jsonl"
+    with progress_reporting(show=False, metrics_path=metrics_path, interval=0):
+        with progress("sum", total=4) as meter:
+            meter.update()
+            meter.update(3)
+        assert list(track(range(5), "range")) == list(range(5))
+    assert progress("sum") is NOOP_METER
+
+    with metrics_path.open() as file:
+        metrics = [json.loads(line) for line in file]
+    # The meters report while running and once more when they close
+    final = [metric for metric in metrics if metric["finished"]]
+    assert [(metric["name"], metric["done"]) for metric in final] == [
+        ("sum", 4),
+        ("range", 5),
+    ]
+    assert all(metric["done"] <= 4 for metric in metrics if metric["name"] == "sum")
+    assert final[0]["total"] == 4
+    assert final[1]["total"] is None
+
+
+def test_format_snapshot() -> None:
+    snapshot = Snapshot(
+        name="sum",
+        done=250,
+        total=1000,
+        elapsed=2.5,
+        rate=100.0,
+        eta=7.5,
+        finished=False,
+    )
+    assert format_snapshot(snapshot) == "sum: 250/1,000 (25%) 100.0 it/s ETA 0:00:07"
+    assert format_snapshot(snapshot._replace(finished=True, done=1000)) == (
+        "sum: 1,000/1,000 (100%) 100.0 it/s done in 0:00:02"
+    )
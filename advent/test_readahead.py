@@ -0,0 +1,47 @@
+import gzip
+import zlib
+from pathlib import Path
+
+import pytest
+
+from .readahead import ReadAheadGzipReader, open_gzip_text
+
+CONTENT = "".join(f"{number}\n" for number in range(100_000))
+
+
+def test_open_gzip_text(tmp_path: Path) -> None:
+    path = tmp_path / "input.txt.gz"
+    path.write_bytes(gzip.compress(CONTENT.encode("utf-8")))
+    with open_gzip_text(path) as file:
+        assert file.readline() == "0\n"
+        assert file.read() == CONTENT[2:]
+
+
+def test_concatenated_members(tmp_path: Path) -> None:
+    path = tmp_path / "input.txt.gz"
+    path.write_bytes(gzip.compress(b"first\n") + gzip.compress(b"second\n"))
+    with open_gzip_text(path) as file:
+        assert list(file) == ["first\n", "second\n"]
+
+
+def test_truncated_file(tmp_path: Path) -> None:
+    path = tmp_path / "input.txt.gz"
+    path.write_bytes(gzip.compress(CONTENT.encode("utf-8"))[:-100])
+    with pytest.raises(EOFError), open_gzip_text(path) as file:
+        file.read()
+
+
+def test_corrupted_file(tmp_path: Path) -> None:
+    path = tmp_path / "input.txt.gz"
+    path.write_bytes(b"not a gzip file")
+    with pytest.raises(zlib.error), open_gzip_text(path) as file:
+        file.read()
+
+
+def test_close_before_end(tmp_path: Path) -> None:
+    path = tmp_path / "input.txt.gz"
+    path.write_bytes(gzip.compress(CONTENT.encode("utf-8") * 10))
+    reader = ReadAheadGzipReader(path, chunk_size=64, queue_chunks=1)
+    assert reader.read(2) == b"0\n"
+    reader.close()
+    assert not reader.thread.is_alive()
@@ -0,0 +1,77 @@
+import multiprocessing
+from pathlib import Path
+from typing import Dict, List, TextIO, Tuple
+
+import pytest
+
+from . import scheduler
+from .generators import generate_input
+from .inputs import TaskCallback, open_task_input
+from .runner import load_task
+from .scheduler import CalendarResult, get_worker_usage, run_calendar, schedule
+from .specs import TaskSpec
+
+
+def test_schedule_starts_longest_first() -> None:
+    specs = [
+        TaskSpec(day=day, task=1, input_path=Path("input.txt")) for day in [1, 2, 3]
+    ]
+    history: Dict[str, float] = {
+        "day_01/task_1/input.txt": 1.0,
+        "day_02/task_1/input.txt": 5.0,
+    }
+    # Day 3 has no history, so it might be the longest
+    assert [spec.day for spec in schedule(specs, history)] == [3, 2, 1]
+
+
+def test_run_calendar(tmp_path: Path) -> None:
+    specs: List[TaskSpec] = []
+    for day in [1, 2]:
+        input_path = tmp_path / f"day_{day:02d}.txt"
+        input_path.write_text(generate_input(day, 50, seed=0))
+        specs.extend(
+            TaskSpec(day=day, task=task, input_path=input_path) for task in [1, 2]
+        )
+    expected = {}
+    for spec in specs:
+        callback, _ = load_task(spec.day, spec.task)
+        with open_task_input(callback, spec.input_path) as input:
+            expected[f"day_{spec.day:02d}/task_{spec.task}/{spec.input_path.name}"] = (
+                callback(input)
+            )
+
+    results = list(run_calendar(specs, jobs=2, timeout=30))
+    assert {r.key: r.result for r in results} == expected
+    assert all(r.error is None for r in results)
+
+
+def count_lines_in_pool(input: TextIO) -> str:
+    lines = input.read().splitlines()
+    context = multiprocessing.get_context("fork")
+    with context.Pool(processes=2) as pool:
+        return str(sum(pool.map(len, lines)))
+
+
+def load_forking_task(day: int, task: int) -> Tuple[TaskCallback, float]:
+    return count_lines_in_pool, 0.0
+
+
+def test_run_calendar_task_starting_processes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("ab\ncde\n")
+    monkeypatch.setattr(scheduler, "load_task", load_forking_task)
+    specs = [TaskSpec(day=1, task=task, input_path=input_path) for task in [1, 2]]
+    results = list(run_calendar(specs, jobs=2, timeout=30))
+    assert [(r.result, r.error) for r in results] == [("5", None), ("5", None)]
+
+
+def test_get_worker_usage() -> None:
+    results = [
+        CalendarResult(key="a", result="1", error=None, start=0, end=2, worker=1),
+        CalendarResult(key="b", result="2", error=None, start=2, end=3, worker=1),
+        CalendarResult(key="c", result=None, error="x", start=0, end=1, worker=2),
+    ]
+    usage = get_worker_usage(results)
+    assert [(u.worker, u.tasks, u.busy_time) for u in usage] == [(1, 2, 3), (2, 1, 1)]
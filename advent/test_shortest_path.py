@@ -0,0 +1,78 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pytest
+
+from .grid import Grid2D
+from .shortest_path import (NeighboursCallback, Path, a_star, dial, dijkstra,
+                            get_distances, get_entry_cost_edges)
+
+Search = Callable[
+    [int, NeighboursCallback[int], Callable[[int], bool]], Optional[Path[int]]
+]
+
+searches: List[Search] = [
+    dijkstra,
+    lambda start, get_neighbours, is_target: a_star(
+        start, get_neighbours, is_target, heuristic=lambda node: 0
+    ),
+    lambda start, get_neighbours, is_target: dial(
+        start, get_neighbours, is_target, max_cost=9
+    ),
+]
+
+
+def get_bellman_ford_distances(
+    size: int, get_neighbours: NeighboursCallback[int], start: int
+) -> Dict[int, int]:
+    distances = {start: 0}
+    for _ in range(size):
+        for node in list(distances):
+            for neighbour, cost in get_neighbours(node):
+                new_distance = distances[node] + cost
+                if new_distance < distances.get(neighbour, new_distance + 1):
+                    distances[neighbour] = new_distance
+    return distances
+
+
+@pytest.mark.parametrize("search", searches)
+@pytest.mark.parametrize("seed", range(5))
+def test_searches_find_cheapest_paths(search: Search, seed: int) -> None:
+    costs = np.random.default_rng(seed).integers(1, 10, size=(6, 7))
+    grid = Grid2D.from_array(costs)
+    get_neighbours = get_entry_cost_edges(
+        grid.neighbours4.to_lists(), grid.values.tolist()
+    )
+    expected = get_bellman_ford_distances(grid.size, get_neighbours, 0)
+    assert get_distances(0, get_neighbours) == expected
+
+    target = grid.size - 1
+    path = search(0, get_neighbours, lambda node: node == target)
+    assert path is not None
+    assert path.cost == expected[target]
+    assert path.nodes[0] == 0 and path.nodes[-1] == target
+    edges = [dict(get_neighbours(node)) for node in range(grid.size)]
+    assert path.cost == sum(
+        edges[node][next_node] for node, next_node in zip(path.nodes, path.nodes[1:])
+    )
+
+
+@pytest.mark.parametrize("search", searches)
+def test_searches_without_reachable_target(search: Search) -> None:
+    edges: List[List[Tuple[int, int]]] = [[(1, 2)], [(0, 2)], [(0, 1)]]
+    assert search(0, edges.__getitem__, lambda node: node == 2) is None
+    assert search(2, edges.__getitem__, lambda node: node == 2) == Path(0, [2])
+
+
+def test_a_star_heuristic_explores_less() -> None:
+    explored: List[int] = []
+
+    def get_neighbours(node: int) -> List[Tuple[int, int]]:
+        explored.append(node)
+        return [(node - 1, 1), (node + 1, 1)]
+
+    path = a_star(
+        0, get_neighbours, lambda node: node == 10, lambda node: abs(10 - node)
+    )
+    assert path == Path(10, list(range(11)))
+    assert sorted(explored) == list(range(10))
@@ -0,0 +1,71 @@
+from pathlib import Path
+from typing import List, TextIO, Tuple
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+
+from .cache import cached_arrays
+from .inputs import open_task_input
+from .sidecars import SIDECARS_VARIABLE, Arrays, read_arrays, write_arrays
+
+
+def solve_task(input: TextIO) -> str:
+    return ""
+
+
+def parse_numbers(input: TextIO) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.bool_]]:
+    parsed_inputs.append(input.name)
+    numbers = np.array([int(line) for line in input], dtype=np.int64)
+    return numbers, numbers % 2 == 0
+
+
+parsed_inputs: List[str] = []
+
+
+def test_arrays_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "arrays"
+    arrays: Arrays = (
+        np.arange(24, dtype=np.int16).reshape(2, 3, 4),
+        np.empty((0, 3)),
+        np.array([1.5, np.nan]),
+    )
+    write_arrays(path, arrays, input="hash")
+    header, loaded = read_arrays(path)
+    assert header["input"] == "hash"
+    assert len(loaded) == len(arrays)
+    for array, loaded_array in zip(arrays, loaded):
+        assert loaded_array.dtype == array.dtype
+        np.testing.assert_array_equal(loaded_array, array)
+    # Mapped copy-on-write, so changes stay in memory
+    loaded[0][0, 0, 0] = 100
+    assert read_arrays(path)[1][0][0, 0, 0] == 0
+
+
+def test_sidecar_is_reused_until_input_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(SIDECARS_VARIABLE, "1")
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("1\n2\n3\n")
+    parsed_inputs.clear()
+
+    def parse() -> Arrays:
+        with open_task_input(solve_task, input_path) as input:
+            assert not isinstance(input, (bytes, memoryview))
+            return cached_arrays(parse_numbers, input)
+
+    numbers, even = parse()
+    assert numbers.tolist() == [1, 2, 3]
+    assert even.tolist() == [False, True, False]
+    assert parse()[0].tolist() == [1, 2, 3]
+    assert len(parsed_inputs) == 1
+    assert len(list((tmp_path / "input.txt.parsed").iterdir())) == 1
+
+    input_path.write_text("4\n5\n")
+    assert parse()[0].tolist() == [4, 5]
+    assert len(parsed_inputs) == 2
+
+    monkeypatch.delenv(SIDECARS_VARIABLE)
+    assert parse()[0].tolist() == [4, 5]
+    assert len(parsed_inputs) == 3
@@ -0,0 +1,53 @@
+import time
+from pathlib import Path
+from typing import TextIO
+
+from .strategies import (DEFAULT_STRATEGY, alternative, get_references,
+                         get_strategies, race_strategies)
+
+
+def count_lines(input: TextIO) -> str:
+    return f"{len(input.readlines())}"
+
+
+@alternative(count_lines, "slow", reference=True)
+def count_lines_slowly(input: TextIO) -> str:
+    time.sleep(60)
+    return count_lines(input)
+
+
+@alternative(count_lines, "broken")
+def count_lines_wrongly(input: TextIO) -> str:
+    raise ValueError("Broken strategy")
+
+
+def test_get_strategies() -> None:
+    strategies = get_strategies(count_lines)
+    assert list(strategies) == [DEFAULT_STRATEGY, "slow", "broken"]
+    assert strategies[DEFAULT_STRATEGY].solve is count_lines
+    assert [strategy.name for strategy in get_references(count_lines, "broken")] == [
+        "slow"
+    ]
+    # Without references, strategies are checked against all the others
+    assert [strategy.name for strategy in get_references(count_lines, "slow")] == [
+        DEFAULT_STRATEGY,
+        "broken",
+    ]
+
+
+def test_race_strategies(tmp_path: Path) -> None:
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("a\nb\nc\n")
+    strategies = get_strategies(count_lines)
+
+    start = time.monotonic()
+    results = race_strategies(list(strategies.values()), input_path, timeout=30)
+    assert time.monotonic() - start < 30
+    finished = {result.strategy: result for result in results}
+    assert finished[DEFAULT_STRATEGY].result == "3"
+    assert "slow" not in finished
+    if "broken" in finished:
+        assert "Broken strategy" in (finished["broken"].error or "")
+    assert results[-1].strategy == DEFAULT_STRATEGY
+
+    assert race_strategies([strategies["slow"]], input_path, timeout=0.1) == []
@@ -0,0 +1,27 @@
+import json
+from pathlib import Path
+
+from .tracing import NOOP_SPAN, span, tracing
+
+
+def test_span_is_noop_when_not_tracing() -> None:
+    assert span("parse") is NOOP_SPAN
+    with span("parse"):
+        pass
+
+
+def test_tracing(tmp_path: Path) -> None:
+    trace_path = tmp_path / "trace.json"
+    with tracing(trace_path):
+        with span("solve"):
+            with span("parse"):
+                pass
+    assert span("parse") is NOOP_SPAN
+
+    with trace_path.open() as file:
+        events = json.load(file)["traceEvents"]
+    assert [event["name"] for event in events] == ["parse", "solve"]
+    parse, solve = events
+    assert all(event["ph"] == "X" for event in events)
+    assert solve["ts"] <= parse["ts"]
+    assert parse["ts"] + parse["dur"] <= solve["ts"] + solve["dur"]
@@ -0,0 +1,108 @@
+"""
+Lightweight timing spans, written as a Chrome trace that Perfetto and
+chrome://tracing can open.
+
+Tasks mark their phases with `span`:
+
+    with span("parse"):
+        world = read_numbers_array(input)
+
+While no trace is being recorded `span` returns a shared do-nothing context manager,
+so leaving the spans in costs a function call per phase.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from types import TracebackType
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Type
+
+logger = logging.getLogger(__name__)
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self.events: List[Dict[str, Any]] = []
+        self.pid = os.getpid()
+
+    def add_span(self, name: str, start_ns: int, end_ns: int) -> None:
+        self.events.append(
+            {
+                "name": name,
+                "ph": "X",
+                "ts": start_ns / 1000,
+                "dur": (end_ns - start_ns) / 1000,
+                "pid": self.pid,
+                "tid": threading.get_ident(),
+            }
+        )
+
+    def write(self, path: Path) -> None:
+        with path.open(mode="w", encoding="utf-8") as file:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, file)
+            file.write("\n")
+
+
+class Span:
+    __slots__ = ("tracer", "name", "start_ns")
+
+    def __init__(self, tracer: Tracer, name: str) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.start_ns = 0
+
+    def __enter__(self) -> None:
+        self.start_ns = time.perf_counter_ns()
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.tracer.add_span(self.name, self.start_ns, time.perf_counter_ns())
+
+
+class NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+current_tracer: Optional[Tracer] = None
+
+
+def span(name: str) -> ContextManager[None]:
+    tracer = current_tracer
+    if tracer is None:
+        return NOOP_SPAN
+    return Span(tracer, name)
+
+
+@contextmanager
+def tracing(output_path: Path) -> Iterator[Tracer]:
+    """Record spans opened in the block and write them to `output_path`."""
+    global current_tracer
+    assert current_tracer is None, "Already tracing"
+    tracer = current_tracer = Tracer()
+    try:
+        yield tracer
+    finally:
+        current_tracer = None
+        tracer.write(output_path)
+        logger.info("Wrote %d spans to %s", len(tracer.events), output_path)